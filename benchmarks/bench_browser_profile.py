@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+浏览器轻量模式基准测试 - 比较加载全部资源与屏蔽图片、字体、统计脚本
+
+用法：
+    python benchmarks/bench_browser_profile.py
+
+需要本机安装 Chrome。在本地启动一个模拟招聘页面（岗位由脚本渲染，附带图片、字体、
+样式表和统计脚本），分别用普通模式和轻量模式的浏览器打开 ROUNDS 次，输出平均加载时间、
+每页传输量、屏蔽的请求数和JS堆内存，并校验两种模式得到的岗位数量一致。
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.browser import BrowserManager, BrowserProfile
+
+ROUNDS = 10
+JOBS = 40
+IMAGE_KB = 60
+FONT_KB = 120
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """模拟招聘页面及其静态资源"""
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path == '/':
+            body, content_type = self._page(), 'text/html; charset=utf-8'
+        elif path == '/app.js':
+            body = (f'document.getElementById("list").innerHTML = Array.from({{length: {JOBS}}}, '
+                    f'(_, i) => `<li class="job"><img src="/img/${{location.search}}-${{i}}.png">'
+                    f'<span class="title">开发岗位${{i}}</span></li>`).join("");').encode()
+            content_type = 'application/javascript'
+        elif path == '/hm.baidu.com/hm.js':
+            body, content_type = b'/* analytics */' + b' ' * 40 * 1024, 'application/javascript'
+        elif path == '/style.css':
+            body = (b'@font-face{font-family:f;src:url(/font.woff2)} body{font-family:f}'
+                    b'.banner{background:url(/img/banner.jpg)}')
+            content_type = 'text/css'
+        elif path.endswith('.woff2'):
+            body, content_type = b'\0' * FONT_KB * 1024, 'font/woff2'
+        else:
+            body, content_type = b'\0' * IMAGE_KB * 1024, 'image/png'
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        # 禁止缓存，每轮都重新下载，只比较屏蔽资源的效果
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _page():
+        return ('<html><head><meta charset="utf-8"><link rel="stylesheet" href="/style.css">'
+                '<script src="/hm.baidu.com/hm.js"></script></head>'
+                '<body><div class="banner"></div><ul id="list"></ul><script src="/app.js"></script></body></html>'
+                ).encode('utf-8')
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """多线程模拟服务器"""
+
+    daemon_threads = True
+
+
+def run(profile, url):
+    """用指定配置的浏览器打开页面 ROUNDS 次"""
+    manager = BrowserManager(profile=profile)
+    elapsed = heap = 0.0
+    job_counts = set()
+    try:
+        for i in range(ROUNDS):
+            with manager.page() as driver:
+                start = time.perf_counter()
+                driver.get(f'{url}?round={i}')
+                elapsed += time.perf_counter() - start
+                job_counts.add(len(driver.find_elements('css selector', '.job .title')))
+                metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+                heap += next(m['value'] for m in metrics if m['name'] == 'JSHeapUsedSize')
+    finally:
+        manager.close()
+    pages = max(manager.pages_measured, 1)
+    return {
+        'load_ms': elapsed / ROUNDS * 1000,
+        'kb': manager.bytes_transferred / pages / 1024,
+        'blocked': manager.requests_blocked / pages,
+        'heap_mb': heap / ROUNDS / 1024 / 1024,
+        'jobs': job_counts,
+    }
+
+
+def main():
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/'
+
+    try:
+        results = {
+            '普通模式': run(BrowserProfile(lightweight=False), url),
+            '轻量模式': run(BrowserProfile(), url),
+        }
+    finally:
+        server.shutdown()
+
+    print(f"{'模式':>6} {'加载(ms)':>10} {'传输(KB/页)':>12} {'屏蔽请求/页':>10} {'JS堆(MB)':>9} {'岗位数':>6}")
+    for name, result in results.items():
+        print(f"{name:>6} {result['load_ms']:>10.0f} {result['kb']:>12.0f} {result['blocked']:>10.1f} "
+              f"{result['heap_mb']:>9.1f} {'/'.join(map(str, sorted(result['jobs']))):>6}")
+
+    full, light = results['普通模式'], results['轻量模式']
+    print(f"\n每页节省 {full['kb'] - light['kb']:.0f} KB（{1 - light['kb'] / max(full['kb'], 1):.0%}），"
+          f"加载时间缩短 {1 - light['load_ms'] / max(full['load_ms'], 1):.0%}，"
+          f"岗位数量{'一致' if full['jobs'] == light['jobs'] else '不一致'}")
+
+
+if __name__ == '__main__':
+    main()
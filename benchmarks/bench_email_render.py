@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+邮件渲染基准测试 - 比较旧的字符串拼接渲染与预编译模板渲染
+
+用法：
+    python benchmarks/bench_email_render.py
+
+输出每种规模下两种渲染方式（HTML部分）的总耗时和每个岗位的平均耗时，
+预编译模板的每岗位耗时应基本保持不变（线性）。新渲染包含HTML转义，旧渲染没有。
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.notifier import EmailNotifier
+
+SIZES = [500, 1000, 2000, 4000, 8000]
+COMPANIES = 10
+
+
+def make_jobs(count):
+    """生成测试岗位"""
+    return [
+        {
+            'company': f'公司{i % COMPANIES}',
+            'title': f'Java后端开发实习生 <{i}>',
+            'url': f'https://example.com/job/{i}?from=list&page={i // 20}',
+            'location': '北京',
+            'detail': '技术部',
+            'found_time': '2025-01-01 13:00:00',
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_render(template, jobs):
+    """改造前的渲染方式：嵌套循环中 += 拼接，再对整个模板做三次 replace"""
+    jobs_by_company = {}
+    for job in jobs:
+        jobs_by_company.setdefault(job['company'], []).append(job)
+
+    sections_html = ""
+    for company, company_jobs in jobs_by_company.items():
+        jobs_html = ""
+        for job in company_jobs:
+            meta_str = " | ".join(p for p in (job.get('location'), job.get('detail'), job.get('found_time')) if p)
+            jobs_html += f'''
+                <div class="job-item">
+                    <div class="job-title">{job['title']}</div>
+                    <div class="job-meta">{meta_str}</div>
+                </div>
+                '''
+        sections_html += f'''
+            <div class="company-section">
+                <div class="company-header">🏢 {company} ({len(company_jobs)} 个新岗位)</div>
+                <div class="job-list">
+                    {jobs_html}
+                </div>
+            </div>
+            '''
+
+    html = template.replace('{total_count}', str(len(jobs)))
+    html = html.replace('{job_sections}', sections_html)
+    html = html.replace('{timestamp}', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return html
+
+
+def measure(func, repeat=3):
+    """取多次运行的最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    notifier = EmailNotifier({})
+    template_source = notifier._load_template()
+
+    print(f"{'岗位数':>8} {'旧渲染(ms)':>12} {'μs/岗位':>10} {'新渲染(ms)':>12} {'μs/岗位':>10}")
+    for size in SIZES:
+        jobs = make_jobs(size)
+        old = measure(lambda: legacy_render(template_source, jobs))
+        new = measure(lambda: notifier._render_email(jobs))
+        print(f"{size:>8} {old * 1000:>12.2f} {old / size * 1e6:>10.2f} {new * 1000:>12.2f} {new / size * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+页面编码识别基准测试 - 比较对整个页面做 chardet 检测与按声明优先的编码识别
+
+用法：
+    python benchmarks/bench_encoding.py
+
+生成几类招聘页面（响应头声明编码、meta 声明编码、未声明编码的 UTF-8 页面、
+未声明编码的 GBK 页面），分别用原来的方式（chardet 检测整个页面，与 requests 的
+apparent_encoding 一致）和 core.response_body.resolve_encoding 确定编码 ROUNDS 次，
+输出每页平均耗时，并校验两种方式解码得到的文本一致。
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from requests.compat import chardet
+
+from core.response_body import decode_body, resolve_encoding
+
+ROUNDS = 20
+JOBS = 2000
+TITLES = ['后端开发实习生', '测试开发工程师', '算法工程师', '前端开发', '数据分析师']
+
+
+def make_page(encoding, meta=True):
+    """生成测试页面"""
+    head = f'<meta charset="{encoding}">' if meta else ''
+    items = ''.join(
+        f'<div class="job-item"><a href="/job/{i}">{TITLES[i % len(TITLES)]}{i}</a>'
+        f'<span class="location">北京 上海 深圳</span><p>负责核心业务系统的设计与开发，参与需求分析与技术评审</p></div>'
+        for i in range(JOBS)
+    )
+    return f'<html><head>{head}<title>校园招聘</title></head><body>{items}</body></html>'.encode(encoding)
+
+
+def legacy_encoding(content):
+    """原来的方式：chardet 检测整个页面"""
+    return chardet.detect(content)['encoding'] or 'utf-8'
+
+
+def main():
+    cases = [
+        ('响应头声明 UTF-8', make_page('utf-8', meta=False), {'Content-Type': 'text/html; charset=utf-8'}),
+        ('meta 声明 GBK', make_page('gbk'), {'Content-Type': 'text/html'}),
+        ('未声明 UTF-8', make_page('utf-8', meta=False), {'Content-Type': 'text/html'}),
+        ('未声明 GBK', make_page('gbk', meta=False), {'Content-Type': 'text/html'}),
+    ]
+    print(f"{'页面':<16} {'大小(KB)':>9} {'整页检测(ms)':>13} {'新方式(ms)':>11} {'加速':>7} {'文本':>4}")
+    for name, content, headers in cases:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            legacy = legacy_encoding(content)
+        legacy_ms = (time.perf_counter() - start) / ROUNDS * 1000
+
+        # 同一网站的页面，未声明编码时第一页推测后按域名缓存
+        start = time.perf_counter()
+        for i in range(ROUNDS):
+            resolved = resolve_encoding(content, headers, f'https://{name}.example.com/jobs?page={i}')
+        resolved_ms = (time.perf_counter() - start) / ROUNDS * 1000
+
+        same = decode_body(content, legacy) == decode_body(content, resolved)
+        print(f"{name:<16} {len(content) / 1024:>9.0f} {legacy_ms:>13.2f} {resolved_ms:>11.2f} "
+              f"{legacy_ms / max(resolved_ms, 1e-6):>6.0f}x {'一致' if same else '不一致':>4}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+抓取方式基准测试 - 比较 requests 逐个请求与 asyncio 并发抓取
+
+用法：
+    python benchmarks/bench_fetch_engine.py
+
+在本地启动一个模拟招聘网站（每个请求延迟 LATENCY 秒），页面分布在
+127.0.0.1 ~ 127.0.0.N 多个地址上模拟不同公司的网站，分别用两种方式抓取全部页面，
+输出耗时和吞吐量，并校验两种方式得到的页面内容一致。
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.circuit import RetryPolicy
+from core.fetcher import AsyncFetcher, aiohttp
+from core.spider import JobSpider
+
+LATENCY = 0.05
+HOSTS = 8
+PAGE_COUNTS = [16, 64, 256]
+PER_HOST = 4
+CONCURRENCY = 32
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """模拟招聘页面：固定延迟后返回岗位列表"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        items = ''.join(f'<li class="job"><a href="/job/{i}">岗位{self.path}-{i}</a></li>' for i in range(20))
+        body = f'<html><head><meta charset="utf-8"></head><body><ul>{items}</ul></body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """多线程模拟服务器"""
+
+    # 默认的监听队列只有5，并发连接较多时会丢弃连接请求
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_urls(port, count):
+    """生成分布在多个地址上的页面URL"""
+    return [f'http://127.0.0.{i % HOSTS + 1}:{port}/page/{i}' for i in range(count)]
+
+
+def run_requests(spider, urls):
+    """requests 逐个请求"""
+    return [spider._get_with_retry(url).text for url in urls]
+
+
+def run_async(fetcher, urls):
+    """asyncio 并发抓取"""
+    results = fetcher.fetch_all(urls)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return [result.text for result in results]
+
+
+def main():
+    if aiohttp is None:
+        print("未安装 aiohttp，无法测试异步抓取: pip install aiohttp")
+        return
+
+    server = StubServer(('0.0.0.0', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    policy = RetryPolicy(1)
+    spider = JobSpider(retry_policy=policy)
+    fetcher = AsyncFetcher(CONCURRENCY, PER_HOST, retry_policy=policy)
+
+    print(f"模拟延迟: {LATENCY * 1000:.0f} ms/请求，网站数: {HOSTS}，"
+          f"并发上限: {CONCURRENCY}，每个网站: {PER_HOST}")
+    print(f"{'页面数':>6} {'requests(s)':>12} {'async(s)':>10} {'requests页/秒':>14} {'async页/秒':>12} {'内容一致':>8}")
+    try:
+        for count in PAGE_COUNTS:
+            urls = make_urls(port, count)
+
+            start = time.perf_counter()
+            expected = run_requests(spider, urls)
+            sync_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            actual = run_async(fetcher, urls)
+            async_time = time.perf_counter() - start
+
+            print(f"{count:>6} {sync_time:>12.2f} {async_time:>10.2f} {count / sync_time:>14.1f} "
+                  f"{count / async_time:>12.1f} {'是' if actual == expected else '否':>8}")
+    finally:
+        spider.close()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
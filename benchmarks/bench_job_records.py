@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+岗位记录基准测试 - 比较改造前的多次字典复制与共享的 JobRecord
+
+用法：
+    python benchmarks/bench_job_records.py
+
+改造前一个岗位在解析时生成一个字典，在 monitor_single_company 中再复制为一个新字典
+（每个岗位调用一次 datetime.now().strftime）；改造后解析得到的 JobRecord 直接作为新岗位返回，
+发现时间在生成通知时才格式化。输出每种规模下两种方式的耗时和保留的内存。
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.models import JobRecord
+
+SIZES = [1000, 10000, 50000]
+COMPANY = '字节跳动'
+COMPANY_URL = 'https://jobs.bytedance.com/campus/position'
+
+
+def make_raw(count):
+    """模拟从页面解析出的字段"""
+    return [(f'Java后端开发实习生-{i}', f'https://jobs.bytedance.com/campus/position/{i}/detail', '北京', '技术')
+            for i in range(count)]
+
+
+def legacy_pipeline(raw):
+    """改造前：解析生成字典，保存后再复制一个带发现时间的字典"""
+    parsed = [{'title': t, 'url': u, 'location': l, 'detail': d} for t, u, l, d in raw]
+    new_jobs = []
+    for job_id, job in enumerate(parsed, 1):
+        new_jobs.append({
+            'company': COMPANY,
+            'company_url': COMPANY_URL,
+            'title': job['title'],
+            'url': job['url'],
+            'location': job.get('location', ''),
+            'detail': job.get('detail', ''),
+            'found_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'id': job_id,
+        })
+    return new_jobs
+
+
+def record_pipeline(raw):
+    """改造后：解析生成 JobRecord，保存后只补充ID"""
+    parsed = [JobRecord(COMPANY, t, u, l, d, company_url=COMPANY_URL) for t, u, l, d in raw]
+    for job_id, job in enumerate(parsed, 1):
+        job.id = job_id
+    return parsed
+
+
+def measure(func, raw, repeat=3):
+    """
+    Returns:
+        tuple: (最短耗时秒数, 结果保留的内存字节数)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(raw)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func(raw)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return best, retained
+
+
+def main():
+    print(f"{'岗位数':>8} {'字典(ms)':>10} {'字典(B/岗位)':>14} {'JobRecord(ms)':>14} {'JobRecord(B/岗位)':>18}")
+    for size in SIZES:
+        raw = make_raw(size)
+        old_time, old_memory = measure(legacy_pipeline, raw)
+        new_time, new_memory = measure(record_pipeline, raw)
+        print(f"{size:>8} {old_time * 1000:>10.2f} {old_memory / size:>14.0f} "
+              f"{new_time * 1000:>14.2f} {new_memory / size:>18.0f}")
+
+
+if __name__ == '__main__':
+    main()
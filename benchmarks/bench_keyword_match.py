@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+关键词匹配基准测试 - 比较逐个关键词扫描与 Aho-Corasick 自动机
+
+用法：
+    python benchmarks/bench_keyword_match.py
+
+对不同数量的关键词，输出两种方式匹配全部标题的耗时，并校验两者结果一致。
+逐个扫描的耗时随关键词数量线性增长，自动机基本不变。
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.matcher import KeywordMatcher, ahocorasick, naive_match
+
+KEYWORD_COUNTS = [5, 20, 100, 500]
+TITLES = 5000
+WORDS = ['Java', '后端', '开发', '实习', '算法', '测试', '前端', 'Go', 'Python', '数据', '产品', '运营',
+         '（2025届）', '高级', '工程师', 'ＡＩ', '大模型', '客户端', '安全', '运维']
+
+
+def make_titles(count):
+    """生成测试标题"""
+    rng = random.Random(0)
+    return [''.join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))) for _ in range(count)]
+
+
+def make_keywords(count):
+    """生成测试关键词：常用词加随机组合"""
+    rng = random.Random(count)
+    keywords = list(WORDS[:min(count, len(WORDS))])
+    while len(keywords) < count:
+        keywords.append(rng.choice(WORDS) + str(rng.randint(0, 9999)))
+    return keywords
+
+
+def measure(func, repeat=3):
+    """取多次运行的最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    titles = make_titles(TITLES)
+    exclude = ['高级']
+    print(f"自动机实现: {'pyahocorasick' if ahocorasick is not None else '纯Python'}，标题数: {TITLES}")
+    print(f"{'关键词数':>8} {'逐个扫描(ms)':>14} {'自动机(ms)':>12} {'结果一致':>8}")
+    for count in KEYWORD_COUNTS:
+        keywords = make_keywords(count)
+        matcher = KeywordMatcher(keywords, exclude)
+        expected = [naive_match(title, keywords, exclude) for title in titles]
+        same = [matcher.match(title) for title in titles] == expected
+        naive = measure(lambda: [naive_match(title, keywords, exclude) for title in titles])
+        compiled = measure(lambda: [matcher.match(title) for title in titles])
+        print(f"{count:>8} {naive * 1000:>14.2f} {compiled * 1000:>12.2f} {'是' if same else '否':>8}")
+
+
+if __name__ == '__main__':
+    main()
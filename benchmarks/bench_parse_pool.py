@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+解析进程池基准测试 - 比较主进程依次解析与多进程并行解析
+
+用法：
+    python benchmarks/bench_parse_pool.py
+
+生成 PAGES 个大页面（每页 JOBS_PER_PAGE 个岗位），分别在主进程依次解析、
+用不同数量的子进程并行解析，输出耗时和相对主进程的加速比，并校验结果一致。
+加速比受CPU核数限制，单核机器上进程池只会增加开销。
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.parse_pool import ParsePool, parse_page
+from core.plan import compile_company
+
+PAGES = 16
+JOBS_PER_PAGE = 3000
+WORDS = ['Java', '后端', '开发', '实习', '算法', '测试', '前端', 'Go', 'Python', '数据']
+
+
+def make_plan(index):
+    """生成测试公司配置"""
+    return compile_company({
+        'name': f'公司{index}',
+        'url': f'https://jobs.example{index}.com/list',
+        'job_selector': '.job-item',
+        'title_selector': '.title',
+        'url_selector': 'a',
+        'location_selector': '.location',
+        'keywords': ['开发', '实习'],
+    })
+
+
+def make_page(index):
+    """生成测试页面"""
+    items = []
+    for i in range(JOBS_PER_PAGE):
+        title = WORDS[i % len(WORDS)] + WORDS[(i * 7 + index) % len(WORDS)] + f'工程师{i}'
+        items.append(
+            f'<div class="job-item"><a href="/job/{index}/{i}"><span class="title">{title}</span></a>'
+            f'<span class="location">城市{i % 12}</span><p>岗位描述 {"内容" * 20}</p></div>'
+        )
+    return f'<html><head><meta charset="utf-8"></head><body>{"".join(items)}</body></html>'.encode('utf-8')
+
+
+def main():
+    plans = [make_plan(i) for i in range(PAGES)]
+    pages = [make_page(i) for i in range(PAGES)]
+    size_mb = sum(len(page) for page in pages) / 1024 / 1024
+    print(f"CPU核数: {os.cpu_count()}，页面数: {PAGES}，总大小: {size_mb:.1f} MB")
+
+    start = time.perf_counter()
+    expected = [parse_page(plan, page, plan.url) for plan, page in zip(plans, pages)]
+    baseline = time.perf_counter() - start
+    print(f"{'进程数':>6} {'耗时(s)':>10} {'加速比':>8} {'结果一致':>8}")
+    print(f"{'主进程':>6} {baseline:>10.2f} {1.0:>8.2f} {'是':>8}")
+
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        pool = ParsePool(workers, min_bytes=0)
+        try:
+            # 先让子进程完成启动和导入，只比较解析耗时
+            pool.submit(plans[0], pages[0], plans[0].url).result()
+            start = time.perf_counter()
+            futures = [pool.submit(plan, page, plan.url) for plan, page in zip(plans, pages)]
+            actual = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+        finally:
+            pool.close()
+        print(f"{workers:>6} {elapsed:>10.2f} {baseline / elapsed:>8.2f} {'是' if actual == expected else '否':>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,55 +1,313 @@
 """
 配置模块 - 加载和管理配置文件
+
+配置文件只在内容变化时重新解析：ConfigService 记录每个文件的修改时间，
+检测到变化后重新解析、校验，再整体替换为新的配置快照。
 """
 
 import os
+import json
+import time
+import hashlib
+import threading
+from collections import namedtuple
+
 import yaml
 from pathlib import Path
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 # 获取项目根目录
 PROJECT_ROOT = Path(__file__).parent.parent
 CONFIG_DIR = PROJECT_ROOT / "config"
 
+# 受监控的配置文件
+CONFIG_FILES = {
+    'settings': 'settings.yaml',
+    'email': 'email_config.yaml',
+    'companies': 'companies.yaml',
+    'proxies': 'proxy_list.txt',
+}
+
+# 配置快照：一次加载得到的完整配置，替换时整体替换，不做原地修改
+ConfigSnapshot = namedtuple(
+    'ConfigSnapshot',
+    ['version', 'settings', 'email', 'companies', 'proxies', 'plans']
+)
+
+
+class ConfigError(ValueError):
+    """配置文件内容不合法"""
+
 
 def load_yaml_config(filename):
     """加载YAML配置文件"""
     config_path = CONFIG_DIR / filename
     if not config_path.exists():
         raise FileNotFoundError(f"配置文件不存在: {config_path}")
-    
+
     with open(config_path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
 
+def _read_proxy_file(proxy_file):
+    """读取代理列表文件"""
+    if not proxy_file.exists():
+        return []
+
+    proxies = []
+    with open(proxy_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                proxies.append(line)
+    return proxies
+
+
+def company_fingerprint(company):
+    """
+    计算单个公司配置的指纹
+
+    Args:
+        company: 公司配置字典
+
+    Returns:
+        str: 配置内容的MD5值，配置不变则指纹不变
+    """
+    payload = json.dumps(company, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+
+def validate_company_list(companies):
+    """
+    校验公司列表的基本结构
+
+    Args:
+        companies: companies.yaml 中的公司列表
+
+    Raises:
+        ConfigError: 结构不合法时抛出
+    """
+    if not isinstance(companies, list):
+        raise ConfigError("companies.yaml: companies 必须是列表")
+
+    seen = set()
+    for index, company in enumerate(companies):
+        if not isinstance(company, dict):
+            raise ConfigError(f"companies.yaml: 第 {index + 1} 项不是字典")
+        name = company.get('name')
+        if not name:
+            raise ConfigError(f"companies.yaml: 第 {index + 1} 项缺少 name")
+        if not company.get('url'):
+            raise ConfigError(f"companies.yaml: {name} 缺少 url")
+        if name in seen:
+            raise ConfigError(f"companies.yaml: 公司名称重复: {name}")
+        seen.add(name)
+
+
+def _default_compile(company):
+    """默认的公司配置编译函数：原样返回配置副本"""
+    return dict(company)
+
+
+def _compile_plan(company):
+    """把公司配置编译为爬取计划（校验字段并预编译选择器）"""
+    from core.plan import compile_company
+    return compile_company(company)
+
+
+class ConfigService:
+    """
+    配置服务 - 缓存已解析的配置，并在文件变化时热加载
+
+    - 每个文件只在修改时间或大小变化时重新解析
+    - 新配置校验通过后才会替换当前快照，校验失败则继续使用旧快照
+    - 只有内容发生变化的公司会被重新编译
+    """
+
+    def __init__(self, config_dir=CONFIG_DIR, check_interval=2.0, compiler=None):
+        """
+        初始化配置服务
+
+        Args:
+            config_dir: 配置文件目录
+            check_interval: 两次检查文件修改时间的最小间隔（秒）
+            compiler: 公司配置编译函数，接收配置字典，返回编译结果
+        """
+        self.config_dir = Path(config_dir)
+        self.check_interval = check_interval
+        self.compiler = compiler or _default_compile
+
+        self._lock = threading.RLock()
+        self._stats = {}       # 文件名 -> (mtime_ns, size)
+        self._raw = {}         # 文件名 -> 解析结果
+        self._failed_stats = None  # 上次加载失败时的文件状态
+        self._compiled = {}    # 公司名 -> (指纹, 编译结果)
+        self._snapshot = None
+        self._version = 0
+        self._last_check = 0.0
+
+    def _stat(self, filename):
+        """获取文件的修改时间和大小，文件不存在返回None"""
+        try:
+            st = os.stat(self.config_dir / filename)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _parse(self, key, filename):
+        """解析单个配置文件"""
+        path = self.config_dir / filename
+        if key == 'proxies':
+            return _read_proxy_file(path)
+        if not path.exists():
+            raise FileNotFoundError(f"配置文件不存在: {path}")
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+
+    def set_compiler(self, compiler):
+        """
+        设置公司配置编译函数，并在下次刷新时重新编译所有公司
+
+        Args:
+            compiler: 编译函数
+        """
+        with self._lock:
+            self.compiler = compiler
+            self._compiled = {}
+            self._stats = {}
+
+    def snapshot(self):
+        """
+        获取当前配置快照
+
+        距上次检查超过 check_interval 秒时，会先检查文件是否变化
+
+        Returns:
+            ConfigSnapshot: 配置快照
+        """
+        if self._snapshot is None or time.monotonic() - self._last_check >= self.check_interval:
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self, force=False):
+        """
+        检查配置文件并在变化时重新加载
+
+        Args:
+            force: 是否忽略修改时间强制重新解析
+
+        Returns:
+            bool: 是否生成了新的快照
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+
+            stats = {key: self._stat(filename) for key, filename in CONFIG_FILES.items()}
+            changed = [key for key in CONFIG_FILES if force or stats[key] != self._stats.get(key)]
+            if not changed and self._snapshot is not None:
+                return False
+            # 上次加载失败后文件没有再变化，不重复解析和报错
+            if not force and stats == self._failed_stats:
+                return False
+
+            try:
+                raw = dict(self._raw)
+                for key in changed:
+                    raw[key] = self._parse(key, CONFIG_FILES[key])
+                snapshot, compiled = self._build_snapshot(raw)
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                logger.error(f"配置重新加载失败，继续使用旧配置: {e}")
+                # 不更新 self._stats，任何文件再次修改后本次变化的文件都会重新解析；
+                # 只记录失败时的文件状态，文件再次修改前不重复报错
+                self._failed_stats = stats
+                return False
+
+            self._raw = raw
+            self._stats = stats
+            self._failed_stats = None
+            self._compiled = compiled
+            self._snapshot = snapshot
+
+            if self._version > 1:
+                logger.info(f"配置已重新加载 (版本 {self._version}): {', '.join(changed)}")
+            return True
+
+    def _build_snapshot(self, raw):
+        """
+        根据解析结果构建新快照
+
+        Returns:
+            tuple: (新快照, 新的公司编译缓存)
+        """
+        settings = raw.get('settings') or {}
+        email = (raw.get('email') or {}).get('email', {})
+        companies = (raw.get('companies') or {}).get('companies', [])
+        validate_company_list(companies)
+
+        enabled = [c for c in companies if c.get('enabled', True)]
+
+        compiled = {}
+        recompiled = []
+        for company in enabled:
+            name = company['name']
+            fingerprint = company_fingerprint(company)
+            cached = self._compiled.get(name)
+            if cached and cached[0] == fingerprint:
+                compiled[name] = cached
+            else:
+                compiled[name] = (fingerprint, self.compiler(company))
+                recompiled.append(name)
+
+        if recompiled and self._snapshot is not None:
+            logger.info(f"重新编译公司配置: {', '.join(recompiled)}")
+
+        self._version += 1
+        snapshot = ConfigSnapshot(
+            version=self._version,
+            settings=settings,
+            email=email,
+            companies=tuple(enabled),
+            proxies=tuple(raw.get('proxies') or ()),
+            plans={name: item[1] for name, item in compiled.items()},
+        )
+        return snapshot, compiled
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_config_service():
+    """获取全局配置服务实例"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ConfigService(compiler=_compile_plan)
+    return _service
+
+
 def load_company_configs():
     """加载公司配置"""
-    config = load_yaml_config('companies.yaml')
     # 只返回启用的公司
-    companies = config.get('companies', [])
-    return [c for c in companies if c.get('enabled', True)]
+    return list(get_config_service().snapshot().companies)
 
 
 def load_email_config():
     """加载邮件配置"""
-    config = load_yaml_config('email_config.yaml')
-    return config.get('email', {})
+    return get_config_service().snapshot().email
 
 
 def load_settings():
     """加载系统设置"""
-    return load_yaml_config('settings.yaml')
+    return get_config_service().snapshot().settings
 
 
 def load_proxy_list():
     """加载代理IP列表"""
-    proxy_file = CONFIG_DIR / "proxy_list.txt"
-    if not proxy_file.exists():
-        return []
-    
-    proxies = []
-    with open(proxy_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                proxies.append(line)
-    return proxies
+    return list(get_config_service().snapshot().proxies)
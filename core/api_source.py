@@ -0,0 +1,176 @@
+"""
+接口数据源模块 - 直接请求招聘网站的JSON接口
+
+很多招聘页面是单页应用，岗位列表由浏览器请求JSON接口后渲染。
+公司配置 type: api 时直接请求该接口，按字段映射提取岗位，不再启动浏览器。
+
+配置示例（companies.yaml）：
+    - name: "示例公司"
+      type: api
+      url: "https://jobs.example.com/campus"        # 招聘页面，用于通知中的链接
+      api:
+        url: "https://jobs.example.com/api/positions"
+        method: POST                                # 默认 GET
+        json: {recruitType: 2, keyword: ""}         # 请求体（也可以用 params / data）
+        headers: {Referer: "https://jobs.example.com/campus"}
+        items: data.list                            # 岗位列表的路径
+        fields:
+          title: name
+          url: "https://jobs.example.com/campus/position/{id}"
+          location: cities[*].name
+          detail: department.name
+        pagination:                                 # 可选
+          param: pageNum                            # 页码参数名
+          start: 1                                  # 第一页的页码
+          size_param: pageSize                      # 每页数量参数名（可选）
+          size: 50
+          max_pages: 10
+          total: data.total                         # 岗位总数的路径（可选）
+          stop_when_known: true                     # 某一页的岗位都已保存过时停止（默认）
+
+字段路径语法见 core.json_mapping。
+"""
+
+import copy
+
+from config import ConfigError
+from core.fetcher import FetchRequest
+from core.json_mapping import FieldMapping, JsonPath
+from core.pagination import validate_section
+
+# api 配置字段: 字段名 -> (允许的类型, 是否必填)
+API_SCHEMA = {
+    'url': (str, True),
+    'method': (str, False),
+    'params': (dict, False),
+    'json': (dict, False),
+    'data': (dict, False),
+    'headers': (dict, False),
+    'items': (str, True),
+    'fields': (dict, True),
+    'pagination': (dict, False),
+}
+
+# pagination 配置字段
+PAGINATION_SCHEMA = {
+    'param': (str, True),
+    'start': (int, False),
+    'size_param': (str, False),
+    'size': (int, False),
+    'max_pages': (int, False),
+    'total': (str, False),
+    'stop_when_known': (bool, False),
+}
+
+METHODS = ('GET', 'POST')
+
+
+class ApiSpec:
+    """编译后的接口配置"""
+
+    __slots__ = ('url', 'method', 'params', 'json', 'data', 'headers', 'mapping',
+                 'page_param', 'page_start', 'size_param', 'page_size', 'max_pages', 'total',
+                 'stop_when_known')
+
+    def __init__(self, company_name, config):
+        """
+        校验并编译接口配置
+
+        Args:
+            company_name: 公司名称
+            config: api 配置字典
+
+        Raises:
+            ConfigError: 配置不合法时抛出
+        """
+        if not isinstance(config, dict):
+            raise ConfigError(f"{company_name}: type 为 api 时需要 api 配置")
+        validate_section(company_name, 'api', config, API_SCHEMA)
+
+        self.url = config['url']
+        self.method = config.get('method', 'GET').upper()
+        if self.method not in METHODS:
+            raise ConfigError(f"{company_name}: api.method 只支持 {'/'.join(METHODS)}")
+        if config.get('json') is not None and config.get('data') is not None:
+            raise ConfigError(f"{company_name}: api.json 和 api.data 只能设置一个")
+        self.params = config.get('params') or {}
+        self.json = config.get('json')
+        self.data = config.get('data')
+        self.headers = {'Accept': 'application/json, text/plain, */*', **(config.get('headers') or {})}
+        self.mapping = FieldMapping(company_name, config['items'], config['fields'])
+
+        pagination = config.get('pagination')
+        self.page_param = self.size_param = self.total = None
+        self.page_start, self.page_size, self.max_pages = 1, None, 1
+        self.stop_when_known = True
+        if pagination is not None:
+            validate_section(company_name, 'api.pagination', pagination, PAGINATION_SCHEMA)
+            self.stop_when_known = pagination.get('stop_when_known', True)
+            self.page_param = pagination['param']
+            self.page_start = pagination.get('start', 1)
+            self.size_param = pagination.get('size_param')
+            self.page_size = pagination.get('size')
+            self.max_pages = pagination.get('max_pages', 10)
+            if self.max_pages < 1:
+                raise ConfigError(f"{company_name}: api.pagination.max_pages 应大于0")
+            if self.size_param and not self.page_size:
+                raise ConfigError(f"{company_name}: 设置了 size_param 时需要 size")
+            if pagination.get('total'):
+                try:
+                    self.total = JsonPath(pagination['total'])
+                except ConfigError as e:
+                    raise ConfigError(f"{company_name}: {e}") from None
+
+    def request(self, page_index=0):
+        """
+        生成第 page_index 页（从0开始）的请求
+
+        页码参数放在请求体（json/data）中，没有请求体时放在查询参数中
+
+        Args:
+            page_index: 第几页
+
+        Returns:
+            FetchRequest: 请求
+        """
+        params = dict(self.params)
+        body = copy.deepcopy(self.json if self.json is not None else self.data)
+        if self.page_param:
+            paging = {self.page_param: self.page_start + page_index}
+            if self.size_param:
+                paging[self.size_param] = self.page_size
+            (body if body is not None else params).update(paging)
+
+        return FetchRequest(
+            self.url,
+            self.method,
+            params=params or None,
+            data=body if self.data is not None else None,
+            json=body if self.json is not None else None,
+            headers=self.headers,
+        )
+
+    def is_last_page(self, data, page_index, item_count):
+        """
+        判断第 page_index 页是否为最后一页
+
+        Args:
+            data: 该页的JSON数据
+            page_index: 第几页（从0开始）
+            item_count: 该页的岗位数量（过滤前）
+
+        Returns:
+            bool: 是否不需要再请求下一页
+        """
+        if not self.page_param or page_index + 1 >= self.max_pages or item_count == 0:
+            return True
+        if self.page_size and item_count < self.page_size:
+            return True
+        if self.total is not None:
+            try:
+                total = int(self.total.first(data))
+            except (TypeError, ValueError):
+                return False
+            # 按每页数量（未配置时按本页数量）估计已取得的岗位数
+            return (page_index + 1) * (self.page_size or item_count) >= total
+        return False
@@ -0,0 +1,437 @@
+"""
+浏览器管理模块 - 复用无头Chrome进程
+
+启动Chrome和ChromeDriver需要数秒，BrowserManager 在多次爬取之间复用同一个浏览器，
+浏览器崩溃或打开页面数达到上限时才重新创建。
+
+招聘页面的图片、字体、视频和统计脚本对提取岗位没有用处，BrowserProfile 的轻量模式
+不加载这些资源（图片用浏览器设置关闭，其余按URL规则通过CDP屏蔽），并关闭扩展、
+后台网络等功能，减少每个页面的加载时间和浏览器内存。每个页面实际传输的字节数和按URL规则
+屏蔽的请求数从浏览器的性能日志中统计。被屏蔽的请求不会发出，关闭的图片也不会产生请求，
+浏览器无法得知这些资源的大小，因此运行时只统计传输量，不估算节省的流量；
+轻量模式相比普通模式节省的流量见 benchmarks/bench_browser_profile.py。
+
+配置 tabs 大于1时，多个动态页面公司可以在同一个浏览器的多个标签页中同时加载和渲染，
+每个公司占用独立的标签页，不必为每个公司启动一个浏览器进程。
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from utils.anti_crawl import get_random_headers
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 查找Chrome可执行文件路径
+CHROME_PATHS = [
+    r"C:\Users\a1830\AppData\Local\GptChrome\GptBrowser.exe",
+    r"C:\Users\a1830\AppData\Local\GptChrome\Application\chrome.exe",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+]
+
+# 与本地Chrome版本匹配的ChromeDriver版本
+CHROMEDRIVER_VERSION = "128.0.6613.137"
+
+# 资源类型 -> 文件扩展名，按 "*.扩展名" 和 "*.扩展名?*" 屏蔽
+RESOURCE_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico', 'bmp', 'avif'),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'mp3', 'm4a', 'ogg', 'wav', 'flv', 'm3u8'),
+    'stylesheet': ('css',),
+}
+# 默认屏蔽的资源类型；样式表可能影响"加载更多"按钮的可见性判断，默认不屏蔽
+DEFAULT_BLOCK_RESOURCES = ('image', 'font', 'media')
+# 默认屏蔽的统计、广告脚本
+DEFAULT_BLOCK_URLS = (
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*hm.baidu.com*',
+    '*cnzz.com*',
+    '*growingio.com*',
+    '*sensorsdata.cn*',
+    '*zhugeio.com*',
+    '*hotjar.com*',
+    '*clarity.ms*',
+)
+# 轻量模式下关闭的浏览器功能
+LIGHTWEIGHT_ARGUMENTS = (
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-notifications',
+    '--mute-audio',
+    '--no-first-run',
+    # 保留磁盘缓存，同一网站的脚本在多次检查之间复用，但限制大小
+    '--disk-cache-size=67108864',
+)
+# 多标签页并行渲染时，后台标签页不降低定时器和渲染优先级
+MULTI_TAB_ARGUMENTS = (
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+)
+
+
+class BrowserProfile:
+    """浏览器启动配置：是否轻量模式、屏蔽哪些资源"""
+
+    __slots__ = ('lightweight', 'block_resources', 'block_urls')
+
+    def __init__(self, lightweight=True, block_resources=DEFAULT_BLOCK_RESOURCES, block_urls=DEFAULT_BLOCK_URLS):
+        """
+        Args:
+            lightweight: 是否启用轻量模式，关闭时按原样加载全部资源
+            block_resources: 屏蔽的资源类型，见 RESOURCE_EXTENSIONS
+            block_urls: 额外屏蔽的URL通配符（* 匹配任意字符）
+        """
+        self.lightweight = lightweight
+        self.block_resources = tuple(block_resources)
+        self.block_urls = tuple(block_urls)
+
+    @classmethod
+    def from_settings(cls, browser_settings):
+        """
+        根据 settings.yaml 的 browser 配置创建
+
+        Args:
+            browser_settings: browser 配置字典
+
+        Returns:
+            BrowserProfile: 浏览器启动配置
+        """
+        block_resources = []
+        for resource in browser_settings.get('block_resources', DEFAULT_BLOCK_RESOURCES) or []:
+            if resource in RESOURCE_EXTENSIONS:
+                block_resources.append(resource)
+            else:
+                logger.warning(f"未知的资源类型 {resource}，可选: {', '.join(RESOURCE_EXTENSIONS)}")
+        return cls(
+            lightweight=browser_settings.get('lightweight', True),
+            block_resources=block_resources,
+            block_urls=browser_settings.get('block_urls', DEFAULT_BLOCK_URLS) or (),
+        )
+
+    def blocked_patterns(self):
+        """
+        需要通过CDP屏蔽的URL通配符
+
+        Returns:
+            list: URL通配符列表，未启用轻量模式时为空
+        """
+        if not self.lightweight:
+            return []
+        patterns = list(self.block_urls)
+        for resource in self.block_resources:
+            for extension in RESOURCE_EXTENSIONS[resource]:
+                patterns.extend((f'*.{extension}', f'*.{extension}?*'))
+        return patterns
+
+    def apply_options(self, options):
+        """
+        把轻量模式的启动参数和偏好设置写入 Chrome Options
+
+        Args:
+            options: selenium.webdriver.chrome.options.Options
+        """
+        # 性能日志只记录网络事件，用于统计每个页面的传输量
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        if not self.lightweight:
+            return
+
+        for argument in LIGHTWEIGHT_ARGUMENTS:
+            options.add_argument(argument)
+        prefs = {'profile.default_content_setting_values.notifications': 2}
+        if 'image' in self.block_resources:
+            # 图片在浏览器内直接关闭，不会发出请求
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            prefs['profile.managed_default_content_settings.images'] = 2
+        options.add_experimental_option('prefs', prefs)
+
+    def apply_driver(self, driver):
+        """
+        在新启动的浏览器上设置URL屏蔽规则
+
+        Args:
+            driver: WebDriver
+        """
+        patterns = self.blocked_patterns()
+        if not patterns:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        except Exception as e:
+            logger.warning(f"设置资源屏蔽规则失败: {e}")
+
+
+def page_traffic(driver):
+    """
+    从性能日志中统计上次读取以来的网络传输（读取后日志被清空）
+
+    Args:
+        driver: WebDriver
+
+    Returns:
+        tuple: (实际传输的字节数, 按URL规则屏蔽的请求数)；浏览器不支持性能日志时返回 None
+    """
+    try:
+        entries = driver.get_log('performance')
+    except Exception as e:
+        logger.debug(f"读取性能日志失败: {e}")
+        return None
+
+    transferred = blocked = 0
+    for entry in entries:
+        text = entry.get('message', '')
+        # 只解析请求结束的事件
+        if 'Network.loading' not in text:
+            continue
+        message = json.loads(text).get('message', {})
+        params = message.get('params', {})
+        if message.get('method') == 'Network.loadingFinished':
+            transferred += params.get('encodedDataLength', 0)
+        elif message.get('method') == 'Network.loadingFailed' and (
+                params.get('blockedReason') or 'BLOCKED_BY_CLIENT' in params.get('errorText', '')):
+            blocked += 1
+    return int(transferred), blocked
+
+
+class BrowserManager:
+    """浏览器管理类"""
+
+    def __init__(self, max_pages_per_browser=200, profile=None, tabs=1, tab_timeout=60):
+        """
+        初始化浏览器管理器
+
+        Args:
+            max_pages_per_browser: 同一个浏览器最多打开的页面数，超过后重启以释放内存
+            profile: 浏览器启动配置（BrowserProfile），默认启用轻量模式
+            tabs: 同时渲染的标签页数上限，1 表示逐个公司渲染
+            tab_timeout: 标签页等待页面加载完成的最长时间（秒）
+        """
+        self.max_pages_per_browser = max_pages_per_browser
+        self.profile = profile or BrowserProfile()
+        self.tabs = max(1, tabs)
+        self.tab_timeout = tab_timeout
+        self._driver = None
+        self._pages_opened = 0
+        # 当前 page() 中打开的标签页数
+        self._tabs_opened = 0
+        self._lock = threading.RLock()
+        # 累计统计：统计过的页面数、实际传输的字节数、按URL规则屏蔽的请求数（不是节省的流量）
+        self.pages_measured = 0
+        self.bytes_transferred = 0
+        self.requests_blocked = 0
+
+    @classmethod
+    def from_settings(cls, browser_settings):
+        """
+        根据 settings.yaml 的 browser 配置创建
+
+        Args:
+            browser_settings: browser 配置字典
+
+        Returns:
+            BrowserManager: 浏览器管理器
+        """
+        return cls(
+            max_pages_per_browser=browser_settings.get('max_pages_per_browser', 200),
+            profile=BrowserProfile.from_settings(browser_settings),
+            tabs=browser_settings.get('tabs', 1),
+            tab_timeout=browser_settings.get('tab_timeout_seconds', 60),
+        )
+
+    def configure(self, browser_settings):
+        """
+        应用新的 browser 配置；启动参数变化时关闭当前浏览器，下次使用时按新配置启动
+
+        Args:
+            browser_settings: browser 配置字典
+        """
+        with self._lock:
+            self.max_pages_per_browser = browser_settings.get('max_pages_per_browser', 200)
+            self.tab_timeout = browser_settings.get('tab_timeout_seconds', 60)
+            profile = BrowserProfile.from_settings(browser_settings)
+            tabs = max(1, browser_settings.get('tabs', 1))
+            if (profile.lightweight, profile.block_resources, profile.block_urls, tabs > 1) != \
+                    (self.profile.lightweight, self.profile.block_resources, self.profile.block_urls, self.tabs > 1):
+                self.profile = profile
+                self.reset()
+            self.tabs = tabs
+
+    def _build_options(self):
+        """构建Chrome启动参数"""
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument(f'user-agent={get_random_headers()["User-Agent"]}')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        if self.tabs > 1:
+            for argument in MULTI_TAB_ARGUMENTS:
+                options.add_argument(argument)
+        self.profile.apply_options(options)
+
+        for path in CHROME_PATHS:
+            if os.path.exists(path):
+                options.binary_location = path
+                logger.info(f"使用Chrome: {path}")
+                break
+
+        return options
+
+    def _create_driver(self):
+        """启动新的浏览器"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        options = self._build_options()
+        try:
+            # 使用 webdriver_manager 自动下载匹配版本的 ChromeDriver
+            from webdriver_manager.chrome import ChromeDriverManager
+            service = Service(ChromeDriverManager(driver_version=CHROMEDRIVER_VERSION).install())
+            driver = webdriver.Chrome(service=service, options=options)
+        except Exception as e:
+            logger.warning(f"webdriver_manager失败: {e}, 尝试直接启动...")
+            driver = webdriver.Chrome(options=options)
+
+        self.profile.apply_driver(driver)
+        logger.info("浏览器已启动" + ("（轻量模式）" if self.profile.lightweight else ""))
+        return driver
+
+    def _is_alive(self):
+        """检查当前浏览器是否仍可用"""
+        try:
+            self._driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def get_driver(self):
+        """
+        获取可用的浏览器，没有或已失效时自动启动
+
+        Returns:
+            WebDriver: 浏览器实例
+        """
+        with self._lock:
+            if self._driver is not None:
+                if self._pages_opened >= self.max_pages_per_browser:
+                    logger.info(f"浏览器已打开 {self._pages_opened} 个页面，重启以释放内存")
+                    self.reset()
+                elif not self._is_alive():
+                    logger.warning("浏览器已失效，重新启动")
+                    self.reset()
+
+            if self._driver is None:
+                self._driver = self._create_driver()
+                self._pages_opened = 0
+            return self._driver
+
+    @contextmanager
+    def page(self):
+        """
+        占用浏览器打开一个页面
+
+        每次使用前轮换User-Agent；使用过程中出错时重启浏览器，避免下次复用到异常状态
+
+        Yields:
+            WebDriver: 浏览器实例
+        """
+        with self._lock:
+            driver = self.get_driver()
+            self._pages_opened += 1
+            self._tabs_opened = 0
+            self._rotate_user_agent(driver)
+
+            try:
+                yield driver
+            except Exception:
+                self.reset()
+                raise
+            self._record_traffic(driver, self._tabs_opened or 1)
+
+    @staticmethod
+    def _rotate_user_agent(driver):
+        """轮换当前标签页的User-Agent"""
+        try:
+            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+                'userAgent': get_random_headers()['User-Agent']
+            })
+        except Exception as e:
+            logger.debug(f"设置User-Agent失败: {e}")
+
+    def open_tab(self, driver, url):
+        """
+        在新标签页中开始加载页面，不等待加载完成（需要在 page() 中调用）
+
+        屏蔽规则和User-Agent按标签页生效，新标签页打开后先设置再开始加载
+
+        Args:
+            driver: page() 提供的浏览器
+            url: 页面URL
+
+        Returns:
+            str: 新标签页的句柄，之后用 driver.switch_to.window 切换
+        """
+        with self._lock:
+            driver.switch_to.new_window('tab')
+            self._pages_opened += 1
+            self._tabs_opened += 1
+            self.profile.apply_driver(driver)
+            self._rotate_user_agent(driver)
+            driver.execute_script('window.location.href = arguments[0];', url)
+            return driver.current_window_handle
+
+    @staticmethod
+    def close_tab(driver, handle, home):
+        """
+        关闭标签页并切换回 home 标签页
+
+        Args:
+            driver: page() 提供的浏览器
+            handle: 要关闭的标签页句柄
+            home: 切换回的标签页句柄
+        """
+        driver.switch_to.window(handle)
+        driver.close()
+        driver.switch_to.window(home)
+
+    def _record_traffic(self, driver, pages=1):
+        """统计刚打开的页面（pages 个）的网络传输"""
+        traffic = page_traffic(driver)
+        if traffic is None:
+            return
+        transferred, blocked = traffic
+        self.pages_measured += pages
+        self.bytes_transferred += transferred
+        self.requests_blocked += blocked
+        logger.debug(f"{pages} 个页面实际传输 {transferred / 1024:.0f} KB，按URL规则屏蔽 {blocked} 个请求")
+
+    def reset(self):
+        """关闭当前浏览器，下次使用时重新启动"""
+        with self._lock:
+            if self._driver is not None:
+                try:
+                    self._driver.quit()
+                except Exception as e:
+                    logger.debug(f"关闭浏览器失败: {e}")
+                self._driver = None
+
+    def close(self):
+        """释放浏览器资源"""
+        if self.pages_measured:
+            logger.info(f"浏览器共打开 {self.pages_measured} 个页面，实际传输 "
+                        f"{self.bytes_transferred / 1024 / 1024:.1f} MB，按URL规则屏蔽 {self.requests_blocked} 个请求")
+        self.reset()
@@ -0,0 +1,291 @@
+"""
+通知渠道模块 - 邮件、Webhook、JSONL文件、标准输出
+
+每条通知按渠道分别写入发件箱，每个渠道由独立的发送线程处理，
+各自使用自己的超时和重试设置，一个渠道变慢或不可用不会影响其他渠道。
+
+渠道在 settings.yaml 的 notify.channels 中配置，未配置时只使用邮件。
+"""
+
+import json
+import smtplib
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from config import ConfigError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChannelUnavailable(Exception):
+    """渠道整体不可用（如认证失败），本批剩余通知也无法发送"""
+
+
+def job_payload(jobs):
+    """
+    生成结构化渠道使用的岗位数据
+
+    Args:
+        jobs: 岗位列表
+
+    Returns:
+        list: 可JSON序列化的岗位字典列表
+    """
+    fields = ('id', 'company', 'title', 'url', 'location', 'detail', 'found_time')
+    return [{field: job.get(field) for field in fields if job.get(field) is not None} for job in jobs]
+
+
+class NotificationChannel:
+    """
+    通知渠道基类
+
+    子类实现 send(row)；需要在一批通知之间复用连接的渠道重写 session()
+    """
+
+    # 渠道类型，对应配置中的 type
+    type = None
+    # 是否需要HTML正文
+    html = False
+    # 是否需要结构化的岗位数据（写入发件箱的 payload 列）
+    structured = True
+
+    def __init__(self, name=None, timeout=10, max_retry=3, retry_delay=5):
+        """
+        Args:
+            name: 渠道名称，写入发件箱的 channel 列，默认为渠道类型
+            timeout: 单次发送超时时间（秒）
+            max_retry: 最多尝试次数
+            retry_delay: 首次重试等待时间（秒），之后按2倍递增
+        """
+        self.name = name or self.type
+        self.timeout = timeout
+        self.max_retry = max_retry
+        self.retry_delay = retry_delay
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+    def retry_backoff(self, attempt):
+        """
+        计算第 attempt 次失败后的重试等待时间（指数退避）
+
+        Args:
+            attempt: 已失败的次数（从1开始）
+
+        Returns:
+            float: 等待秒数
+        """
+        return self.retry_delay * (2 ** (attempt - 1))
+
+    @contextmanager
+    def session(self):
+        """
+        打开一个发送会话，一批通知在同一个会话中发送
+
+        Yields:
+            具有 send(row) 方法的对象
+        """
+        yield self
+
+    def send(self, row):
+        """
+        发送一条通知
+
+        Args:
+            row: 发件箱记录，包含 subject/body_html/body_text/recipient/payload
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def message(row):
+        """结构化渠道发送的消息内容"""
+        return {
+            'subject': row['subject'],
+            'recipient': row['recipient'],
+            'text': row['body_text'],
+            'jobs': row.get('payload') or [],
+        }
+
+
+class EmailChannel(NotificationChannel):
+    """邮件渠道，同一批邮件复用一个已登录的SMTP连接"""
+
+    type = 'email'
+    html = True
+    structured = False
+
+    def __init__(self, notifier, **kwargs):
+        """
+        Args:
+            notifier: EmailNotifier 实例
+        """
+        kwargs.setdefault('max_retry', notifier.max_retry)
+        kwargs.setdefault('retry_delay', notifier.retry_delay)
+        kwargs.setdefault('timeout', 30)
+        super().__init__(**kwargs)
+        self.notifier = notifier
+
+    @contextmanager
+    def session(self):
+        with self.notifier.smtp_session(timeout=self.timeout) as smtp:
+            yield _EmailSession(self, smtp)
+
+    def send(self, row):
+        with self.session() as session:
+            session.send(row)
+
+
+class _EmailSession:
+    """邮件渠道的发送会话"""
+
+    def __init__(self, channel, smtp):
+        self.channel = channel
+        self.smtp = smtp
+
+    def send(self, row):
+        recipient = row['recipient'] or self.channel.notifier.receiver_email
+        try:
+            self.smtp.send(row['subject'], row['body_html'], recipient, row['body_text'])
+        except smtplib.SMTPAuthenticationError as e:
+            raise ChannelUnavailable(f"邮箱认证失败，请检查邮箱和授权码是否正确: {e}") from e
+        except Exception:
+            # 连接状态未知，后续通知使用新连接
+            self.smtp.close()
+            raise
+
+
+class WebhookChannel(NotificationChannel):
+    """Webhook渠道，以JSON格式POST通知内容"""
+
+    type = 'webhook'
+
+    def __init__(self, url, headers=None, **kwargs):
+        """
+        Args:
+            url: Webhook地址
+            headers: 额外的请求头
+        """
+        super().__init__(**kwargs)
+        self.url = url
+        self.headers = dict(headers or {})
+
+    @contextmanager
+    def session(self):
+        with requests.Session() as http:
+            http.headers.update(self.headers)
+            yield _WebhookSession(self, http)
+
+    def send(self, row):
+        with self.session() as session:
+            session.send(row)
+
+
+class _WebhookSession:
+    """Webhook渠道的发送会话，一批通知复用同一个HTTP连接"""
+
+    def __init__(self, channel, http):
+        self.channel = channel
+        self.http = http
+
+    def send(self, row):
+        response = self.http.post(self.channel.url, json=self.channel.message(row), timeout=self.channel.timeout)
+        response.raise_for_status()
+
+
+class JsonlChannel(NotificationChannel):
+    """JSONL文件渠道，每条通知追加一行JSON，便于其他程序读取"""
+
+    type = 'jsonl'
+
+    def __init__(self, path, **kwargs):
+        """
+        Args:
+            path: 输出文件路径
+        """
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def send(self, row):
+        record = self.message(row)
+        record['sent_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+class StdoutChannel(NotificationChannel):
+    """标准输出渠道，打印纯文本通知，用于调试或由外部程序收集"""
+
+    type = 'stdout'
+    structured = False
+
+    def send(self, row):
+        sys.stdout.write(f"\n{row['subject']}\n{row['body_text']}\n")
+        sys.stdout.flush()
+
+
+# 渠道类型 -> (渠道类, 必填配置项)
+CHANNEL_TYPES = {
+    'email': (EmailChannel, ()),
+    'webhook': (WebhookChannel, ('url',)),
+    'jsonl': (JsonlChannel, ('path',)),
+    'stdout': (StdoutChannel, ()),
+}
+
+
+def build_channels(notify_settings, notifier):
+    """
+    根据 notify.channels 配置创建通知渠道
+
+    Args:
+        notify_settings: settings.yaml 中的 notify 配置
+        notifier: EmailNotifier 实例，邮件渠道使用
+
+    Returns:
+        list: 通知渠道列表
+
+    Raises:
+        ConfigError: 渠道配置不合法时抛出
+    """
+    entries = (notify_settings or {}).get('channels') or [{'type': 'email'}]
+    if not isinstance(entries, list):
+        raise ConfigError("notify.channels 应为列表")
+
+    channels = []
+    names = set()
+    for index, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise ConfigError(f"notify.channels 第 {index} 项应为字典")
+        options = dict(entry)
+        channel_type = options.pop('type', None)
+        if channel_type not in CHANNEL_TYPES:
+            raise ConfigError(f"notify.channels 第 {index} 项: 未知的渠道类型 {channel_type!r}，"
+                              f"可选 {', '.join(CHANNEL_TYPES)}")
+        if not options.pop('enabled', True):
+            continue
+
+        channel_class, required = CHANNEL_TYPES[channel_type]
+        for field in required:
+            if not options.get(field):
+                raise ConfigError(f"notify.channels 第 {index} 项: {channel_type} 渠道缺少 {field}")
+        if channel_type == 'email':
+            options['notifier'] = notifier
+
+        try:
+            channel = channel_class(**options)
+        except TypeError as e:
+            raise ConfigError(f"notify.channels 第 {index} 项: {e}") from None
+        if channel.name in names:
+            raise ConfigError(f"通知渠道名称重复: {channel.name}")
+        names.add(channel.name)
+        channels.append(channel)
+    return channels
@@ -0,0 +1,280 @@
+"""
+熔断模块 - 请求重试策略与按公司熔断
+
+- RetryPolicy: 单次爬取内的重试。只有超时、连接错误、429、5xx 等临时错误才重试，
+  404、400 这类永久错误立即放弃；重试间隔按指数退避并加随机抖动，
+  服务器返回 Retry-After 时按其等待（不超过上限）
+- CircuitBreaker: 跨多次检查的熔断。公司连续若干次检查失败后熔断（open），
+  冷却期内的检查直接跳过；冷却期满后的下一次检查作为试探（half_open），
+  试探成功恢复正常，失败则再次熔断且冷却时间翻倍
+
+熔断状态保存在数据库的 runtime_state 表中，重启后保留，多节点共享。
+"""
+
+import random
+import time
+import requests
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# 可以重试的HTTP状态码：请求超时、请求过快、服务端错误
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def is_retryable(error):
+    """
+    判断请求错误是否为临时错误，值得重试
+
+    Args:
+        error: 请求抛出的异常
+
+    Returns:
+        bool: 是否可以重试
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is None or response.status_code in RETRYABLE_STATUS or response.status_code >= 500
+    # SSL错误是 ConnectionError 的子类，但重试也不会成功
+    if isinstance(error, requests.exceptions.SSLError):
+        return False
+    return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                              requests.exceptions.ChunkedEncodingError))
+
+
+def _retry_after(error):
+    """读取响应的 Retry-After 头（秒），没有或不是秒数时返回 None"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    try:
+        return max(float(response.headers.get('Retry-After', '')), 0.0)
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """请求重试策略"""
+
+    __slots__ = ('max_attempts', 'backoff', 'backoff_max')
+
+    def __init__(self, max_attempts=3, backoff=2.0, backoff_max=30.0):
+        """
+        Args:
+            max_attempts: 每个页面最多请求次数（含首次请求）
+            backoff: 首次重试前的等待时间（秒），之后每次翻倍
+            backoff_max: 单次等待时间上限（秒）
+        """
+        self.max_attempts = max(int(max_attempts), 1)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def from_settings(cls, spider_settings):
+        """
+        根据 settings.yaml 的 spider 配置创建重试策略
+
+        Args:
+            spider_settings: spider 配置字典
+        """
+        return cls(
+            spider_settings.get('max_retries', 3),
+            spider_settings.get('retry_backoff_seconds', 2.0),
+            spider_settings.get('retry_backoff_max_seconds', 30.0),
+        )
+
+    def should_retry(self, error, attempt, retryable=None):
+        """
+        判断第 attempt 次请求失败后是否重试
+
+        Args:
+            error: 请求抛出的异常
+            attempt: 已请求的次数（从1开始）
+            retryable: 调用方已判断的结果，为None时按 is_retryable 判断
+
+        Returns:
+            bool: 是否重试
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return is_retryable(error) if retryable is None else retryable
+
+    def delay(self, attempt, error=None):
+        """
+        第 attempt 次请求失败后的等待时间
+
+        Args:
+            attempt: 已请求的次数（从1开始）
+            error: 请求抛出的异常，用于读取 Retry-After
+
+        Returns:
+            float: 等待秒数
+        """
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = min(self.backoff * (2 ** (attempt - 1)), self.backoff_max)
+        # 抖动：多个公司同时重试时错开请求
+        return delay * random.uniform(0.5, 1.0)
+
+
+class CircuitBreaker:
+    """按公司熔断"""
+
+    STATE_PREFIX = 'circuit:'
+
+    def __init__(self, db, failure_threshold=3, cooldown_seconds=3600, max_cooldown_seconds=86400):
+        """
+        Args:
+            db: JobDatabase，熔断状态保存在其 runtime_state 表中
+            failure_threshold: 连续失败多少次后熔断，0 表示不熔断
+            cooldown_seconds: 首次熔断的冷却时间（秒），之后每次翻倍
+            max_cooldown_seconds: 冷却时间上限（秒）
+        """
+        self.db = db
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+
+    @classmethod
+    def from_settings(cls, db, spider_settings):
+        """
+        根据 settings.yaml 的 spider 配置创建熔断器
+
+        Args:
+            db: JobDatabase
+            spider_settings: spider 配置字典
+        """
+        breaker = cls(db)
+        breaker.configure(spider_settings)
+        return breaker
+
+    def configure(self, spider_settings):
+        """应用 spider 配置中的熔断参数"""
+        self.failure_threshold = spider_settings.get('circuit_failure_threshold', 3)
+        self.cooldown_seconds = spider_settings.get('circuit_cooldown_minutes', 60) * 60
+        self.max_cooldown_seconds = spider_settings.get('circuit_max_cooldown_hours', 24) * 3600
+
+    def _load(self, key):
+        return self.db.get_state(self.STATE_PREFIX + key)
+
+    def _save(self, key, state):
+        self.db.set_state(self.STATE_PREFIX + key, state)
+
+    def status(self, key):
+        """
+        查询熔断状态
+
+        Args:
+            key: 公司名称
+
+        Returns:
+            dict: 状态信息 {state, failures, opened_at, cooldown, last_error}，正常时为None
+        """
+        return self._load(key)
+
+    def is_open(self, key, url=None):
+        """
+        只读地检查公司是否处于熔断冷却期（不记录日志、不转为试探状态）
+
+        Args:
+            key: 公司名称
+            url: 公司招聘页面URL，与熔断时的URL不同时视为未熔断
+
+        Returns:
+            bool: 是否处于冷却期
+        """
+        if not self.failure_threshold:
+            return False
+        state = self._load(key)
+        if state is None or state['state'] != OPEN:
+            return False
+        if url is not None and state.get('url') not in (None, url):
+            return False
+        return state['opened_at'] + state['cooldown'] > time.time()
+
+    def allow(self, key, url=None):
+        """
+        检查本次是否可以爬取该公司
+
+        冷却期满时转为试探状态并放行；公司URL变化（配置已修改）时重置熔断
+
+        Args:
+            key: 公司名称
+            url: 公司招聘页面URL
+
+        Returns:
+            bool: 是否放行
+        """
+        if not self.failure_threshold:
+            return True
+        state = self._load(key)
+        if state is None:
+            return True
+        if url is not None and state.get('url') not in (None, url):
+            logger.info(f"{key} 的URL已修改，重置熔断状态")
+            self._save(key, None)
+            return True
+        if state['state'] != OPEN:
+            return True
+
+        remaining = state['opened_at'] + state['cooldown'] - time.time()
+        if remaining > 0:
+            logger.info(f"⏸ {key} 已熔断（连续失败 {state['failures']} 次，最近错误: {state.get('last_error', '')}），"
+                        f"{remaining / 60:.0f} 分钟后再试探")
+            return False
+
+        state['state'] = HALF_OPEN
+        self._save(key, state)
+        logger.info(f"{key} 冷却期已过，本次检查作为试探")
+        return True
+
+    def record_success(self, key):
+        """
+        记录一次成功的检查，恢复正常状态
+
+        Args:
+            key: 公司名称
+        """
+        state = self._load(key)
+        if state is None:
+            return
+        if state['state'] != CLOSED:
+            logger.info(f"✅ {key} 已恢复，解除熔断")
+        self._save(key, None)
+
+    def record_failure(self, key, error, url=None):
+        """
+        记录一次失败的检查，达到阈值或试探失败时熔断
+
+        Args:
+            key: 公司名称
+            error: 失败原因
+            url: 公司招聘页面URL
+
+        Returns:
+            bool: 是否处于熔断状态
+        """
+        if not self.failure_threshold:
+            return False
+        state = self._load(key) or {'state': CLOSED, 'failures': 0, 'cooldown': 0}
+        state['failures'] += 1
+        state['last_error'] = str(error)[:200]
+        state['url'] = url
+
+        if state['state'] == HALF_OPEN:
+            cooldown = min(max(state['cooldown'], self.cooldown_seconds) * 2, self.max_cooldown_seconds)
+        elif state['failures'] >= self.failure_threshold:
+            cooldown = min(self.cooldown_seconds, self.max_cooldown_seconds)
+        else:
+            cooldown = None
+
+        if cooldown is not None:
+            state.update(state=OPEN, opened_at=time.time(), cooldown=cooldown)
+            logger.warning(f"⛔ {key} 连续失败 {state['failures']} 次，熔断 {cooldown / 60:.0f} 分钟")
+        self._save(key, state)
+        return state['state'] == OPEN
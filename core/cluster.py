@@ -0,0 +1,308 @@
+"""
+多节点协调模块 - 基于SQLite租约表的任务分配
+
+多个监控实例指向同一个协调数据库时：
+- 每个节点定期写入心跳，并续期自己持有的租约
+- 公司通过租约分配给节点，每个节点最多认领 ceil(公司数/存活节点数) 个
+- 节点失联后租约过期，其他节点可以接手（只接手已过期的租约）
+- 发送通知前需要获得通知租约，保证同一时间只有一个节点发送
+"""
+
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 通知租约的资源名，与公司名区分开
+NOTIFY_RESOURCE = '__notify__'
+
+
+class LeaseManager:
+    """租约管理类"""
+
+    def __init__(self, db_path="data/cluster.db", node_id=None, lease_seconds=600, heartbeat_seconds=30):
+        """
+        初始化租约管理器
+
+        Args:
+            db_path: 协调数据库路径（相对路径相对于项目根目录）
+            node_id: 节点ID，为空时使用 主机名-进程号
+            lease_seconds: 租约有效期（秒），节点超过该时间没有心跳视为失联
+            heartbeat_seconds: 心跳间隔（秒）
+        """
+        project_root = Path(__file__).parent.parent
+        self.db_path = project_root / db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+
+        self._stop_event = threading.Event()
+        self._heartbeat_thread = None
+
+        self.init_database()
+        self.heartbeat()
+
+    @classmethod
+    def from_settings(cls, cluster_settings):
+        """
+        根据 settings.yaml 中的 cluster 配置创建
+
+        Args:
+            cluster_settings: cluster 配置字典
+        """
+        return cls(
+            db_path=cluster_settings.get('coordination_db', 'data/cluster.db'),
+            node_id=cluster_settings.get('node_id') or None,
+            lease_seconds=cluster_settings.get('lease_seconds', 600),
+            heartbeat_seconds=cluster_settings.get('heartbeat_seconds', 30),
+        )
+
+    def get_connection(self):
+        """获取数据库连接（自动提交模式，事务由调用方显式开启）"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        """初始化租约表和节点表"""
+        conn = self.get_connection()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS leases (
+                    resource TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    acquired_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS nodes (
+                    node_id TEXT PRIMARY KEY,
+                    hostname TEXT DEFAULT '',
+                    started_at REAL NOT NULL,
+                    last_heartbeat REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_lease_owner ON leases(owner)')
+        finally:
+            conn.close()
+
+    def heartbeat(self):
+        """写入心跳，并续期本节点持有的全部租约"""
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('''
+                INSERT INTO nodes (node_id, hostname, started_at, last_heartbeat)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(node_id) DO UPDATE SET last_heartbeat = excluded.last_heartbeat
+            ''', (self.node_id, socket.gethostname(), now, now))
+            conn.execute('''
+                UPDATE leases SET expires_at = ?
+                WHERE owner = ? AND expires_at >= ?
+            ''', (now + self.lease_seconds, self.node_id, now))
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            logger.warning(f"节点心跳失败: {e}")
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+        finally:
+            conn.close()
+
+    def _heartbeat_loop(self):
+        """心跳线程"""
+        while not self._stop_event.wait(self.heartbeat_seconds):
+            self.heartbeat()
+
+    def start_heartbeat(self):
+        """启动后台心跳线程"""
+        if self._heartbeat_thread and self._heartbeat_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop, name='cluster-heartbeat', daemon=True
+        )
+        self._heartbeat_thread.start()
+        logger.info(f"集群节点 {self.node_id} 已启动心跳 (间隔 {self.heartbeat_seconds} 秒)")
+
+    def stop(self, release_all=True):
+        """
+        停止心跳
+
+        Args:
+            release_all: 是否释放本节点的全部租约，让其他节点立即接手
+        """
+        self._stop_event.set()
+        if self._heartbeat_thread:
+            self._heartbeat_thread.join(timeout=5)
+        if release_all:
+            conn = self.get_connection()
+            try:
+                conn.execute("DELETE FROM leases WHERE owner = ?", (self.node_id,))
+                conn.execute("DELETE FROM nodes WHERE node_id = ?", (self.node_id,))
+            finally:
+                conn.close()
+
+    def live_node_count(self):
+        """获取存活节点数量（最近一个租约周期内有心跳）"""
+        cutoff = time.time() - self.lease_seconds
+        conn = self.get_connection()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM nodes WHERE last_heartbeat >= ?", (cutoff,)
+            ).fetchone()
+            return max(1, row[0])
+        finally:
+            conn.close()
+
+    def try_acquire(self, resource):
+        """
+        尝试获取租约（租约空闲、已过期或本来就属于本节点时成功）
+
+        Args:
+            resource: 资源名（公司名或 NOTIFY_RESOURCE）
+
+        Returns:
+            bool: 是否获得租约
+        """
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute('''
+                INSERT INTO leases (resource, owner, expires_at, acquired_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(resource) DO UPDATE SET
+                    owner = excluded.owner,
+                    expires_at = excluded.expires_at,
+                    acquired_at = CASE WHEN leases.owner = excluded.owner
+                                       THEN leases.acquired_at ELSE excluded.acquired_at END
+                WHERE leases.owner = excluded.owner OR leases.expires_at < ?
+            ''', (resource, self.node_id, now + self.lease_seconds, now, now))
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.warning(f"获取租约失败 {resource}: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def release(self, resource):
+        """释放本节点持有的租约"""
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                "DELETE FROM leases WHERE resource = ? AND owner = ?",
+                (resource, self.node_id)
+            )
+        finally:
+            conn.close()
+
+    @contextmanager
+    def lease(self, resource, wait_seconds=0, poll_interval=2):
+        """
+        在租约保护下执行代码块
+
+        Args:
+            resource: 资源名
+            wait_seconds: 租约被占用时最多等待的秒数
+            poll_interval: 等待期间的重试间隔（秒）
+
+        Yields:
+            bool: 是否获得了租约，未获得时调用方应跳过受保护的操作
+        """
+        deadline = time.monotonic() + wait_seconds
+        acquired = self.try_acquire(resource)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            acquired = self.try_acquire(resource)
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release(resource)
+
+    def owned_resources(self):
+        """获取本节点当前持有的未过期租约"""
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT resource FROM leases WHERE owner = ? AND expires_at >= ?",
+                (self.node_id, time.time())
+            ).fetchall()
+            return {row['resource'] for row in rows}
+        finally:
+            conn.close()
+
+    def claim_companies(self, company_names):
+        """
+        为本次运行认领公司
+
+        已持有的公司继续保留（分配保持稳定）；超过公平份额的部分释放给其他节点；
+        不足时从空闲或已过期的租约中补足
+
+        Args:
+            company_names: 全部待监控的公司名（按优先顺序）
+
+        Returns:
+            list: 本节点负责的公司名，保持输入顺序
+        """
+        self.heartbeat()
+        names = list(company_names)
+        fair_share = math.ceil(len(names) / self.live_node_count())
+
+        held = self.owned_resources()
+        owned = [name for name in names if name in held]
+        for name in owned[fair_share:]:
+            self.release(name)
+        claimed = set(owned[:fair_share])
+
+        for name in names:
+            if len(claimed) >= fair_share:
+                break
+            if name not in claimed and self.try_acquire(name):
+                claimed.add(name)
+
+        logger.info(f"节点 {self.node_id} 认领 {len(claimed)}/{len(names)} 个公司 (公平份额 {fair_share})")
+        return [name for name in names if name in claimed]
+
+    def expired_resources(self):
+        """获取已过期（持有节点失联）的租约"""
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT resource FROM leases WHERE expires_at < ?", (time.time(),)
+            ).fetchall()
+            return {row['resource'] for row in rows}
+        finally:
+            conn.close()
+
+    def claim_orphans(self, company_names, exclude=()):
+        """
+        接手失联节点遗留的公司（租约已过期）
+
+        没有租约的公司不接手：其他存活节点可能只是本轮还没有认领自己的份额，
+        接手后心跳会一直续期，快的节点会逐渐占据全部公司
+
+        Args:
+            company_names: 全部待监控的公司名
+            exclude: 本次已经处理过的公司名
+
+        Returns:
+            list: 新接手的公司名
+        """
+        expired = self.expired_resources() - set(exclude)
+        orphans = [name for name in company_names
+                   if name in expired and self.try_acquire(name)]
+        if orphans:
+            logger.info(f"节点 {self.node_id} 接手遗留公司: {', '.join(orphans)}")
+        return orphans
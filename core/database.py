@@ -4,12 +4,36 @@
 
 import sqlite3
 import hashlib
-from datetime import datetime, timedelta
+import json
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from core.models import JobRecord
+from core.dedup import canonicalize_url, from_signed64, job_fingerprint, normalize_title, to_signed64
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 单条 IN (...) 语句最多绑定的参数个数（SQLite 旧版本上限为 999）
+SQL_BATCH_SIZE = 500
+
+
+def _execute_in_batches(cursor, sql, ids, params=()):
+    """
+    分批执行带 IN 列表的语句
+    
+    Args:
+        cursor: 数据库游标
+        sql: SQL语句，IN 列表位置写作 {placeholders}
+        ids: IN 列表中的值
+        params: IN 列表之前的其他参数
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), SQL_BATCH_SIZE):
+        batch = ids[start:start + SQL_BATCH_SIZE]
+        placeholders = ','.join('?' for _ in batch)
+        cursor.execute(sql.format(placeholders=placeholders), list(params) + batch)
+
 
 class JobDatabase:
     """岗位数据库管理类"""
@@ -33,7 +57,7 @@ class JobDatabase:
     
     def get_connection(self):
         """获取数据库连接"""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
         conn.row_factory = sqlite3.Row  # 使结果可以按列名访问
         return conn
     
@@ -63,6 +87,7 @@ class JobDatabase:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_found_time ON jobs(found_time)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_company ON jobs(company)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_status ON jobs(status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_unnotified ON jobs(notified, status, id)')
         
         # 数据库迁移：添加detail列（如果不存在）
         try:
@@ -70,6 +95,12 @@ class JobDatabase:
         except sqlite3.OperationalError:
             pass  # 列已存在
         
+        # 数据库迁移：添加title_simhash列（标题的SimHash指纹，用于近似去重）
+        try:
+            cursor.execute("ALTER TABLE jobs ADD COLUMN title_simhash INTEGER")
+        except sqlite3.OperationalError:
+            pass  # 列已存在
+        
         # 创建检查记录表
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS check_logs (
@@ -79,7 +110,71 @@ class JobDatabase:
                 jobs_found INTEGER DEFAULT 0,
                 new_jobs INTEGER DEFAULT 0,
                 status TEXT DEFAULT 'success',
-                error_message TEXT DEFAULT ''
+                error_message TEXT DEFAULT '',
+                duration REAL DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_check_company_time ON check_logs(company, check_time)')
+        
+        # 数据库迁移：添加duration列（如果不存在）
+        try:
+            cursor.execute("ALTER TABLE check_logs ADD COLUMN duration REAL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass  # 列已存在
+        
+        # 创建通知发件箱表：通知先写入发件箱，由后台线程发送
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel TEXT NOT NULL DEFAULT 'email',
+                recipient TEXT DEFAULT '',
+                subject TEXT NOT NULL,
+                body_html TEXT DEFAULT '',
+                body_text TEXT DEFAULT '',
+                job_ids TEXT DEFAULT '[]',
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at REAL DEFAULT 0,
+                claimed_at REAL DEFAULT 0,
+                last_error TEXT DEFAULT '',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                sent_at TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, next_attempt_at)')
+        
+        # 数据库迁移：添加payload列（结构化渠道使用的岗位数据）
+        try:
+            cursor.execute("ALTER TABLE outbox ADD COLUMN payload TEXT DEFAULT ''")
+        except sqlite3.OperationalError:
+            pass  # 列已存在
+        
+        # 创建通知与岗位的关联表：一个岗位按订阅者、渠道写入多条通知，
+        # 全部通知都送达后岗位才算已通知
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'outbox_jobs'")
+        link_table_exists = cursor.fetchone() is not None
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS outbox_jobs (
+                outbox_id INTEGER NOT NULL,
+                job_id INTEGER NOT NULL,
+                PRIMARY KEY (outbox_id, job_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_outbox_jobs_job ON outbox_jobs(job_id)')
+        if not link_table_exists:
+            # 数据库迁移：按 job_ids 列补全未结束通知的关联
+            cursor.execute("SELECT id, job_ids FROM outbox WHERE status IN ('pending', 'sending', 'failed')")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO outbox_jobs (outbox_id, job_id) VALUES (?, ?)",
+                [(row['id'], job_id) for row in cursor.fetchall() for job_id in json.loads(row['job_ids'] or '[]')]
+            )
+        
+        # 创建运行状态表（调度进度、退避信息等需要跨重启保留的状态）
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS runtime_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
@@ -100,11 +195,25 @@ class JobDatabase:
         Returns:
             str: MD5哈希值
         """
-        # 使用公司名+标题+URL生成唯一标识
+        # 使用公司名+规范化标题+规范化URL生成唯一标识，跟踪参数、空白、届别标注不影响结果
+        combined = f"{company.strip().lower()}|{normalize_title(title)}|{canonicalize_url(url).lower()}"
+        return hashlib.md5(combined.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def get_legacy_job_hash(company, title, url):
+        """旧版岗位标识（原始标题和URL），用于识别升级前保存的岗位"""
         combined = f"{company.strip().lower()}|{title.strip().lower()}|{url.strip().lower()}"
         return hashlib.md5(combined.encode('utf-8')).hexdigest()
     
-    def is_new_job(self, company, title, url):
+    def _candidate_hashes(self, company, title, url, aliases=()):
+        """岗位在当前公司名及曾用名下的全部标识（新旧两种算法）"""
+        hashes = []
+        for name in (company, *aliases):
+            hashes.append(self.get_job_hash(name, title, url))
+            hashes.append(self.get_legacy_job_hash(name, title, url))
+        return hashes
+    
+    def is_new_job(self, company, title, url, aliases=()):
         """
         检查是否为新岗位
         
@@ -112,21 +221,50 @@ class JobDatabase:
             company: 公司名称
             title: 岗位标题
             url: 岗位链接
+            aliases: 公司的曾用名（合并公司条目前的名称），在曾用名下保存过的岗位不算新岗位
         
         Returns:
             tuple: (是否新岗位, 岗位哈希值)
         """
-        job_hash = self.get_job_hash(company, title, url)
+        hashes = self._candidate_hashes(company, title, url, aliases)
         
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT id FROM jobs WHERE job_hash = ?", (job_hash,))
+        cursor.execute(f"SELECT id FROM jobs WHERE job_hash IN ({','.join('?' for _ in hashes)})", hashes)
         result = cursor.fetchone()
         conn.close()
         
-        return result is None, job_hash
+        return result is None, hashes[0]
+    
+    def all_jobs_known(self, company, jobs, aliases=()):
+        """
+        检查一组岗位是否都已保存过（用于分页提前停止）
+        
+        Args:
+            company: 公司名称
+            jobs: 岗位记录列表
+            aliases: 公司的曾用名
+        
+        Returns:
+            bool: 是否全部已保存（jobs 为空时返回 False）
+        """
+        if not jobs:
+            return False
+        candidates = [self._candidate_hashes(company, job.title, job.url, aliases) for job in jobs]
+        all_hashes = list({h for hashes in candidates for h in hashes})
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        known = set()
+        for start in range(0, len(all_hashes), SQL_BATCH_SIZE):
+            batch = all_hashes[start:start + SQL_BATCH_SIZE]
+            cursor.execute(f"SELECT job_hash FROM jobs WHERE job_hash IN ({','.join('?' for _ in batch)})", batch)
+            known.update(row['job_hash'] for row in cursor.fetchall())
+        conn.close()
+        
+        return all(any(h in known for h in hashes) for hashes in candidates)
     
-    def save_new_job(self, company, title, url, job_hash, location="", detail=""):
+    def save_new_job(self, company, title, url, job_hash, location="", detail="", title_simhash=None):
         """
         保存新岗位到数据库
         
@@ -137,24 +275,26 @@ class JobDatabase:
             job_hash: 岗位哈希值
             location: 工作地点
             detail: 详细信息（部门等）
+            title_simhash: 标题的SimHash指纹（无符号64位）
         
         Returns:
-            bool: 是否保存成功
+            int: 新岗位ID，岗位已存在时返回None
         """
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
             cursor.execute('''
-                INSERT INTO jobs (company, job_title, job_url, job_hash, location, detail)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (company, title, url, job_hash, location, detail))
+                INSERT INTO jobs (company, job_title, job_url, job_hash, location, detail, title_simhash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (company, title, url, job_hash, location, detail,
+                  to_signed64(title_simhash) if title_simhash is not None else None))
             conn.commit()
             logger.debug(f"保存新岗位: {company} - {title}")
-            return True
+            return cursor.lastrowid
         except sqlite3.IntegrityError:
             logger.debug(f"岗位已存在: {company} - {title}")
-            return False
+            return None
         finally:
             conn.close()
     
@@ -163,7 +303,7 @@ class JobDatabase:
         获取未通知的新岗位
         
         Returns:
-            list: 未通知的岗位列表
+            list: 未通知的岗位列表（JobRecord）
         """
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -178,18 +318,73 @@ class JobDatabase:
         results = cursor.fetchall()
         conn.close()
         
-        return [
-            {
-                'id': row['id'],
-                'company': row['company'],
-                'title': row['job_title'],
-                'url': row['job_url'],
-                'location': row['location'],
-                'detail': row['detail'],
-                'found_time': row['found_time']
-            }
-            for row in results
-        ]
+        return [JobRecord.from_row(row) for row in results]
+    
+    def get_company_fingerprints(self, company):
+        """
+        获取公司已保存岗位的SimHash指纹，升级前保存的岗位现场计算并回填
+        
+        Args:
+            company: 公司名称
+        
+        Returns:
+            list: (岗位ID, 标题, 地点, 无符号64位指纹) 列表
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, job_title, location, title_simhash FROM jobs WHERE company = ?
+        ''', (company,))
+        rows = cursor.fetchall()
+        
+        fingerprints = []
+        backfill = []
+        for row in rows:
+            if row['title_simhash'] is None:
+                fingerprint = job_fingerprint(row['job_title'])
+                backfill.append((to_signed64(fingerprint), row['id']))
+            else:
+                fingerprint = from_signed64(row['title_simhash'])
+            fingerprints.append((row['id'], row['job_title'], row['location'] or '', fingerprint))
+        
+        if backfill:
+            cursor.executemany("UPDATE jobs SET title_simhash = ? WHERE id = ?", backfill)
+            conn.commit()
+        conn.close()
+        return fingerprints
+    
+    def iter_unnotified_jobs(self, page_size=500):
+        """
+        分页读取未通知的新岗位，避免一次性把全部岗位读入内存
+        
+        按ID顺序分页（keyset分页），读取过程中岗位状态变化不会导致遗漏或重复
+        
+        Args:
+            page_size: 每页读取的岗位数
+        
+        Yields:
+            JobRecord: 岗位记录
+        """
+        last_id = 0
+        while True:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, company, job_title, job_url, location, detail, found_time
+                FROM jobs
+                WHERE notified = 0 AND status = 'new' AND id > ?
+                ORDER BY id
+                LIMIT ?
+            ''', (last_id, page_size))
+            results = cursor.fetchall()
+            conn.close()
+            
+            for row in results:
+                yield JobRecord.from_row(row)
+            
+            if len(results) < page_size:
+                return
+            last_id = results[-1]['id']
     
     def mark_jobs_as_notified(self, job_ids):
         """
@@ -204,8 +399,7 @@ class JobDatabase:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        placeholders = ','.join('?' for _ in job_ids)
-        cursor.execute(f'''
+        _execute_in_batches(cursor, '''
             UPDATE jobs SET notified = 1, status = 'processed'
             WHERE id IN ({placeholders})
         ''', job_ids)
@@ -214,6 +408,207 @@ class JobDatabase:
         conn.close()
         logger.debug(f"标记 {len(job_ids)} 个岗位为已通知")
     
+    def enqueue_notification(self, subject, body_html, job_ids, recipient='', body_text='', channel='email',
+                             payload=None):
+        """
+        把一条通知写入发件箱
+        
+        写入发件箱、记录通知包含的岗位、把岗位标记为已排队在同一个事务中完成，
+        已排队的岗位不会再被 get_unnotified_jobs 读到
+        
+        Args:
+            subject: 标题
+            body_html: HTML正文
+            job_ids: 通知包含的岗位ID列表
+            recipient: 收件人
+            body_text: 纯文本正文
+            channel: 通知渠道名称
+            payload: 结构化渠道使用的岗位数据（可JSON序列化）
+        
+        Returns:
+            int: 发件箱记录ID
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                INSERT INTO outbox (channel, recipient, subject, body_html, body_text, job_ids, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (channel, recipient, subject, body_html, body_text, json.dumps(list(job_ids)),
+                  json.dumps(payload, ensure_ascii=False) if payload is not None else ''))
+            outbox_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT OR IGNORE INTO outbox_jobs (outbox_id, job_id) VALUES (?, ?)",
+                [(outbox_id, job_id) for job_id in job_ids]
+            )
+            
+            _execute_in_batches(cursor, '''
+                UPDATE jobs SET status = 'queued'
+                WHERE id IN ({placeholders}) AND notified = 0
+            ''', job_ids)
+            
+            conn.commit()
+            return outbox_id
+        finally:
+            conn.close()
+    
+    def claim_due_outbox(self, limit=20, stale_seconds=600, channel=None):
+        """
+        领取到期待发送的通知
+        
+        领取后状态改为 sending，其他发送线程（包括其他节点）不会重复领取；
+        领取后超过 stale_seconds 仍未完成的记录视为发送进程已退出，可以重新领取
+        
+        Args:
+            limit: 最多领取的条数
+            stale_seconds: 领取超时时间（秒）
+            channel: 只领取该渠道的通知，为None时领取全部渠道
+        
+        Returns:
+            list: 发件箱记录字典列表
+        """
+        now = time.time()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            channel_filter = 'AND channel = ?' if channel is not None else ''
+            cursor.execute(f'''
+                SELECT * FROM outbox
+                WHERE ((status = 'pending' AND next_attempt_at <= ?)
+                       OR (status = 'sending' AND claimed_at < ?))
+                  {channel_filter}
+                ORDER BY id
+                LIMIT ?
+            ''', [now, now - stale_seconds] + ([channel] if channel is not None else []) + [limit])
+            rows = [dict(row) for row in cursor.fetchall()]
+            
+            _execute_in_batches(cursor, '''
+                UPDATE outbox SET status = 'sending', claimed_at = ?
+                WHERE id IN ({placeholders})
+            ''', [row['id'] for row in rows], (now,))
+            
+            conn.commit()
+        finally:
+            conn.close()
+        
+        for row in rows:
+            row['job_ids'] = json.loads(row['job_ids'] or '[]')
+            row['payload'] = json.loads(row['payload']) if row.get('payload') else None
+        return rows
+    
+    def complete_outbox(self, outbox_id):
+        """
+        标记通知发送成功
+        
+        同一个岗位可能写入了多条通知（多个订阅者、多个渠道），只有其全部通知都发送成功后，
+        才在同一事务中把岗位标记为已通知
+        
+        Args:
+            outbox_id: 发件箱记录ID
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                UPDATE outbox SET status = 'sent', sent_at = CURRENT_TIMESTAMP, last_error = ''
+                WHERE id = ?
+            ''', (outbox_id,))
+            cursor.execute('''
+                UPDATE jobs SET notified = 1, status = 'processed'
+                WHERE id IN (SELECT job_id FROM outbox_jobs WHERE outbox_id = ?)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM outbox_jobs link JOIN outbox ON outbox.id = link.outbox_id
+                      WHERE link.job_id = jobs.id AND outbox.status != 'sent'
+                  )
+            ''', (outbox_id,))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def retry_outbox(self, outbox_id, error, next_attempt_at):
+        """
+        记录一次发送失败，并安排下次重试
+        
+        Args:
+            outbox_id: 发件箱记录ID
+            error: 错误信息
+            next_attempt_at: 下次重试的时间戳
+        """
+        conn = self.get_connection()
+        conn.execute('''
+            UPDATE outbox SET status = 'pending', attempts = attempts + 1,
+                              next_attempt_at = ?, last_error = ?
+            WHERE id = ?
+        ''', (next_attempt_at, error, outbox_id))
+        conn.commit()
+        conn.close()
+    
+    def fail_outbox(self, outbox_id, error):
+        """
+        放弃发送一条通知
+        
+        其中的岗位保持已排队，不恢复为新岗位：恢复后会重新分发给全部订阅者和渠道，
+        已经送达的订阅者、渠道会重复收到。下次检查时只重新发送这一条通知，见 requeue_failed_outbox
+        
+        Args:
+            outbox_id: 发件箱记录ID
+            error: 错误信息
+        """
+        conn = self.get_connection()
+        conn.execute('''
+            UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ?
+            WHERE id = ?
+        ''', (error, outbox_id))
+        conn.commit()
+        conn.close()
+    
+    def requeue_failed_outbox(self):
+        """
+        把已放弃的通知重新放回发件箱（每次检查调用一次），重新计算重试次数
+        
+        Returns:
+            int: 重新排队的通知数量
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = 0
+            WHERE status = 'failed'
+        ''')
+        count = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return count
+    
+    def count_pending_outbox(self, channels=None):
+        """
+        获取待发送（含发送中）的通知数量
+        
+        Args:
+            channels: 只统计这些渠道，为None时统计全部渠道
+        
+        Returns:
+            int: 通知数量
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if channels is None:
+            cursor.execute("SELECT COUNT(*) FROM outbox WHERE status IN ('pending', 'sending')")
+        else:
+            channels = list(channels)
+            placeholders = ','.join('?' for _ in channels) or "''"
+            cursor.execute(f'''
+                SELECT COUNT(*) FROM outbox
+                WHERE status IN ('pending', 'sending') AND channel IN ({placeholders})
+            ''', channels)
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+    
     def get_new_jobs_since(self, hours=24):
         """
         获取指定时间内的新岗位
@@ -222,7 +617,7 @@ class JobDatabase:
             hours: 时间范围（小时）
         
         Returns:
-            list: 岗位列表
+            list: 岗位列表（JobRecord）
         """
         since_time = (datetime.now() - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S')
         
@@ -230,7 +625,7 @@ class JobDatabase:
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT company, job_title, job_url, location, found_time
+            SELECT id, company, job_title, job_url, location, detail, found_time
             FROM jobs
             WHERE found_time > ?
             ORDER BY found_time DESC
@@ -239,18 +634,9 @@ class JobDatabase:
         results = cursor.fetchall()
         conn.close()
         
-        return [
-            {
-                'company': row['company'],
-                'title': row['job_title'],
-                'url': row['job_url'],
-                'location': row['location'],
-                'found_time': row['found_time']
-            }
-            for row in results
-        ]
+        return [JobRecord.from_row(row) for row in results]
     
-    def log_check(self, company, jobs_found, new_jobs, status='success', error_message=''):
+    def log_check(self, company, jobs_found, new_jobs, status='success', error_message='', duration=0):
         """
         记录检查日志
         
@@ -260,14 +646,102 @@ class JobDatabase:
             new_jobs: 新岗位数量
             status: 状态
             error_message: 错误信息
+            duration: 本次检查耗时（秒）
         """
         conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
-            INSERT INTO check_logs (company, jobs_found, new_jobs, status, error_message)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (company, jobs_found, new_jobs, status, error_message))
+            INSERT INTO check_logs (company, jobs_found, new_jobs, status, error_message, duration)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (company, jobs_found, new_jobs, status, error_message, duration))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_company_stats(self, days=14):
+        """
+        按公司汇总最近的检查记录
+        
+        Args:
+            days: 统计的天数范围
+        
+        Returns:
+            dict: 公司名称 -> {checks, successes, new_jobs, avg_duration, last_success}
+                  last_success 为UTC时间字符串，没有成功记录时为None
+        """
+        # check_time 由 CURRENT_TIMESTAMP 写入，是UTC时间
+        since_time = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT company,
+                   COUNT(*) AS checks,
+                   SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) AS successes,
+                   SUM(new_jobs) AS new_jobs,
+                   AVG(CASE WHEN status = 'success' AND duration > 0 THEN duration END) AS avg_duration,
+                   MAX(CASE WHEN status = 'success' THEN check_time END) AS last_success
+            FROM check_logs
+            WHERE check_time > ?
+            GROUP BY company
+        ''', (since_time,))
+        
+        results = cursor.fetchall()
+        conn.close()
+        
+        return {
+            row['company']: {
+                'checks': row['checks'],
+                'successes': row['successes'] or 0,
+                'new_jobs': row['new_jobs'] or 0,
+                'avg_duration': row['avg_duration'],
+                'last_success': row['last_success']
+            }
+            for row in results
+        }
+    
+    def get_state(self, key, default=None):
+        """
+        读取运行状态
+        
+        Args:
+            key: 状态名
+            default: 不存在时的默认值
+        
+        Returns:
+            状态值（JSON反序列化后的对象）
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM runtime_state WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if row is None:
+            return default
+        return json.loads(row['value'])
+    
+    def set_state(self, key, value):
+        """
+        保存运行状态
+        
+        Args:
+            key: 状态名
+            value: 可JSON序列化的状态值，为None时删除该状态
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if value is None:
+            cursor.execute("DELETE FROM runtime_state WHERE key = ?", (key,))
+        else:
+            cursor.execute('''
+                INSERT INTO runtime_state (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            ''', (key, json.dumps(value, ensure_ascii=False)))
         
         conn.commit()
         conn.close()
@@ -328,6 +802,10 @@ class JobDatabase:
         cursor.execute("DELETE FROM check_logs WHERE check_time < ?", (cutoff_time,))
         deleted_logs = cursor.rowcount
         
+        # 删除已结束的过期通知及其岗位关联
+        cursor.execute("DELETE FROM outbox WHERE status IN ('sent', 'failed') AND created_at < ?", (cutoff_time,))
+        cursor.execute("DELETE FROM outbox_jobs WHERE outbox_id NOT IN (SELECT id FROM outbox)")
+        
         conn.commit()
         conn.close()
         
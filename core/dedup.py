@@ -0,0 +1,258 @@
+"""
+去重模块 - URL规范化与近似重复岗位检测
+
+- canonicalize_url: 去掉跟踪参数、无意义的锚点、默认端口，参数排序，
+  同一个岗位的不同分享链接得到相同的URL
+- normalize_title: 去掉空白、括号、"(2025届)" 等届别标注，
+  只有这些差别的标题得到相同的文本
+- SimHash: 标题的64位指纹，按公司建立索引，指纹分为4段，任一段相同才比较
+  完整指纹（阈值不超过3时不会漏判）；汉明距离在阈值内的候选再计算相邻字符集合的
+  Jaccard 相似度，地点相同且相似度达到阈值才视为重复发布（岗位标题较短，只看SimHash容易误判）
+"""
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core.matcher import normalize_text
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 已知的跟踪参数（广告、统计平台专用的参数名）
+# from、source、ref、channel、t 等通用参数名在有的招聘网站上用于区分岗位，不能去掉
+TRACKING_PARAMS = frozenset({
+    'spm', 'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'share_token', 'share_source',
+    '_hsenc', '_hsmi', 'mc_cid', 'mc_eid',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# 届别/年份标注，如 "(2025届)"、"【26届】"、"2025校招"、"2025实习"（只去掉年份，保留"实习"）、"[2025]"
+# 年份后必须有届别、招聘批次或在括号中，"2048游戏研发" 这样的数字不是年份标注
+BATCH_PATTERN = re.compile(
+    r'(?<!\d)(?:20)?\d{2}\s*届'
+    r'|(?<!\d)20\d{2}\s*年?\s*(?:校招|校园招聘|秋招|春招)'
+    r'|(?<!\d)20\d{2}\s*年?(?=\s*实习)'
+    r'|[(\[【（]\s*20\d{2}\s*[)\]】）]'
+)
+# 标点、括号和空白（保留 + 和 #，避免 C++/C# 与 C 混淆）
+PUNCT_PATTERN = re.compile(r'[\s()\[\]{}<>【】「」『』〔〕《》（）,，.。:：;；/\\|\-_—·•*!！?？"\'“”‘’]+')
+
+SIMHASH_BITS = 64
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def _clean_query(query):
+    """去掉跟踪参数，按参数名排序；没有值的参数（?campus、?id=）可能用于区分列表，保留"""
+    params = [
+        (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlencode(sorted(params))
+
+
+def canonicalize_url(url):
+    """
+    规范化URL
+
+    - scheme和域名转为小写，去掉默认端口
+    - 去掉跟踪参数，其余参数（包括没有值的参数）排序
+    - 去掉页内锚点；单页应用的路由（#/...、#!/...）保留，其中的参数同样规范化
+    - 去掉路径末尾的斜杠
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        str: 规范化后的URL
+    """
+    url = (url or '').strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, DEFAULT_PORTS.get(scheme)) else f'{host}:{port}'
+    path = parts.path.rstrip('/') or '/'
+
+    fragment = ''
+    if parts.fragment.startswith(('/', '!/')):
+        route, _, route_query = parts.fragment.partition('?')
+        route_query = _clean_query(route_query)
+        fragment = f'{route}?{route_query}' if route_query else route
+
+    return urlunsplit((scheme, netloc, path, _clean_query(parts.query), fragment))
+
+
+def normalize_title(title):
+    """
+    规范化岗位标题：全角转半角、大小写折叠，去掉届别标注、标点和空白
+
+    Args:
+        title: 原始标题
+
+    Returns:
+        str: 规范化后的标题
+    """
+    text = normalize_text(title)
+    text = BATCH_PATTERN.sub('', text)
+    return PUNCT_PATTERN.sub('', text)
+
+
+def _feature_hash(feature):
+    """特征的64位哈希"""
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def shingles(text):
+    """文本的特征集合：相邻两个字符"""
+    if len(text) < 2:
+        return frozenset([text])
+    return frozenset(text[i:i + 2] for i in range(len(text) - 1))
+
+
+def simhash(features):
+    """
+    计算特征集合的64位SimHash
+
+    Args:
+        features: 特征集合，见 shingles
+
+    Returns:
+        int: 无符号64位指纹
+    """
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        value = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def job_features(title):
+    """
+    岗位标题的特征集合
+
+    Args:
+        title: 岗位标题
+
+    Returns:
+        frozenset: 规范化标题的特征集合
+    """
+    return shingles(normalize_title(title))
+
+
+def job_fingerprint(title):
+    """
+    岗位标题的SimHash指纹
+
+    Args:
+        title: 岗位标题
+
+    Returns:
+        int: 无符号64位指纹
+    """
+    return simhash(job_features(title))
+
+
+def hamming_distance(a, b):
+    """两个指纹的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+def jaccard(a, b):
+    """两个特征集合的Jaccard相似度"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """单个公司的岗位指纹索引"""
+
+    __slots__ = ('max_distance', 'min_similarity', '_bands', 'size')
+
+    def __init__(self, max_distance=3, min_similarity=0.9):
+        """
+        Args:
+            max_distance: SimHash汉明距离阈值，最大为 BANDS - 1
+            min_similarity: 特征集合Jaccard相似度阈值
+        """
+        self.max_distance = min(max_distance, BANDS - 1)
+        self.min_similarity = min_similarity
+        # 每一段: (地点, 段值) -> [(完整指纹, 特征集合, 岗位ID), ...]
+        self._bands = [{} for _ in range(BANDS)]
+        self.size = 0
+
+    def add(self, features, location='', fingerprint=None, job_id=None):
+        """
+        登记岗位
+
+        Args:
+            features: 岗位标题特征集合，见 job_features
+            location: 工作地点
+            fingerprint: SimHash指纹，为None时根据特征计算
+            job_id: 岗位ID
+        """
+        if fingerprint is None:
+            fingerprint = simhash(features)
+        location = normalize_title(location)
+        entry = (fingerprint, features, job_id)
+        for band in range(BANDS):
+            key = (location, fingerprint >> (band * BAND_BITS) & BAND_MASK)
+            self._bands[band].setdefault(key, []).append(entry)
+        self.size += 1
+
+    def find(self, features, location='', fingerprint=None):
+        """
+        查找同一地点与岗位近似的已有岗位
+
+        Args:
+            features: 岗位标题特征集合
+            location: 工作地点
+            fingerprint: SimHash指纹，为None时根据特征计算
+
+        Returns:
+            tuple: (已有岗位ID, 相似度)，没有近似岗位时返回 None
+        """
+        if self.max_distance < 0:
+            return None
+        if fingerprint is None:
+            fingerprint = simhash(features)
+        location = normalize_title(location)
+        for band in range(BANDS):
+            key = (location, fingerprint >> (band * BAND_BITS) & BAND_MASK)
+            for candidate, candidate_features, job_id in self._bands[band].get(key, ()):
+                if hamming_distance(fingerprint, candidate) > self.max_distance:
+                    continue
+                similarity = jaccard(features, candidate_features)
+                if similarity >= self.min_similarity:
+                    return job_id, similarity
+        return None
+
+
+def to_signed64(value):
+    """无符号64位整数转为SQLite可存储的有符号整数"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_signed64(value):
+    """SQLite中的有符号整数还原为无符号64位整数"""
+    return value + (1 << 64) if value < 0 else value
@@ -0,0 +1,170 @@
+"""
+内嵌数据模块 - 从服务端渲染页面内嵌的JSON中提取岗位
+
+很多单页应用在HTML中直接内嵌首屏数据，例如：
+- <script id="__NEXT_DATA__" type="application/json">{...}</script>
+- <script>window.__INITIAL_STATE__ = {...};</script>
+- <script>window.__DATA__ = JSON.parse("...")</script>
+- <script type="application/json">{...}</script>
+
+普通请求拿到页面后解析这些数据即可得到岗位，不需要执行JavaScript。
+公司配置 embedded_state 时优先使用这种方式，找不到数据时回退到 Selenium（或CSS选择器）。
+
+配置示例（companies.yaml）：
+    embedded_state:
+      variable: __INITIAL_STATE__     # 可选，window 变量名或 script 的 id，不填时自动查找
+      selector: "script#app-data"     # 可选，script 元素的CSS选择器
+      items: jobList.list             # 岗位列表的路径，语法见 core.json_mapping
+      fields:
+        title: name
+        url: "/position/{id}"
+"""
+
+import json
+import re
+
+import soupsieve
+
+from config import ConfigError
+from core.json_mapping import FieldMapping
+
+# embedded_state 配置字段: 字段名 -> (允许的类型, 是否必填)
+EMBEDDED_SCHEMA = {
+    'variable': (str, False),
+    'selector': (str, False),
+    'items': (str, True),
+    'fields': (dict, True),
+}
+
+JSON_SCRIPT_TYPES = ('application/json', 'application/ld+json')
+# 变量赋值：window.X = / window["X"] = / var X =
+_ASSIGNMENT = re.compile(
+    r'''(?:window\.|window\[["']|self\.|var\s+|let\s+|const\s+)([A-Za-z_$][\w$]*)["']?\]?\s*=\s*'''
+)
+_JSON_PARSE = re.compile(r'JSON\.parse\(\s*')
+# JavaScript 对象字面量中JSON不支持的 undefined
+_UNDEFINED = re.compile(r'(?<=[:\[,])\s*undefined\s*(?=[,}\]])')
+
+_decoder = json.JSONDecoder()
+
+
+def _decode_value(text, start):
+    """从 text[start:] 解析一个JSON值（对象、数组或 JSON.parse("...")），失败时返回 None"""
+    match = _JSON_PARSE.match(text, start)
+    if match:
+        try:
+            inner, _ = _decoder.raw_decode(text, match.end())
+            return json.loads(inner) if isinstance(inner, str) else None
+        except ValueError:
+            return None
+
+    if start >= len(text) or text[start] not in '{[':
+        return None
+    try:
+        return _decoder.raw_decode(text, start)[0]
+    except ValueError:
+        pass
+    try:
+        return _decoder.raw_decode(_UNDEFINED.sub('null', text[start:]))[0]
+    except ValueError:
+        return None
+
+
+def _script_blobs(script, variable=None):
+    """解析一个 script 元素中的内嵌数据"""
+    text = script.string or script.get_text()
+    if not text or not text.strip():
+        return
+
+    script_type = (script.get('type') or '').lower()
+    if script_type in JSON_SCRIPT_TYPES or (variable and script.get('id') == variable):
+        try:
+            yield json.loads(text)
+        except ValueError:
+            pass
+        return
+
+    for match in _ASSIGNMENT.finditer(text):
+        if variable and match.group(1) != variable:
+            continue
+        value = _decode_value(text, match.end())
+        if isinstance(value, (dict, list)):
+            yield value
+
+
+def find_blobs(soup, variable=None, selector=None):
+    """
+    查找页面中内嵌的JSON数据
+
+    Args:
+        soup: BeautifulSoup 文档
+        variable: 只查找该变量名（或 script id）
+        selector: 编译后的 script 元素选择器
+
+    Returns:
+        generator: 按页面顺序产生解析后的JSON数据；id 为 __NEXT_DATA__ 的 script 最先
+    """
+    if selector is not None:
+        scripts = selector.select(soup)
+    else:
+        scripts = [script for script in soup.find_all('script') if not script.get('src')]
+        scripts.sort(key=lambda script: script.get('id') != '__NEXT_DATA__')
+
+    for script in scripts:
+        yield from _script_blobs(script, variable)
+
+
+class EmbeddedStateSpec:
+    """编译后的内嵌数据配置"""
+
+    __slots__ = ('variable', 'selector', 'mapping')
+
+    def __init__(self, company_name, config):
+        """
+        校验并编译内嵌数据配置
+
+        Args:
+            company_name: 公司名称
+            config: embedded_state 配置字典
+
+        Raises:
+            ConfigError: 配置不合法时抛出
+        """
+        unknown = sorted(set(config) - set(EMBEDDED_SCHEMA))
+        if unknown:
+            raise ConfigError(f"{company_name}: embedded_state 中未知的配置项 {', '.join(unknown)}")
+        for field, (expected_type, required) in EMBEDDED_SCHEMA.items():
+            value = config.get(field)
+            if value is None:
+                if required:
+                    raise ConfigError(f"{company_name}: embedded_state 缺少必填项 {field}")
+            elif not isinstance(value, expected_type):
+                raise ConfigError(f"{company_name}: embedded_state.{field} 类型应为 {expected_type.__name__}")
+
+        self.variable = config.get('variable')
+        self.selector = None
+        if config.get('selector'):
+            try:
+                self.selector = soupsieve.compile(config['selector'])
+            except soupsieve.SelectorSyntaxError as e:
+                raise ConfigError(f"{company_name}: embedded_state.selector 无效 '{config['selector']}': {e}") from None
+        self.mapping = FieldMapping(company_name, config['items'], config['fields'])
+
+    def extract(self, soup, page_url):
+        """
+        从页面的内嵌数据中提取岗位
+
+        依次检查找到的内嵌数据，使用第一份按 items 路径能找到岗位的数据
+
+        Args:
+            soup: BeautifulSoup 文档
+            page_url: 页面URL，用于补全相对链接
+
+        Returns:
+            list: (标题, 链接, 地点, 详情) 元组列表；页面中没有可用的内嵌数据时返回 None
+        """
+        for blob in find_blobs(soup, self.variable, self.selector):
+            items = self.mapping.find_items(blob)
+            if items:
+                return self.mapping.rows(items, page_url)
+        return None
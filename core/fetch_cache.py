@@ -0,0 +1,156 @@
+"""
+抓取缓存模块 - 一次检查内相同的请求只发送一次
+
+多个公司条目可能指向同一个页面（同一招聘页按岗位类别、关键词拆成多个条目），
+或者请求同一个接口。检查开始时创建 FetchCache，检查期间相同的请求只发送一次，
+其余条目复用同一个响应（或渲染结果），再各自用自己的选择器和关键词提取岗位。
+正在进行的请求也会合并：同时请求同一个页面时只有一个真正发出，其余等待其结果。
+
+缓存键：
+- 普通请求：方法 + 规范化URL（不含页内锚点，服务器收不到锚点）+ 查询参数 + 请求体 + 请求头
+- Selenium 渲染：规范化URL（保留锚点，单页应用用锚点区分路由）
+
+失败也会缓存，本次检查内不再重复等待同一个失败的页面；检查结束后缓存丢弃。
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core.dedup import DEFAULT_PORTS
+from core.fetcher import FetchRequest
+
+
+def fetch_url(url, keep_fragment=False):
+    """
+    规范化用于抓取的URL：scheme和域名转为小写，去掉默认端口，查询参数排序
+
+    与 core.dedup.canonicalize_url 不同，不去掉任何参数（列表页的参数可能影响内容）
+
+    Args:
+        url: 原始URL
+        keep_fragment: 是否保留页内锚点（浏览器渲染时锚点可能是单页应用的路由）
+
+    Returns:
+        str: 规范化后的URL
+    """
+    url = (url or '').strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    netloc = host if port in (None, DEFAULT_PORTS.get(scheme)) else f'{host}:{port}'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, parts.fragment if keep_fragment else ''))
+
+
+def _freeze(value):
+    """把参数、请求体转换为稳定的文本"""
+    if not value:
+        return ''
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def request_key(request):
+    """
+    普通请求的缓存键
+
+    Args:
+        request: URL字符串或 FetchRequest
+
+    Returns:
+        tuple: 缓存键
+    """
+    if not isinstance(request, FetchRequest):
+        request = FetchRequest(request)
+    return ('fetch', request.method, fetch_url(request.url), _freeze(request.params),
+            _freeze(request.data), _freeze(request.json), _freeze(request.headers))
+
+
+def render_key(url):
+    """Selenium 渲染结果的缓存键"""
+    return ('render', fetch_url(url, keep_fragment=True))
+
+
+class FetchCache:
+    """一次检查内的抓取缓存（线程安全）"""
+
+    __slots__ = ('_entries', '_lock', 'hits', 'misses')
+
+    def __init__(self):
+        # 缓存键 -> Future，结果为响应（或渲染后的页面源码）或异常
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def claim(self, key):
+        """
+        占用一个缓存键
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            tuple: (Future, 是否由调用者负责获取结果)；为True时调用者需要调用 resolve
+        """
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                self.hits += 1
+                return future, False
+            future = self._entries[key] = Future()
+            self.misses += 1
+            return future, True
+
+    @staticmethod
+    def resolve(future, result):
+        """
+        设置 claim 得到的 Future 的结果
+
+        Args:
+            future: claim 返回的 Future
+            result: 结果，或失败时的异常
+        """
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+    @staticmethod
+    def outcome(future):
+        """等待并返回 Future 的结果，失败时返回异常对象（与 AsyncFetcher.fetch_all 的结果一致）"""
+        return future.exception() or future.result()
+
+    def get(self, key, fetch):
+        """
+        获取缓存的结果，没有时调用 fetch 获取；同一个键同时只有一个调用者执行 fetch
+
+        Args:
+            key: 缓存键
+            fetch: 无参数函数，返回结果或抛出异常
+
+        Returns:
+            object: fetch 的结果
+
+        Raises:
+            Exception: fetch 抛出的异常（缓存的失败同样抛出）
+        """
+        future, owner = self.claim(key)
+        if owner:
+            try:
+                result = fetch()
+            except BaseException as e:
+                result = e
+            self.resolve(future, result)
+        return future.result()
@@ -0,0 +1,312 @@
+"""
+异步抓取模块 - 在一个线程内并发请求多个页面
+
+settings.yaml 中 spider.fetch_engine 设为 async 时启用。静态页面公司的列表页
+（以及分页、接口等页面）在检查开始时成批并发请求，之后再依次解析；
+每个网站的并发连接数有上限，连接在同一批请求之间保持复用（keep-alive）。
+
+请求头轮换、代理池、重试策略、响应大小限制与 requests 方式一致。
+需要安装 aiohttp，未安装时回退到 requests 逐个请求。
+"""
+
+import asyncio
+import json
+import threading
+import time
+import requests
+from core.circuit import RetryPolicy, is_retryable
+from core.response_body import (CHUNK_SIZE, BodyLimits, decode_body, detect_encoding,
+                                normalize_encoding, response_encoding)
+from utils.anti_crawl import get_random_headers
+from utils.proxy_pool import PROXY_BLOCKED_STATUS, get_proxy_pool
+from utils.logger import get_logger
+
+try:
+    import aiohttp
+except ImportError:  # 可选依赖
+    aiohttp = None
+
+logger = get_logger(__name__)
+
+ENGINES = ('requests', 'async')
+
+
+class FetchRequest:
+    """一次抓取请求"""
+
+    __slots__ = ('url', 'method', 'params', 'data', 'json', 'headers')
+
+    def __init__(self, url, method='GET', params=None, data=None, json=None, headers=None):
+        """
+        Args:
+            url: 请求URL
+            method: 请求方法
+            params: 查询参数
+            data: 表单数据
+            json: JSON请求体
+            headers: 额外的请求头，覆盖随机请求头中的同名项
+        """
+        self.url = url
+        self.method = method.upper()
+        self.params = params
+        self.data = data
+        self.json = json
+        self.headers = headers
+
+    def __repr__(self):
+        return f"FetchRequest({self.method} {self.url})"
+
+
+class FetchResult:
+    """
+    抓取结果
+
+    提供与 requests.Response 相同的常用属性（status_code/content/text/encoding/
+    apparent_encoding/raise_for_status），解析代码无需区分两种方式
+    """
+
+    __slots__ = ('url', 'status_code', 'content', 'headers', 'encoding', 'reason')
+
+    def __init__(self, url, status_code, content, headers=None, encoding=None, reason=''):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = encoding
+        self.reason = reason
+
+    @property
+    def apparent_encoding(self):
+        """根据内容推测的编码（只检测页面开头）"""
+        return detect_encoding(self.content)
+
+    @property
+    def text(self):
+        """按 encoding 解码的文本，未知编码时按响应头、meta 标签等确定，见 core.response_body"""
+        return decode_body(self.content, self.encoding or response_encoding(self))
+
+    def json(self):
+        """按JSON解析响应内容（未声明编码时按 UTF-8/16/32 自动识别，都不是时按推测的编码）"""
+        if not self.encoding:
+            try:
+                return json.loads(self.content)
+            except UnicodeDecodeError:
+                pass
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        """状态码为4xx/5xx时抛出 requests.exceptions.HTTPError，与 requests 方式一致"""
+        if 400 <= self.status_code < 600:
+            kind = 'Client' if self.status_code < 500 else 'Server'
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}",
+                response=self
+            )
+
+
+def _is_retryable(error):
+    """判断异步请求的错误是否可以重试"""
+    if isinstance(error, requests.exceptions.RequestException):
+        return is_retryable(error)
+    if isinstance(error, aiohttp.ClientSSLError):
+        return False
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+class AsyncFetcher:
+    """基于 asyncio + aiohttp 的并发抓取器"""
+
+    def __init__(self, concurrency=20, per_host=4, timeout=30, retry_policy=None, use_proxy=False,
+                 body_limits=None):
+        """
+        初始化抓取器
+
+        Args:
+            concurrency: 同时进行的请求总数上限
+            per_host: 同一网站的并发连接数上限
+            timeout: 单次请求的超时时间（秒）
+            retry_policy: 重试策略
+            use_proxy: 是否使用代理池
+            body_limits: 响应大小限制（BodyLimits）
+        """
+        if aiohttp is None:
+            raise ImportError("异步抓取需要安装 aiohttp: pip install aiohttp")
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.use_proxy = use_proxy
+        self.body_limits = body_limits or BodyLimits()
+        self._closed = False
+        # 正在执行的 fetch_all 数量，close() 等待其结束
+        self._running = 0
+        self._idle = threading.Condition()
+
+    @classmethod
+    def from_settings(cls, spider_settings, retry_policy=None):
+        """
+        根据 settings.yaml 的 spider 配置创建抓取器
+
+        Args:
+            spider_settings: spider 配置字典
+            retry_policy: 重试策略
+        """
+        return cls(
+            spider_settings.get('async_concurrency', 20),
+            spider_settings.get('async_per_host', 4),
+            retry_policy=retry_policy,
+            use_proxy=spider_settings.get('use_proxy', False),
+            body_limits=BodyLimits.from_settings(spider_settings),
+        )
+
+    def fetch_all(self, requests_):
+        """
+        并发抓取一组页面（在当前线程中运行事件循环，全部完成后返回）
+
+        Args:
+            requests_: URL字符串或 FetchRequest 的列表
+
+        Returns:
+            list: 与请求顺序一致的结果，成功为 FetchResult，失败为异常对象
+
+        Raises:
+            RuntimeError: 抓取器已关闭
+        """
+        items = [r if isinstance(r, FetchRequest) else FetchRequest(r) for r in requests_]
+        with self._idle:
+            if self._closed:
+                raise RuntimeError("抓取器已关闭")
+            if not items:
+                return []
+            self._running += 1
+        try:
+            return asyncio.run(self._fetch_all(items))
+        finally:
+            with self._idle:
+                self._running -= 1
+                self._idle.notify_all()
+
+    async def _fetch_all(self, items):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ssl=False)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        proxy_pool = get_proxy_pool() if self.use_proxy else None
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            return await asyncio.gather(
+                *(self._fetch(session, item, proxy_pool) for item in items),
+                return_exceptions=True
+            )
+
+    async def _fetch(self, session, request, proxy_pool):
+        """抓取单个页面，按重试策略重试临时错误"""
+        policy = self.retry_policy
+        attempt = 0
+
+        while True:
+            attempt += 1
+            proxy = proxy_pool.acquire(request.url) if proxy_pool is not None else None
+            headers = get_random_headers()
+            if request.headers:
+                headers.update(request.headers)
+
+            started = time.monotonic()
+            try:
+                try:
+                    async with session.request(
+                        request.method,
+                        request.url,
+                        params=request.params,
+                        data=request.data,
+                        json=request.json,
+                        headers=headers,
+                        proxy=f'http://{proxy}' if proxy else None,
+                    ) as response:
+                        content = await self._read(response)
+                        result = FetchResult(str(response.url), response.status, content,
+                                             response.headers.copy(), normalize_encoding(response.charset),
+                                             response.reason or '')
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if proxy:
+                        proxy_pool.report(proxy, False, url=request.url)
+                    raise
+                if proxy:
+                    # 被目标网站拒绝（403/429）也算作代理不可用
+                    proxy_pool.report(proxy, result.status_code not in PROXY_BLOCKED_STATUS,
+                                      time.monotonic() - started, request.url)
+                result.raise_for_status()
+                return result
+
+            except (aiohttp.ClientError, asyncio.TimeoutError, requests.exceptions.HTTPError) as e:
+                retryable = _is_retryable(e)
+                if proxy and getattr(e, 'response', None) is not None and \
+                        e.response.status_code in PROXY_BLOCKED_STATUS:
+                    retryable = True
+                if not policy.should_retry(e, attempt, retryable):
+                    raise
+                delay = policy.delay(attempt, e)
+                logger.warning(f"请求失败 (尝试 {attempt}/{policy.max_attempts}): {request.url} "
+                               f"{e!r}，{delay:.1f} 秒后重试")
+                await asyncio.sleep(delay)
+
+    async def _read(self, response):
+        """按大小限制分块读取响应体，超过上限时抛出 ResponseTooLarge"""
+        url = str(response.url)
+        limits = self.body_limits
+        limits.check_declared(response.headers, url)
+        # 未压缩时读取的字节数就是传输大小
+        compressed = 'Content-Encoding' in response.headers
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            limits.check(size, None if compressed else size, url)
+        return b''.join(chunks)
+
+    def close(self, timeout=60):
+        """
+        关闭抓取器：之后不能再发起请求，并等待其他线程中正在执行的 fetch_all 结束
+
+        会话和连接池只在 fetch_all 执行期间存在，一批请求结束时随事件循环一起关闭，
+        close() 返回True时全部连接都已释放
+
+        Args:
+            timeout: 等待正在执行的请求的最长时间（秒）
+
+        Returns:
+            bool: 是否已没有正在执行的请求
+        """
+        with self._idle:
+            self._closed = True
+            idle = self._idle.wait_for(lambda: self._running == 0, timeout)
+        if not idle:
+            logger.warning(f"抓取器关闭时仍有 {self._running} 批请求在执行，连接将在这些请求结束后释放")
+        return idle
+
+
+# 创建抓取器使用的 spider 配置项，这些配置变化时才需要重新创建
+FETCHER_SETTINGS = ('fetch_engine', 'async_concurrency', 'async_per_host', 'use_proxy',
+                    'max_retries', 'retry_backoff_seconds', 'retry_backoff_max_seconds',
+                    'max_response_mb', 'max_decompressed_mb')
+
+
+def build_fetcher(spider_settings, retry_policy=None):
+    """
+    按 spider.fetch_engine 创建抓取器
+
+    Args:
+        spider_settings: spider 配置字典
+        retry_policy: 重试策略
+
+    Returns:
+        AsyncFetcher: fetch_engine 为 async 且已安装 aiohttp 时返回抓取器，否则返回 None（使用 requests）
+    """
+    engine = spider_settings.get('fetch_engine', 'requests')
+    if engine not in ENGINES:
+        logger.warning(f"未知的 fetch_engine: {engine}，使用 requests")
+        return None
+    if engine == 'requests':
+        return None
+    if aiohttp is None:
+        logger.warning("fetch_engine 为 async 但未安装 aiohttp，使用 requests 逐个请求")
+        return None
+    return AsyncFetcher.from_settings(spider_settings, retry_policy)
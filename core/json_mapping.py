@@ -0,0 +1,239 @@
+"""
+JSON字段映射模块 - 用类似 JSONPath 的路径从JSON数据中提取岗位
+
+路径语法（开头的 "$." 可省略）：
+- data.list          对象的键，逐级访问
+- list[0]            数组下标
+- cities[*].name     数组的全部元素，结果为多个值
+- ['job.name']       键中包含 "." 等特殊字符时用引号括起来
+
+字段映射示例：
+    items: data.list                 # 岗位列表所在的路径
+    fields:
+      title: name                    # 相对于每个岗位的路径
+      location: cities[*].name       # 多个值用 "、" 连接
+      url: "https://example.com/job/{id}"   # 包含 {路径} 时作为模板
+
+路径在加载配置时编译，语法错误作为 ConfigError 暴露。
+"""
+
+import re
+from urllib.parse import urljoin
+
+from config import ConfigError
+
+# 一段路径：.key、[数字]、[*]、['key'] 或 ["key"]
+_STEP_PATTERN = re.compile(r"""\.?([^.\[\]]+)|\[(\d+|\*)\]|\[(['"])(.*?)\3\]""")
+_TEMPLATE_PATTERN = re.compile(r'\{([^{}]+)\}')
+
+# 岗位字段：字段名 -> 是否必填
+JOB_FIELDS = {'title': True, 'url': False, 'location': False, 'detail': False}
+# 多个值之间的分隔符
+JOIN_SEPARATOR = '、'
+
+_WILDCARD = object()
+
+
+class JsonPath:
+    """编译后的JSON路径"""
+
+    __slots__ = ('expr', '_steps')
+
+    def __init__(self, expr):
+        """
+        编译路径
+
+        Args:
+            expr: 路径表达式
+
+        Raises:
+            ConfigError: 路径语法错误时抛出
+        """
+        self.expr = expr
+        text = expr.strip()
+        if text == '$':
+            text = ''
+        elif text.startswith('$.') or text.startswith('$['):
+            text = text[1:]
+
+        steps = []
+        position = 0
+        while position < len(text):
+            match = _STEP_PATTERN.match(text, position)
+            if match is None or match.end() == position:
+                raise ConfigError(f"JSON路径语法错误: '{expr}'（位置 {position}）")
+            key, index, _, quoted = match.groups()
+            if key is not None:
+                steps.append(key.strip())
+            elif index == '*':
+                steps.append(_WILDCARD)
+            elif index is not None:
+                steps.append(int(index))
+            else:
+                steps.append(quoted)
+            position = match.end()
+        self._steps = tuple(steps)
+
+    def __repr__(self):
+        return f"JsonPath({self.expr!r})"
+
+    def find(self, data):
+        """
+        查找路径对应的全部值
+
+        Args:
+            data: JSON数据
+
+        Returns:
+            list: 匹配的值（路径不存在时为空列表）
+        """
+        current = [data]
+        for step in self._steps:
+            found = []
+            for value in current:
+                if step is _WILDCARD:
+                    if isinstance(value, list):
+                        found.extend(value)
+                    elif isinstance(value, dict):
+                        found.extend(value.values())
+                elif isinstance(step, int):
+                    if isinstance(value, list) and -len(value) <= step < len(value):
+                        found.append(value[step])
+                elif isinstance(value, dict) and step in value:
+                    found.append(value[step])
+            current = found
+            if not current:
+                break
+        return [value for value in current if value is not None]
+
+    def first(self, data, default=None):
+        """查找路径对应的第一个值"""
+        values = self.find(data)
+        return values[0] if values else default
+
+
+def _to_text(values):
+    """把路径的查找结果转换为文本"""
+    parts = []
+    for value in values:
+        if isinstance(value, (dict, list)):
+            continue
+        text = str(value).strip()
+        if text and text not in parts:
+            parts.append(text)
+    return JOIN_SEPARATOR.join(parts)
+
+
+class FieldTemplate:
+    """字段取值：路径，或包含 {路径} 占位符的模板"""
+
+    __slots__ = ('expr', '_path', '_parts')
+
+    def __init__(self, expr):
+        self.expr = expr
+        self._path = None
+        self._parts = None
+        if _TEMPLATE_PATTERN.search(expr):
+            # 拆分为 [文本, 路径, 文本, 路径, ..., 文本]
+            pieces = _TEMPLATE_PATTERN.split(expr)
+            self._parts = [JsonPath(piece) if i % 2 else piece for i, piece in enumerate(pieces)]
+        else:
+            self._path = JsonPath(expr)
+
+    def render(self, item):
+        """
+        计算字段值
+
+        Args:
+            item: 单个岗位的JSON数据
+
+        Returns:
+            str: 字段文本，模板中任一路径不存在时返回空字符串
+        """
+        if self._path is not None:
+            return _to_text(self._path.find(item))
+        rendered = []
+        for i, part in enumerate(self._parts):
+            if i % 2 == 0:
+                rendered.append(part)
+                continue
+            text = _to_text(part.find(item))
+            if not text:
+                return ''
+            rendered.append(text)
+        return ''.join(rendered)
+
+
+class FieldMapping:
+    """岗位字段映射：岗位列表路径 + 各字段的取值方式"""
+
+    __slots__ = ('items', 'fields')
+
+    def __init__(self, company_name, items, fields):
+        """
+        编译字段映射
+
+        Args:
+            company_name: 公司名称，用于错误信息
+            items: 岗位列表的路径
+            fields: 字段名 -> 路径或模板
+
+        Raises:
+            ConfigError: 配置不合法时抛出
+        """
+        if not isinstance(fields, dict):
+            raise ConfigError(f"{company_name}: fields 应为字典")
+        unknown = sorted(set(fields) - set(JOB_FIELDS))
+        if unknown:
+            raise ConfigError(f"{company_name}: fields 中未知的字段 {', '.join(unknown)}")
+        for field, required in JOB_FIELDS.items():
+            if required and not fields.get(field):
+                raise ConfigError(f"{company_name}: fields 缺少 {field}")
+            if field in fields and not isinstance(fields[field], str):
+                raise ConfigError(f"{company_name}: fields.{field} 应为字符串")
+
+        try:
+            self.items = JsonPath(items)
+            self.fields = {field: FieldTemplate(expr) for field, expr in fields.items() if expr}
+        except ConfigError as e:
+            raise ConfigError(f"{company_name}: {e}") from None
+
+    def find_items(self, data):
+        """
+        查找岗位列表
+
+        Args:
+            data: JSON数据
+
+        Returns:
+            list: 岗位的JSON数据列表
+        """
+        items = []
+        for value in self.items.find(data):
+            if isinstance(value, list):
+                items.extend(value)
+            else:
+                items.append(value)
+        return [item for item in items if isinstance(item, dict)]
+
+    def rows(self, items, page_url):
+        """
+        把岗位JSON数据转换为 (标题, 链接, 地点, 详情) 元组
+
+        Args:
+            items: find_items 的结果
+            page_url: 页面URL，用于补全相对链接；岗位没有链接时使用该URL
+
+        Returns:
+            list: (标题, 链接, 地点, 详情) 元组列表
+        """
+        rows = []
+        for item in items:
+            values = {field: template.render(item) for field, template in self.fields.items()}
+            title = values.get('title', '')
+            if not title:
+                continue
+            url = values.get('url', '')
+            url = urljoin(page_url, url) if url else page_url
+            rows.append((title, url, values.get('location', ''), values.get('detail', '')))
+        return rows
@@ -0,0 +1,223 @@
+"""
+关键词匹配模块 - 岗位标题关键词过滤
+
+关键词列表在加载配置时编译为 Aho-Corasick 自动机，匹配一个标题只需扫描一遍，
+耗时与标题长度相关，与关键词数量无关。
+
+标题和关键词统一做 NFKC 规范化并 casefold：全角字母数字、全角括号等与半角等价，
+大小写不敏感（如 "ＪＡＶＡ（实习）" 与 "java(实习)" 等价）。
+
+安装了 pyahocorasick 时使用其C实现，否则使用纯Python实现，两者结果一致。
+"""
+
+import unicodedata
+
+try:
+    import ahocorasick
+except ImportError:  # 可选依赖
+    ahocorasick = None
+
+
+def normalize_text(text):
+    """
+    规范化文本：NFKC（全角转半角等）+ casefold（大小写折叠）
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        str: 规范化后的文本
+    """
+    return unicodedata.normalize('NFKC', text or '').casefold()
+
+
+def normalize_terms(terms):
+    """规范化关键词列表，去掉空白项和重复项，保持原顺序"""
+    normalized = (normalize_text(term).strip() for term in (terms or []) if term)
+    return tuple(dict.fromkeys(term for term in normalized if term))
+
+
+class KeywordAutomaton:
+    """
+    多模式匹配自动机（Aho-Corasick）
+
+    terms 的下标即为匹配结果中的编号；文本需要先经过 normalize_text
+    """
+
+    __slots__ = ('terms', '_goto', '_fail', '_output', '_native')
+
+    def __init__(self, terms, native=None):
+        """
+        编译自动机
+
+        Args:
+            terms: 已规范化的关键词序列
+            native: 是否使用 pyahocorasick，None 表示已安装时使用
+        """
+        self.terms = tuple(terms)
+        self._goto = self._fail = self._output = self._native = None
+        if native is None:
+            native = ahocorasick is not None
+        if not self.terms:
+            return
+
+        if native:
+            automaton = ahocorasick.Automaton()
+            for index, term in enumerate(self.terms):
+                # 相同关键词只保留一个编号
+                if term not in automaton:
+                    automaton.add_word(term, index)
+            automaton.make_automaton()
+            self._native = automaton
+        else:
+            self._build()
+
+    def _build(self):
+        """构建纯Python的转移表、失败指针和输出集合"""
+        goto = [{}]
+        output = [()]
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    output.append(())
+                state = next_state
+            if not output[state]:
+                output[state] = (index,)
+
+        # 按层次遍历计算失败指针，并把失败链上的输出合并到当前状态
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                if output[fail[next_state]]:
+                    output[next_state] = output[next_state] + output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def __bool__(self):
+        return bool(self.terms)
+
+    def iter_matches(self, text):
+        """
+        依次产生文本中出现的关键词编号（可能重复）
+
+        Args:
+            text: 已规范化的文本
+        """
+        if not self.terms:
+            return
+        if self._native is not None:
+            for _, index in self._native.iter(text):
+                yield index
+            return
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield from output[state]
+
+    def search(self, text):
+        """
+        检查文本是否包含任一关键词
+
+        Args:
+            text: 已规范化的文本
+
+        Returns:
+            bool: 是否包含
+        """
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+    def find_all(self, text):
+        """
+        查找文本中出现的全部关键词
+
+        Args:
+            text: 已规范化的文本
+
+        Returns:
+            set: 关键词编号集合
+        """
+        return set(self.iter_matches(text))
+
+
+class KeywordMatcher:
+    """
+    关键词匹配器
+
+    标题包含任一关键词且不包含任一排除词时匹配；关键词在创建时编译，
+    匹配时不再重复处理关键词列表
+    """
+
+    __slots__ = ('keywords', 'exclude', '_include', '_exclude')
+
+    def __init__(self, keywords=None, exclude=None):
+        """
+        初始化匹配器
+
+        Args:
+            keywords: 关键词列表，为空表示不过滤
+            exclude: 排除词列表，标题包含任一排除词时不匹配
+        """
+        self.keywords = normalize_terms(keywords)
+        self.exclude = normalize_terms(exclude)
+        self._include = KeywordAutomaton(self.keywords)
+        self._exclude = KeywordAutomaton(self.exclude)
+
+    def __bool__(self):
+        return bool(self.keywords or self.exclude)
+
+    def match(self, title):
+        """
+        检查标题是否匹配
+
+        Args:
+            title: 岗位标题
+
+        Returns:
+            bool: 是否匹配（没有关键词时只检查排除词）
+        """
+        if not self:
+            return True
+
+        text = normalize_text(title)
+        if self._exclude.search(text):
+            return False
+        return not self.keywords or self._include.search(text)
+
+
+def naive_match(title, keywords=None, exclude=None):
+    """
+    逐个关键词检查的参考实现，用于校验 KeywordMatcher 的结果
+
+    Args:
+        title: 岗位标题
+        keywords: 关键词列表
+        exclude: 排除词列表
+
+    Returns:
+        bool: 是否匹配
+    """
+    text = normalize_text(title)
+    if any(term in text for term in normalize_terms(exclude)):
+        return False
+    keywords = normalize_terms(keywords)
+    return not keywords or any(term in text for term in keywords)
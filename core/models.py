@@ -0,0 +1,115 @@
+"""
+数据模型模块 - 岗位记录
+
+岗位从解析页面到写入数据库、生成通知始终是同一个 JobRecord 对象，
+各环节不再各自复制一份字典。JobRecord 使用 __slots__，发现时间只保存时间戳，
+需要显示时才格式化。
+
+为兼容按字典读取岗位的代码（模板渲染、通知渠道等），JobRecord 支持
+job['title'] 和 job.get('location') 两种读取方式。
+"""
+
+import time
+from datetime import datetime
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class JobRecord:
+    """岗位记录"""
+
+    __slots__ = ('company', 'title', 'url', 'location', 'detail', 'id', 'company_url',
+                 '_found_at', '_found_time')
+
+    # 支持按字典方式读取的字段
+    FIELDS = ('id', 'company', 'company_url', 'title', 'url', 'location', 'detail', 'found_time')
+
+    def __init__(self, company, title, url, location='', detail='', id=None, company_url='',
+                 found_at=None, found_time=None):
+        """
+        初始化岗位记录
+
+        Args:
+            company: 公司名称
+            title: 岗位标题
+            url: 岗位链接
+            location: 工作地点
+            detail: 详细信息（部门等）
+            id: 数据库中的岗位ID，未保存时为None
+            company_url: 公司招聘页面URL
+            found_at: 发现时间戳，默认为当前时间
+            found_time: 已格式化的发现时间（从数据库读取时使用）
+        """
+        self.company = company
+        self.title = title
+        self.url = url
+        self.location = location or ''
+        self.detail = detail or ''
+        self.id = id
+        self.company_url = company_url
+        self._found_time = found_time
+        self._found_at = found_at if found_at is not None or found_time is not None else time.time()
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        从数据库记录创建岗位
+
+        Args:
+            row: sqlite3.Row，包含 id/company/job_title/job_url/location/detail/found_time
+
+        Returns:
+            JobRecord: 岗位记录
+        """
+        keys = row.keys()
+        return cls(
+            row['company'],
+            row['job_title'],
+            row['job_url'],
+            row['location'],
+            row['detail'] if 'detail' in keys else '',
+            id=row['id'] if 'id' in keys else None,
+            found_time=row['found_time'],
+        )
+
+    @property
+    def found_time(self):
+        """发现时间，格式为 YYYY-MM-DD HH:MM:SS，首次读取时才格式化"""
+        if self._found_time is None and self._found_at is not None:
+            self._found_time = datetime.fromtimestamp(self._found_at).strftime(TIME_FORMAT)
+        return self._found_time
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def get(self, key, default=None):
+        """按字典方式读取字段"""
+        if key not in self.FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def to_dict(self):
+        """
+        转换为字典
+
+        Returns:
+            dict: 岗位信息
+        """
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, JobRecord):
+            return NotImplemented
+        return (self.company, self.title, self.url, self.location, self.detail, self.id) == \
+            (other.company, other.title, other.url, other.location, other.detail, other.id)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"JobRecord({self.company!r}, {self.title!r}, {self.url!r})"
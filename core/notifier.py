@@ -3,14 +3,20 @@
 """
 
 import smtplib
+import time
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from pathlib import Path
+from core.template import EmailTemplate, render_job_sections, render_text
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 每个岗位在HTML和纯文本正文中除字段内容外的固定开销（标签、缩进等）估算值，单位字节
+JOB_MARKUP_BYTES = 400
+
 
 class EmailNotifier:
     """邮件通知类"""
@@ -31,9 +37,12 @@ class EmailNotifier:
         self.subject_prefix = email_config.get('subject_prefix', '【新岗位提醒】')
         self.max_retry = email_config.get('max_retry', 3)
         self.retry_delay = email_config.get('retry_delay', 5)
+        # 单封邮件最多包含的岗位数和估算大小，超过时拆分为多封
+        self.digest_max_jobs = email_config.get('digest_max_jobs', 200)
+        self.digest_max_kb = email_config.get('digest_max_kb', 512)
         
-        # 加载邮件模板
-        self.template = self._load_template()
+        # 加载并预编译邮件模板
+        self.template = EmailTemplate(self._load_template())
     
     def _load_template(self):
         """加载邮件HTML模板"""
@@ -86,124 +95,183 @@ class EmailNotifier:
 </html>
 '''
     
-    def _render_email(self, jobs):
+    def _render_email(self, jobs, timestamp=None):
         """
         渲染邮件内容
         
         Args:
             jobs: 岗位列表
+            timestamp: 生成时间，默认为当前时间
         
         Returns:
             str: HTML内容
         """
-        # 按公司分组
-        jobs_by_company = {}
-        for job in jobs:
-            company = job['company']
-            if company not in jobs_by_company:
-                jobs_by_company[company] = []
-            jobs_by_company[company].append(job)
-        
-        # 生成公司分区HTML
-        sections_html = ""
-        for company, company_jobs in jobs_by_company.items():
-            # 获取公司URL（从第一个job里取）
-            company_url = company_jobs[0].get('company_url', '') if company_jobs else ''
-            
-            jobs_html = ""
-            for job in company_jobs:
-                meta_parts = []
-                if job.get('location'):
-                    meta_parts.append(f"{job['location']}")
-                if job.get('detail'):
-                    meta_parts.append(job['detail'])
-                if job.get('found_time'):
-                    meta_parts.append(f"{job['found_time']}")
-                meta_str = " | ".join(meta_parts) if meta_parts else ""
-                
-                jobs_html += f'''
-                <div class="job-item">
-                    <div class="job-title">{job['title']}</div>
-                    <div class="job-meta">{meta_str}</div>
-                </div>
-                '''
-            
-            # 公司名称做成可点击链接
-            if company_url:
-                company_link = f'<a href="{company_url}" target="_blank" style="color: #1a73e8; text-decoration: none;">🏢 {company}</a>'
-            else:
-                company_link = f'🏢 {company}'
-            
-            sections_html += f'''
-            <div class="company-section">
-                <div class="company-header">{company_link} ({len(company_jobs)} 个新岗位)</div>
-                <div class="job-list">
-                    {jobs_html}
-                </div>
-            </div>
-            '''
+        timestamp = timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return self.template.render({
+            'total_count': str(len(jobs)),
+            'job_sections': render_job_sections(jobs),
+            'timestamp': timestamp,
+        })
+    
+    def retry_backoff(self, attempt):
+        """
+        计算第 attempt 次失败后的重试等待时间（指数退避）
         
-        # 替换模板变量
-        html = self.template.replace('{total_count}', str(len(jobs)))
-        html = html.replace('{job_sections}', sections_html)
-        html = html.replace('{timestamp}', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        Args:
+            attempt: 已失败的次数（从1开始）
         
-        return html
+        Returns:
+            float: 等待秒数
+        """
+        return self.retry_delay * (2 ** (attempt - 1))
     
-    def send_notification(self, jobs):
+    @staticmethod
+    def estimate_job_bytes(job):
         """
-        发送岗位通知邮件
+        估算一个岗位在邮件中占用的字节数
+        
+        岗位字段同时出现在HTML和纯文本正文中，再加上固定的标签开销
         
         Args:
-            jobs: 岗位列表
+            job: 岗位信息
         
         Returns:
-            bool: 是否发送成功
+            int: 估算字节数
         """
-        if not jobs:
-            logger.info("没有新岗位，不发送邮件")
-            return True
+        content = sum(
+            len(str(job.get(field) or '').encode('utf-8'))
+            for field in ('company', 'title', 'url', 'location', 'detail', 'found_time')
+        )
+        return content * 2 + JOB_MARKUP_BYTES
+    
+    def digest_full(self, count, size, job_bytes):
+        """
+        判断一封邮件加入下一个岗位后是否会超过数量或大小上限
         
-        if not self.sender_email or not self.sender_password:
-            logger.error("邮件配置不完整，无法发送")
+        Args:
+            count: 当前邮件中的岗位数
+            size: 当前邮件的估算字节数
+            job_bytes: 下一个岗位的估算字节数
+        
+        Returns:
+            bool: 是否应该先发出当前邮件（空邮件总是可以加入）
+        """
+        if count == 0:
             return False
+        return count >= self.digest_max_jobs or size + job_bytes > self.digest_max_kb * 1024
+    
+    def build_notification(self, jobs, part=None):
+        """
+        生成岗位通知的标题和正文
         
-        # 创建邮件
+        Args:
+            jobs: 岗位列表
+            part: 拆分为多封邮件时的序号（从1开始），不拆分时为None
+        
+        Returns:
+            tuple: (标题, HTML正文, 纯文本正文)
+        """
+        subject = f'{self.subject_prefix}发现 {len(jobs)} 个新职位'
+        if part is not None:
+            subject += f'（第{part}封）'
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return subject, self._render_email(jobs, timestamp), render_text(jobs, timestamp)
+    
+    def _build_message(self, subject, html, recipient, text=''):
+        """构建MIME邮件"""
         msg = MIMEMultipart('alternative')
-        msg['Subject'] = f'{self.subject_prefix}发现 {len(jobs)} 个新职位'
+        msg['Subject'] = subject
         msg['From'] = self.sender_email
-        msg['To'] = self.receiver_email
+        msg['To'] = recipient
+        # 纯文本在前，支持HTML的客户端会优先显示最后一个部分
+        if text:
+            msg.attach(MIMEText(text, 'plain', 'utf-8'))
+        msg.attach(MIMEText(html, 'html', 'utf-8'))
+        return msg
+    
+    def connect(self, timeout=30):
+        """
+        建立已登录的SMTP连接
         
-        # 渲染HTML内容
-        html_content = self._render_email(jobs)
-        html_part = MIMEText(html_content, 'html', 'utf-8')
-        msg.attach(html_part)
+        Args:
+            timeout: 连接和收发超时时间（秒）
         
-        # 发送邮件
+        Returns:
+            smtplib.SMTP: SMTP连接
+        """
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=timeout)
+        else:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=timeout)
+            server.starttls()
+        
+        server.login(self.sender_email, self.sender_password)
+        return server
+    
+    @contextmanager
+    def smtp_session(self, timeout=30):
+        """
+        打开一个SMTP会话，会话内的多封邮件复用同一个已登录的连接
+        
+        Args:
+            timeout: 连接和收发超时时间（秒）
+        
+        Yields:
+            SMTPSession: SMTP会话
+        """
+        session = SMTPSession(self, timeout)
         try:
-            if self.use_ssl:
-                server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=30)
-            else:
-                server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30)
-                server.starttls()
-            
-            server.login(self.sender_email, self.sender_password)
-            server.sendmail(self.sender_email, self.receiver_email, msg.as_string())
-            
+            yield session
+        finally:
+            session.close()
+    
+    def _send_with_retry(self, subject, html, text=''):
+        """
+        同步发送一封邮件，失败时按 max_retry/retry_delay 重试
+        
+        Returns:
+            bool: 是否发送成功
+        """
+        if not self.sender_email or not self.sender_password:
+            logger.error("邮件配置不完整，无法发送")
+            return False
+        
+        for attempt in range(1, self.max_retry + 1):
             try:
-                server.quit()
-            except:
-                pass  # 忽略关闭连接时的错误
-            
+                with self.smtp_session() as session:
+                    session.send(subject, html, self.receiver_email, text)
+                return True
+            except smtplib.SMTPAuthenticationError as e:
+                # 认证失败重试也不会成功
+                logger.error(f"邮箱认证失败，请检查邮箱和授权码是否正确: {e}")
+                return False
+            except Exception as e:
+                logger.warning(f"邮件发送失败 (尝试 {attempt}/{self.max_retry}): {e}")
+                if attempt < self.max_retry:
+                    time.sleep(self.retry_backoff(attempt))
+        
+        logger.error(f"邮件发送失败，已重试 {self.max_retry} 次")
+        return False
+    
+    def send_notification(self, jobs):
+        """
+        发送岗位通知邮件（同步发送，定时检查通过发件箱异步发送）
+        
+        Args:
+            jobs: 岗位列表
+        
+        Returns:
+            bool: 是否发送成功
+        """
+        if not jobs:
+            logger.info("没有新岗位，不发送邮件")
+            return True
+        
+        subject, html_content, text_content = self.build_notification(jobs)
+        if self._send_with_retry(subject, html_content, text_content):
             logger.info(f"邮件发送成功！通知了 {len(jobs)} 个新岗位")
             return True
-            
-        except smtplib.SMTPAuthenticationError as e:
-            logger.error(f"邮箱认证失败，请检查邮箱和授权码是否正确: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"邮件发送失败: {e}")
-            return False
+        return False
     
     def send_test_email(self):
         """发送测试邮件"""
@@ -265,22 +333,57 @@ class EmailNotifier:
 </html>
 '''
         
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = f'{self.subject_prefix}每日监控摘要'
-        msg['From'] = self.sender_email
-        msg['To'] = self.receiver_email
-        msg.attach(MIMEText(html, 'html', 'utf-8'))
+        if self._send_with_retry(f'{self.subject_prefix}每日监控摘要', html):
+            logger.info("每日摘要邮件发送成功")
+            return True
+        logger.error("每日摘要邮件发送失败")
+        return False
+
+
+class SMTPSession:
+    """
+    SMTP会话 - 在多封邮件之间复用一个已登录的连接
+    
+    第一次发送时才建立连接；连接被服务器断开时自动重连一次
+    """
+    
+    def __init__(self, notifier, timeout=30):
+        """
+        Args:
+            notifier: EmailNotifier 实例
+            timeout: 连接和收发超时时间（秒）
+        """
+        self.notifier = notifier
+        self.timeout = timeout
+        self.server = None
+    
+    def send(self, subject, html, recipient, text=''):
+        """
+        发送一封邮件
+        
+        Args:
+            subject: 标题
+            html: HTML正文
+            recipient: 收件人
+            text: 纯文本正文
+        """
+        msg = self.notifier._build_message(subject, html, recipient, text)
+        payload = msg.as_string()
         
+        if self.server is None:
+            self.server = self.notifier.connect(self.timeout)
         try:
-            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=30)
-            server.login(self.sender_email, self.sender_password)
-            server.sendmail(self.sender_email, self.receiver_email, msg.as_string())
+            self.server.sendmail(self.notifier.sender_email, recipient, payload)
+        except smtplib.SMTPServerDisconnected:
+            # 复用的连接可能已被服务器关闭，重新连接后再试一次
+            self.server = self.notifier.connect(self.timeout)
+            self.server.sendmail(self.notifier.sender_email, recipient, payload)
+    
+    def close(self):
+        """关闭连接"""
+        if self.server is not None:
             try:
-                server.quit()
-            except:
-                pass
-            logger.info("每日摘要邮件发送成功")
-            return True
-        except Exception as e:
-            logger.error(f"每日摘要邮件发送失败: {e}")
-            return False
+                self.server.quit()
+            except Exception:
+                pass  # 忽略关闭连接时的错误
+            self.server = None
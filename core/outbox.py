@@ -0,0 +1,268 @@
+"""
+发件箱模块 - 后台异步发送通知
+
+检查流程只负责把通知写入数据库中的发件箱，立即返回继续爬取。
+每个通知渠道有独立的后台线程，批量领取本渠道待发送的通知，
+同一批通知复用一个会话（如已登录的SMTP连接）；
+失败的通知按渠道的 max_retry/retry_delay 指数退避重试，
+一个渠道变慢或不可用不会阻塞其他渠道。
+
+通知按（订阅者, 渠道）分别记录送达情况：超过重试次数的通知在下次检查时单独重新排队，
+不会把岗位重新分发给已经送达的订阅者和渠道；岗位的全部通知都送达后才标记为已通知。
+"""
+
+import threading
+import time
+from core.channels import ChannelUnavailable
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class OutboxSender:
+    """单个渠道的发件箱发送线程"""
+
+    def __init__(self, db, channel, poll_interval=30, batch_size=20):
+        """
+        初始化
+
+        Args:
+            db: JobDatabase 实例
+            channel: NotificationChannel 实例
+            poll_interval: 没有新通知时检查发件箱的间隔（秒），用于处理到期的重试
+            batch_size: 每批最多发送的通知数
+        """
+        self.db = db
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """启动后台发送线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f'outbox-{self.channel.name}', daemon=True)
+        self._thread.start()
+        logger.debug(f"{self.channel.name} 渠道发送线程已启动")
+
+    def wake(self):
+        """通知发送线程有新的待发送通知"""
+        self._wake_event.set()
+
+    def request_stop(self):
+        """通知发送线程在当前批次完成后退出，不等待"""
+        self._stop_event.set()
+        self._wake_event.set()
+
+    def stop(self, drain_timeout=30):
+        """
+        停止发送线程
+
+        Args:
+            drain_timeout: 等待当前批次发送完成的最长时间（秒）
+        """
+        self.request_stop()
+        if self._thread:
+            self._thread.join(timeout=drain_timeout)
+
+    def _run(self):
+        """发送线程主循环"""
+        while not self._stop_event.is_set():
+            try:
+                self.process_due()
+            except Exception as e:
+                logger.error(f"{self.channel.name} 渠道发件箱处理失败: {e}")
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+
+    def flush(self, timeout=120):
+        """
+        在当前线程中发送本渠道所有到期的通知，用于单次检查结束前
+
+        Args:
+            timeout: 最长等待时间（秒），包括等待重试退避
+
+        Returns:
+            bool: 本渠道的通知是否已全部处理
+        """
+        deadline = time.monotonic() + timeout
+        channels = [self.channel.name]
+        while time.monotonic() < deadline:
+            self.process_due()
+            if self.db.count_pending_outbox(channels) == 0:
+                return True
+            time.sleep(min(self.channel.retry_delay, max(deadline - time.monotonic(), 0)))
+        return self.db.count_pending_outbox(channels) == 0
+
+    def process_due(self):
+        """
+        领取并发送本渠道到期的通知，直到没有到期通知为止
+
+        Returns:
+            int: 成功发送的数量
+        """
+        sent = 0
+        with self._lock:
+            while True:
+                rows = self.db.claim_due_outbox(self.batch_size, channel=self.channel.name)
+                if not rows:
+                    return sent
+                sent += self._send_batch(rows)
+
+    def _send_batch(self, rows):
+        """
+        在同一个会话中发送一批通知
+
+        Returns:
+            int: 成功发送的数量
+        """
+        sent = 0
+        # 已处理（发送成功或已记录失败）的通知数
+        done = 0
+        try:
+            with self.channel.session() as session:
+                for index, row in enumerate(rows):
+                    try:
+                        session.send(row)
+                    except ChannelUnavailable as e:
+                        # 渠道不可用时本批剩余的通知也无法发送，全部安排重试
+                        logger.error(f"{self.channel.name} 渠道不可用: {e}")
+                        for pending in rows[index:]:
+                            self._handle_failure(pending, e)
+                        done = len(rows)
+                        return sent
+                    except Exception as e:
+                        self._handle_failure(row, e)
+                        done += 1
+                        continue
+
+                    self.db.complete_outbox(row['id'])
+                    sent += 1
+                    done += 1
+                    logger.info(f"通知发送成功！[{self.channel.name}] {row['subject']} -> "
+                                f"{row['recipient'] or '默认收件人'}")
+        except Exception as e:
+            # 会话建立或关闭失败，未处理的通知同样计入失败次数，超过重试次数后放弃
+            logger.error(f"{self.channel.name} 渠道会话失败: {e}")
+            for pending in rows[done:]:
+                self._handle_failure(pending, e)
+        return sent
+
+    def _handle_failure(self, row, error):
+        """记录发送失败，未超过重试次数时安排退避重试"""
+        attempts = row['attempts'] + 1
+        max_retry = self.channel.max_retry
+        if attempts >= max_retry:
+            logger.error(f"通知 #{row['id']} [{self.channel.name}] 发送失败 {attempts} 次，放弃发送: {error}")
+            self.db.fail_outbox(row['id'], str(error))
+            return
+
+        delay = self.channel.retry_backoff(attempts)
+        logger.warning(f"通知 #{row['id']} [{self.channel.name}] 发送失败 (尝试 {attempts}/{max_retry})，"
+                       f"{delay:.0f} 秒后重试: {error}")
+        self.db.retry_outbox(row['id'], str(error), time.time() + delay)
+
+
+class Outbox:
+    """发件箱 - 管理各渠道的发送线程"""
+
+    def __init__(self, db, channels, poll_interval=30, batch_size=20):
+        """
+        初始化
+
+        Args:
+            db: JobDatabase 实例
+            channels: 通知渠道列表
+            poll_interval: 没有新通知时检查发件箱的间隔（秒）
+            batch_size: 每批最多发送的通知数
+        """
+        self.db = db
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.senders = {}
+        self._started = False
+        self.set_channels(channels)
+
+    @property
+    def channels(self):
+        """当前的通知渠道列表"""
+        return [sender.channel for sender in self.senders.values()]
+
+    def set_channels(self, channels):
+        """
+        切换通知渠道，已在运行的发送线程会被替换
+
+        Args:
+            channels: 通知渠道列表
+        """
+        old_senders = self.senders
+        self.senders = {
+            channel.name: OutboxSender(self.db, channel, self.poll_interval, self.batch_size)
+            for channel in channels
+        }
+        for sender in old_senders.values():
+            sender.stop()
+        if self._started:
+            for sender in self.senders.values():
+                sender.start()
+
+    def start(self):
+        """启动全部渠道的发送线程"""
+        self._started = True
+        for sender in self.senders.values():
+            sender.start()
+
+    def wake(self):
+        """通知全部渠道有新的待发送通知"""
+        for sender in self.senders.values():
+            sender.wake()
+
+    def stop(self, drain_timeout=30):
+        """
+        停止全部渠道的发送线程
+
+        Args:
+            drain_timeout: 每个渠道等待当前批次发送完成的最长时间（秒）
+        """
+        self._started = False
+        # 先通知全部线程退出，各渠道同时收尾
+        for sender in self.senders.values():
+            sender.request_stop()
+        for sender in self.senders.values():
+            sender.stop(drain_timeout)
+
+    def flush(self, timeout=120):
+        """
+        各渠道并行发送所有到期的通知，用于单次检查结束前
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 全部渠道的通知是否已处理完
+        """
+        results = {}
+
+        def flush_sender(name, sender):
+            try:
+                results[name] = sender.flush(timeout)
+            except Exception as e:
+                logger.error(f"{name} 渠道发送失败: {e}")
+                results[name] = False
+
+        threads = [
+            threading.Thread(target=flush_sender, args=(name, sender), name=f'flush-{name}', daemon=True)
+            for name, sender in self.senders.items()
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0) + 5)
+        return all(results.get(name, False) for name in self.senders)
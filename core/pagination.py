@@ -0,0 +1,134 @@
+"""
+分页模块 - 一个公司条目爬取多页岗位
+
+公司配置 pagination 后，同一个公司依次（或并发）爬取多页，结果合并为一个公司，
+不再为每一页复制一个公司条目。翻页方式：
+- url: URL模板，{page} 为页码，{offset} 为偏移量（第几页 × size）
+- next_selector: Selenium 点击"下一页"按钮（按钮不存在或被禁用时停止）
+
+以下情况提前停止翻页：
+- 页面没有岗位元素，或岗位元素少于 size
+- 页面与上一页相同（页码超出范围时有的网站返回最后一页）
+- stop_when_known 为 true（默认）且页面中的岗位都已保存过：
+  新岗位通常在前面几页，平时每次检查只需要一两页
+
+配置示例（companies.yaml）：
+    pagination:
+      url: "https://example.com/jobs?pageNum={page}"
+      start: 1
+      size: 10
+      max_pages: 5
+"""
+
+from config import ConfigError
+
+# pagination 配置字段: 字段名 -> (允许的类型, 是否必填)
+PAGINATION_SCHEMA = {
+    'url': (str, False),
+    'next_selector': (str, False),
+    'start': (int, False),
+    'size': (int, False),
+    'max_pages': (int, False),
+    'concurrent': (bool, False),
+    'stop_when_known': (bool, False),
+}
+
+
+def validate_section(company_name, section, config, schema):
+    """
+    按 schema 校验一个配置段
+
+    Args:
+        company_name: 公司名称
+        section: 配置段名称，用于错误信息
+        config: 配置字典
+        schema: 字段名 -> (允许的类型, 是否必填)
+
+    Raises:
+        ConfigError: 配置不合法时抛出
+    """
+    if not isinstance(config, dict):
+        raise ConfigError(f"{company_name}: {section} 应为字典")
+    unknown = sorted(set(config) - set(schema))
+    if unknown:
+        raise ConfigError(f"{company_name}: {section} 中未知的配置项 {', '.join(unknown)}")
+    for field, (expected_type, required) in schema.items():
+        value = config.get(field)
+        if value is None:
+            if required:
+                raise ConfigError(f"{company_name}: {section} 缺少必填项 {field}")
+            continue
+        # bool 是 int 的子类，需要单独排除
+        if not isinstance(value, expected_type) or (expected_type is int and isinstance(value, bool)):
+            raise ConfigError(
+                f"{company_name}: {section}.{field} 类型应为 {expected_type.__name__}，实际为 {type(value).__name__}"
+            )
+
+
+class PageSpec:
+    """编译后的分页配置"""
+
+    __slots__ = ('url', 'next_selector', 'start', 'size', 'max_pages', 'concurrent', 'stop_when_known')
+
+    def __init__(self, company_name, config, requires_selenium=False):
+        """
+        校验并编译分页配置
+
+        Args:
+            company_name: 公司名称
+            config: pagination 配置字典
+            requires_selenium: 公司是否使用Selenium爬取
+
+        Raises:
+            ConfigError: 配置不合法时抛出
+        """
+        validate_section(company_name, 'pagination', config, PAGINATION_SCHEMA)
+        self.url = config.get('url')
+        self.next_selector = config.get('next_selector')
+        self.start = config.get('start', 1)
+        self.size = config.get('size')
+        self.max_pages = config.get('max_pages', 5)
+        self.concurrent = config.get('concurrent', False)
+        self.stop_when_known = config.get('stop_when_known', True)
+
+        if bool(self.url) == bool(self.next_selector):
+            raise ConfigError(f"{company_name}: pagination 需要设置 url 或 next_selector 其中之一")
+        if self.url and '{page}' not in self.url and '{offset}' not in self.url:
+            raise ConfigError(f"{company_name}: pagination.url 应包含 {{page}} 或 {{offset}}")
+        if '{offset}' in (self.url or '') and not self.size:
+            raise ConfigError(f"{company_name}: pagination.url 使用 {{offset}} 时需要设置 size")
+        if self.next_selector and not requires_selenium:
+            raise ConfigError(f"{company_name}: pagination.next_selector 只能用于 requires_selenium 的公司")
+        if self.concurrent and requires_selenium:
+            raise ConfigError(f"{company_name}: pagination.concurrent 只能用于静态页面")
+        if self.max_pages < 1:
+            raise ConfigError(f"{company_name}: pagination.max_pages 应大于0")
+
+    def page_url(self, index):
+        """
+        第 index 页（从0开始）的URL
+
+        Args:
+            index: 第几页
+
+        Returns:
+            str: 页面URL，使用 next_selector 翻页时返回 None
+        """
+        if not self.url:
+            return None
+        return self.url.replace('{page}', str(self.start + index)) \
+            .replace('{offset}', str(index * (self.size or 0)))
+
+    def is_last_page(self, element_count):
+        """
+        根据页面中的岗位元素数量判断是否为最后一页
+
+        Args:
+            element_count: 岗位元素数量，未知时为 None
+
+        Returns:
+            bool: 是否不需要再爬取下一页
+        """
+        if element_count is None:
+            return False
+        return element_count == 0 or (self.size is not None and element_count < self.size)
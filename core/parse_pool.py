@@ -0,0 +1,138 @@
+"""
+解析进程池模块 - 在多个进程中解析大页面
+
+BeautifulSoup 解析和选择器匹配是纯CPU计算，受GIL限制只能用一个核。
+并发抓取得到一批页面后，较大的页面连同公司配置交给进程池解析，
+子进程只返回 (标题, 链接, 地点, 详情) 元组，主进程再组装为岗位记录；
+较小的页面跨进程传递的开销大于解析本身，仍在主进程解析。
+
+子进程按公司配置指纹缓存编译后的 CompanyPlan，同一公司只编译一次。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup
+from core.response_body import decode_body, resolve_encoding
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 子进程中已编译的计划: 配置指纹 -> CompanyPlan
+_worker_plans = {}
+
+
+def decode_html(content, encoding=None):
+    """
+    解码页面
+
+    Args:
+        content: 页面原始字节
+        encoding: 页面编码（主进程按响应头等确定），为None时按页面内容确定
+
+    Returns:
+        str: 页面文本
+    """
+    return decode_body(content, encoding or resolve_encoding(content))
+
+
+def parse_page(plan, content, page_url, follow_links=True, encoding=None):
+    """
+    解析页面并提取岗位
+
+    Args:
+        plan: CompanyPlan
+        content: 页面原始字节
+        page_url: 页面URL
+        follow_links: 同 CompanyPlan.extract
+        encoding: 页面编码，同 decode_html
+
+    Returns:
+        tuple: ((标题, 链接, 地点, 详情) 元组列表, 岗位元素数量)
+    """
+    soup = BeautifulSoup(decode_html(content, encoding), 'html.parser')
+    return plan.extract_page(soup, page_url, follow_links)
+
+
+def parse_embedded(plan, content, page_url, encoding=None):
+    """
+    从页面内嵌的JSON数据中提取岗位
+
+    Args:
+        plan: 配置了 embedded_state 的 CompanyPlan
+        content: 页面原始字节
+        page_url: 页面URL
+        encoding: 页面编码，同 decode_html
+
+    Returns:
+        list: (标题, 链接, 地点, 详情) 元组列表，没有可用的内嵌数据时返回 None
+    """
+    soup = BeautifulSoup(decode_html(content, encoding), 'html.parser')
+    return plan.extract_embedded_rows(soup, page_url)
+
+
+def _parse_in_worker(config, fingerprint, content, page_url, follow_links, encoding):
+    """子进程入口：编译（或复用）公司计划并解析页面，配置了内嵌数据时只提取内嵌数据"""
+    plan = _worker_plans.get(fingerprint)
+    if plan is None:
+        from core.plan import compile_company
+        plan = _worker_plans[fingerprint] = compile_company(config)
+    if plan.embedded is not None:
+        return parse_embedded(plan, content, page_url, encoding)
+    return parse_page(plan, content, page_url, follow_links, encoding)
+
+
+class ParsePool:
+    """解析进程池"""
+
+    def __init__(self, workers=0, min_bytes=256 * 1024):
+        """
+        Args:
+            workers: 子进程数，0 表示不使用进程池，-1 表示使用全部CPU核
+            min_bytes: 页面达到该大小才交给进程池解析
+        """
+        self.workers = (os.cpu_count() or 1) if workers < 0 else workers
+        self.min_bytes = min_bytes
+        self._executor = None
+
+    @classmethod
+    def from_settings(cls, spider_settings):
+        """
+        根据 settings.yaml 的 spider 配置创建进程池，parse_workers 为0时返回 None
+
+        Args:
+            spider_settings: spider 配置字典
+        """
+        workers = spider_settings.get('parse_workers', 0)
+        if not workers:
+            return None
+        return cls(workers, spider_settings.get('parse_min_kb', 256) * 1024)
+
+    def offload(self, content):
+        """页面是否应交给进程池解析"""
+        return self.workers > 0 and len(content) >= self.min_bytes
+
+    def submit(self, plan, content, page_url, follow_links=True, encoding=None):
+        """
+        提交页面到进程池解析（首次提交时启动子进程）
+
+        Args:
+            plan: CompanyPlan
+            content: 页面原始字节
+            page_url: 页面URL
+            follow_links: 同 CompanyPlan.extract
+            encoding: 页面编码，同 decode_html
+
+        Returns:
+            concurrent.futures.Future: 结果同 parse_page，配置了内嵌数据的公司结果同 parse_embedded
+        """
+        if self._executor is None:
+            logger.info(f"启动解析进程池: {self.workers} 个进程")
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor.submit(_parse_in_worker, plan.config, plan.fingerprint,
+                                     content, page_url, follow_links, encoding)
+
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,394 @@
+"""
+公司爬取计划模块 - 校验公司配置并预编译选择器
+
+配置加载时把每个公司条目编译为 CompanyPlan：
+- 按 COMPANY_SCHEMA 校验字段类型和必填项，错误在启动时暴露
+- CSS选择器预编译，爬取时不再重复解析选择器字符串
+- 关键词列表预编译为匹配器（由调度器在爬取后过滤，见 CompanyPlan.filter_jobs）
+- type 为 api 的公司编译接口配置（见 core.api_source）
+- 配置了 embedded_state 的公司编译内嵌数据的字段映射（见 core.embedded_state）
+"""
+
+import re
+from urllib.parse import urljoin
+
+import soupsieve
+
+from config import ConfigError, company_fingerprint
+from core.api_source import ApiSpec
+from core.embedded_state import EmbeddedStateSpec
+from core.pagination import PageSpec
+from core.scroll import ScrollSpec
+from core.matcher import KeywordMatcher
+from core.models import JobRecord
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 公司配置字段: 字段名 -> (允许的类型, 是否必填)
+COMPANY_SCHEMA = {
+    'name': (str, True),
+    'url': (str, True),
+    'type': (str, False),
+    'job_selector': (str, False),
+    'title_selector': (str, False),
+    'url_selector': (str, False),
+    'location_selector': (str, False),
+    'detail_selector': (str, False),
+    'requires_selenium': (bool, False),
+    'enabled': (bool, False),
+    'keywords': (list, False),
+    'exclude_keywords': (list, False),
+    'deadline': (str, False),
+    'api': (dict, False),
+    'embedded_state': (dict, False),
+    'pagination': (dict, False),
+    'scroll': (dict, False),
+    'aliases': (list, False),
+}
+
+# 公司类型: html（解析页面，默认）、api（请求JSON接口）
+COMPANY_TYPES = ('html', 'api')
+# html 类型的必填项
+HTML_REQUIRED = ('job_selector', 'title_selector')
+
+def _compile_selector(company_name, field, selector):
+    """编译单个CSS选择器，语法错误转换为ConfigError"""
+    try:
+        return soupsieve.compile(selector)
+    except soupsieve.SelectorSyntaxError as e:
+        raise ConfigError(f"{company_name}: {field} 选择器无效 '{selector}': {e}") from None
+
+
+def validate_company(config):
+    """
+    按 COMPANY_SCHEMA 校验单个公司配置
+
+    Args:
+        config: 公司配置字典
+
+    Raises:
+        ConfigError: 配置不合法时抛出
+    """
+    name = config.get('name') or '<未命名>'
+
+    unknown = sorted(set(config) - set(COMPANY_SCHEMA))
+    if unknown:
+        raise ConfigError(f"{name}: 未知的配置项 {', '.join(unknown)}")
+
+    for field, (expected_type, required) in COMPANY_SCHEMA.items():
+        value = config.get(field)
+        if value is None:
+            if required:
+                raise ConfigError(f"{name}: 缺少必填项 {field}")
+            continue
+        if not isinstance(value, expected_type):
+            raise ConfigError(
+                f"{name}: {field} 类型应为 {expected_type.__name__}，实际为 {type(value).__name__}"
+            )
+        if expected_type is str and required and not value.strip():
+            raise ConfigError(f"{name}: {field} 不能为空")
+
+    company_type = config.get('type', 'html')
+    if company_type not in COMPANY_TYPES:
+        raise ConfigError(f"{name}: type 只能是 {'/'.join(COMPANY_TYPES)}，实际为 '{company_type}'")
+    if company_type == 'html':
+        for field in HTML_REQUIRED:
+            if not (config.get(field) or '').strip():
+                raise ConfigError(f"{name}: 缺少必填项 {field}")
+    else:
+        if config.get('api') is None:
+            raise ConfigError(f"{name}: type 为 api 时需要 api 配置")
+        for field in ('requires_selenium', 'embedded_state', 'pagination', 'scroll'):
+            if config.get(field):
+                hint = '（分页请在 api.pagination 中配置）' if field == 'pagination' else ''
+                raise ConfigError(f"{name}: type 为 api 时不能设置 {field}{hint}")
+
+    if config.get('pagination') and config.get('scroll') is not None:
+        raise ConfigError(f"{name}: pagination 和 scroll 只能设置一个")
+
+    for field in ('keywords', 'exclude_keywords', 'aliases'):
+        if not all(isinstance(kw, str) for kw in config.get(field) or []):
+            raise ConfigError(f"{name}: {field} 只能包含字符串")
+
+    deadline = config.get('deadline')
+    if deadline is not None and not re.fullmatch(r'([01]?\d|2[0-3]):[0-5]\d', deadline):
+        raise ConfigError(f"{name}: deadline 格式应为 HH:MM，实际为 '{deadline}'")
+
+
+class CompanyPlan:
+    """
+    公司爬取计划 - 编译后的公司配置
+
+    由 compile_company 创建，创建后不再修改
+    """
+
+    __slots__ = ('name', 'url', 'config', 'fingerprint', 'type', 'requires_selenium',
+                 'job_selector', 'title_selector', 'url_selector',
+                 'location_selector', 'detail_selector', 'api', 'embedded', 'pages', 'scroll', 'aliases', 'matcher')
+
+    def __init__(self, config):
+        """
+        编译公司配置
+
+        Args:
+            config: 已通过校验的公司配置字典
+        """
+        name = config['name']
+        self.name = name
+        self.url = config['url']
+        self.config = dict(config)
+        self.fingerprint = company_fingerprint(config)
+        self.type = config.get('type', 'html')
+        self.requires_selenium = config.get('requires_selenium', False)
+
+        self.job_selector = self.title_selector = self.url_selector = None
+        self.location_selector = self.detail_selector = self.api = self.embedded = None
+        self.pages = self.scroll = None
+        # 公司的曾用名：合并多个公司条目后，原名称下保存的岗位仍算作已知岗位
+        self.aliases = tuple(config.get('aliases') or ())
+        if self.type == 'api':
+            self.api = ApiSpec(name, config['api'])
+        else:
+            self.job_selector = _compile_selector(name, 'job_selector', config['job_selector'])
+            self.title_selector = _compile_selector(name, 'title_selector', config['title_selector'])
+            self.url_selector = _compile_selector(name, 'url_selector', config.get('url_selector') or 'a')
+            if config.get('location_selector'):
+                self.location_selector = _compile_selector(name, 'location_selector', config['location_selector'])
+            if config.get('detail_selector'):
+                self.detail_selector = _compile_selector(name, 'detail_selector', config['detail_selector'])
+            if config.get('embedded_state'):
+                self.embedded = EmbeddedStateSpec(name, config['embedded_state'])
+            if config.get('pagination'):
+                self.pages = PageSpec(name, config['pagination'], self.requires_selenium)
+            if config.get('scroll') is not None:
+                # scroll: {} 表示使用默认配置
+                self.scroll = ScrollSpec(name, config['scroll'], self.requires_selenium)
+
+        self.matcher = KeywordMatcher(config.get('keywords'), config.get('exclude_keywords'))
+
+    def __repr__(self):
+        return f"CompanyPlan({self.name!r})"
+
+    @property
+    def static_fetch(self):
+        """是否先用普通HTTP请求获取页面（静态页面、接口、内嵌数据）"""
+        return self.type == 'api' or self.embedded is not None or not self.requires_selenium
+
+    def page_url(self, index=0):
+        """
+        第 index 页（从0开始）的URL
+
+        没有分页配置或使用"下一页"按钮翻页时，第一页为公司的 url
+
+        Args:
+            index: 第几页
+
+        Returns:
+            str: 页面URL
+        """
+        if self.pages is not None and self.pages.url:
+            return self.pages.page_url(index)
+        return self.url
+
+    def get(self, key, default=None):
+        """读取原始配置项"""
+        return self.config.get(key, default)
+
+    @staticmethod
+    def _select_text(selector, element):
+        """获取选择器匹配的第一个元素的文本"""
+        if selector is None:
+            return ""
+        found = selector.select_one(element)
+        return found.get_text(strip=True) if found is not None else ""
+
+    def _job_url(self, element, page_url):
+        """从岗位元素中提取岗位链接，找不到时使用页面URL"""
+        url_element = self.url_selector.select_one(element)
+        if url_element is not None and url_element.get('href'):
+            job_url = url_element['href']
+        elif element.name == 'a' and element.get('href'):
+            job_url = element['href']
+        else:
+            # 尝试从子元素找链接
+            link = element.find('a', href=True)
+            job_url = link['href'] if link else page_url
+
+        # 处理相对URL
+        if not job_url.startswith('http'):
+            job_url = urljoin(page_url, job_url)
+        return job_url.strip()
+
+    def extract(self, root, page_url, follow_links=True):
+        """
+        从解析后的页面中提取岗位
+
+        Args:
+            root: BeautifulSoup 文档或元素
+            page_url: 页面URL，用于补全相对链接
+            follow_links: 是否从岗位元素中提取链接；为False时直接使用页面URL，
+                且标题只从 title_selector 获取
+
+        Returns:
+            list: JobRecord 列表
+        """
+        return self.records(self.extract_page(root, page_url, follow_links)[0])
+
+    def records(self, rows):
+        """
+        把 extract_rows 得到的元组转换为岗位记录
+
+        Args:
+            rows: (标题, 链接, 地点, 详情) 元组列表
+
+        Returns:
+            list: JobRecord 列表
+        """
+        return [JobRecord(self.name, title, url, location, detail, company_url=self.url)
+                for title, url, location, detail in rows]
+
+    def filter_jobs(self, jobs):
+        """
+        按公司的 keywords/exclude_keywords 过滤岗位
+
+        提取岗位时不过滤：配置了多个订阅者时全部岗位都交给订阅者分发，
+        一个人不需要的岗位不会被所有人丢掉
+
+        Args:
+            jobs: JobRecord 列表
+
+        Returns:
+            list: 标题匹配的岗位（没有配置关键词时原样返回）
+        """
+        if not self.matcher:
+            return jobs
+        return [job for job in jobs if self.matcher.match(job.title)]
+
+    def extract_api_page(self, data):
+        """
+        从接口返回的一页JSON数据中提取岗位（type 为 api）
+
+        Args:
+            data: JSON数据
+
+        Returns:
+            tuple: ((标题, 链接, 地点, 详情) 元组列表, 该页的岗位总数（过滤前）)
+        """
+        items = self.api.mapping.find_items(data)
+        return self.api.mapping.rows(items, self.url), len(items)
+
+    def extract_embedded_rows(self, soup, page_url):
+        """
+        从页面内嵌的JSON数据中提取岗位（配置了 embedded_state）
+
+        Args:
+            soup: BeautifulSoup 文档
+            page_url: 页面URL
+
+        Returns:
+            list: (标题, 链接, 地点, 详情) 元组列表，页面中没有可用的内嵌数据时返回 None
+        """
+        return self.embedded.extract(soup, page_url)
+
+    def extract_rows(self, root, page_url, follow_links=True):
+        """
+        从解析后的页面中提取岗位，结果为紧凑的元组（可在进程间传递）
+
+        Args:
+            root: BeautifulSoup 文档或元素
+            page_url: 页面URL，用于补全相对链接
+            follow_links: 同 extract
+
+        Returns:
+            list: (标题, 链接, 地点, 详情) 元组列表
+        """
+        return self.extract_page(root, page_url, follow_links)[0]
+
+    def extract_page(self, root, page_url, follow_links=True):
+        """
+        同 extract_rows，同时返回页面中的岗位元素数量（用于判断是否为最后一页）
+
+        Returns:
+            tuple: ((标题, 链接, 地点, 详情) 元组列表, 岗位元素数量)
+        """
+        job_elements = self.job_selector.select(root)
+        logger.debug(f"{self.name}: 找到 {len(job_elements)} 个岗位元素")
+        return self.extract_elements(job_elements, page_url, follow_links), len(job_elements)
+
+    def extract_elements(self, job_elements, page_url, follow_links=True):
+        """
+        从已选中的岗位元素中提取岗位（滚动加载时只解析新出现的元素）
+
+        Args:
+            job_elements: 岗位元素列表
+            page_url: 页面URL，用于补全相对链接
+            follow_links: 同 extract
+
+        Returns:
+            list: (标题, 链接, 地点, 详情) 元组列表
+        """
+        rows = []
+        for element in job_elements:
+            try:
+                title_element = self.title_selector.select_one(element)
+                if title_element is not None:
+                    title = title_element.get_text(strip=True)
+                elif follow_links:
+                    # 尝试从元素本身获取文本
+                    title = element.get_text(strip=True)
+                else:
+                    title = ""
+
+                if not title:
+                    continue
+
+                rows.append((
+                    title,
+                    self._job_url(element, page_url) if follow_links else page_url,
+                    self._select_text(self.location_selector, element),
+                    self._select_text(self.detail_selector, element),
+                ))
+
+            except Exception as e:
+                logger.debug(f"{self.name}: 解析岗位元素失败: {e}")
+                continue
+
+        return rows
+
+
+def compile_company(config):
+    """
+    校验并编译单个公司配置
+
+    Args:
+        config: 公司配置字典
+
+    Returns:
+        CompanyPlan: 编译后的爬取计划
+
+    Raises:
+        ConfigError: 配置不合法时抛出
+    """
+    validate_company(config)
+    return CompanyPlan(config)
+
+
+def check_company_configs(companies):
+    """
+    校验全部公司配置（包括已禁用的），收集所有错误而不是遇到第一个就停止
+
+    Args:
+        companies: 公司配置列表
+
+    Returns:
+        tuple: (编译成功的计划列表, 错误信息列表)
+    """
+    plans = []
+    errors = []
+    for company in companies:
+        try:
+            plans.append(compile_company(company))
+        except ConfigError as e:
+            errors.append(str(e))
+    return plans, errors
@@ -0,0 +1,156 @@
+"""
+优先级调度模块 - 按预期收益和截止时间排列公司的检查顺序
+
+根据 check_logs 的历史统计为每个公司打分：
+- 预期新岗位数越多、单次耗时越短、距上次成功越久，优先级越高
+- 没有历史记录的公司按先验值估计，保证新加入的公司也会被尽早检查
+- 配置了 deadline 的公司，在可能错过截止时间时提前执行
+- 设置了时间预算时，预计超出预算的公司顺延到下次检查
+"""
+
+from datetime import datetime, timedelta, timezone
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 先验估计：没有历史记录时，按每次 1 个新岗位、耗时 15 秒估计
+PRIOR_NEW_JOBS = 1.0
+PRIOR_WEIGHT = 2
+DEFAULT_DURATION = 15.0
+
+# 久未成功的加分上限（小时）
+MAX_STALENESS_HOURS = 48
+
+
+def parse_deadline(value, now):
+    """
+    把 "HH:MM" 形式的截止时间转换为当天的datetime
+
+    Args:
+        value: 截止时间字符串
+        now: 当前时间
+
+    Returns:
+        datetime: 截止时间，格式错误时返回None
+    """
+    try:
+        hour, minute = (int(part) for part in value.split(':'))
+        return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    except (ValueError, AttributeError):
+        return None
+
+
+class PriorityPlanner:
+    """优先级调度器"""
+
+    def __init__(self, db, stats_days=14):
+        """
+        初始化
+
+        Args:
+            db: JobDatabase 实例
+            stats_days: 统计最近多少天的检查记录
+        """
+        self.db = db
+        self.stats_days = stats_days
+
+    def estimate(self, stats, now_utc):
+        """
+        估计单个公司的预期收益和耗时
+
+        Args:
+            stats: get_company_stats 返回的单个公司统计，可以为None
+            now_utc: 当前UTC时间
+
+        Returns:
+            tuple: (优先级分数, 预计耗时秒数)
+        """
+        stats = stats or {}
+        checks = stats.get('checks', 0)
+        expected_yield = (stats.get('new_jobs', 0) + PRIOR_NEW_JOBS * PRIOR_WEIGHT) / (checks + PRIOR_WEIGHT)
+        duration = stats.get('avg_duration') or DEFAULT_DURATION
+
+        staleness_hours = MAX_STALENESS_HOURS
+        if stats.get('last_success'):
+            last_success = datetime.strptime(stats['last_success'], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+            staleness_hours = min((now_utc - last_success).total_seconds() / 3600, MAX_STALENESS_HOURS)
+
+        # 每单位耗时的预期收益，久未成功的公司额外加分
+        score = (expected_yield + staleness_hours / 24) / max(duration, 1.0)
+        return score, duration
+
+    def order(self, plans, now=None, time_budget=None, gap_seconds=0):
+        """
+        计算本次的检查顺序
+
+        Args:
+            plans: 公司爬取计划列表
+            now: 当前本地时间，默认为 datetime.now()
+            time_budget: 本次检查的时间预算（秒），None 表示不限制
+            gap_seconds: 相邻两个公司之间的等待时间（秒）
+
+        Returns:
+            tuple: (按顺序执行的计划列表, 顺延到下次的计划列表)
+        """
+        now = now or datetime.now()
+        now_utc = datetime.now(timezone.utc)
+        stats = self.db.get_company_stats(self.stats_days)
+
+        pending = []
+        for index, plan in enumerate(plans):
+            score, duration = self.estimate(stats.get(plan.name), now_utc)
+            deadline = parse_deadline(plan.get('deadline'), now) if plan.get('deadline') else None
+            if deadline is not None and deadline <= now:
+                # 今天的截止时间已过，本次按普通公司处理
+                deadline = None
+            pending.append({
+                'plan': plan,
+                'score': score,
+                'duration': duration + gap_seconds,
+                'deadline': deadline,
+                'index': index,
+            })
+
+        # 普通顺序：分数从高到低，分数相同时保持配置顺序
+        by_score = sorted(pending, key=lambda item: (-item['score'], item['index']))
+        # 有截止时间的公司按截止时间排序（最早截止优先）
+        by_deadline = sorted((item for item in pending if item['deadline']),
+                             key=lambda item: item['deadline'])
+
+        ordered = []
+        deferred = []
+        clock = now
+        elapsed = 0.0
+        done = set()
+
+        while len(done) < len(pending):
+            waiting = [item for item in by_deadline if id(item) not in done]
+            best = next(item for item in by_score if id(item) not in done)
+
+            # 先执行 best 后，剩余有截止时间的公司按截止时间顺序执行是否仍能全部赶上
+            if best['deadline'] is None and waiting:
+                finish = clock + timedelta(seconds=best['duration'])
+                feasible = True
+                for item in waiting:
+                    finish += timedelta(seconds=item['duration'])
+                    if finish > item['deadline']:
+                        feasible = False
+                        break
+                if not feasible:
+                    best = waiting[0]
+
+            done.add(id(best))
+            if time_budget is not None and elapsed + best['duration'] > time_budget and best['deadline'] is None:
+                deferred.append(best['plan'])
+                continue
+
+            ordered.append(best['plan'])
+            elapsed += best['duration']
+            clock += timedelta(seconds=best['duration'])
+            if best['deadline'] and clock > best['deadline']:
+                logger.warning(f"{best['plan'].name} 预计无法在截止时间 {best['deadline']:%H:%M} 前完成")
+
+        logger.info("检查顺序: " + " > ".join(plan.name for plan in ordered))
+        if deferred:
+            logger.info(f"超出时间预算，顺延到下次: {', '.join(plan.name for plan in deferred)}")
+        return ordered, deferred
@@ -0,0 +1,294 @@
+"""
+响应体模块 - 页面编码识别与响应大小限制
+
+编码按以下顺序确定，前面的来源可用时不再推测：
+1. 字节序标记（BOM）
+2. 响应头 Content-Type 中的 charset
+3. 页面开头的 <meta charset> 或 <meta http-equiv="Content-Type">
+4. 能按 UTF-8 无错解码时为 UTF-8
+5. 该网站上次推测的编码（按域名缓存，能无错解码时才使用）
+6. 以上都不满足时才用 chardet 推测，只检测页面开头的一部分，结果按域名缓存
+
+gb2312/gbk 统一按其超集 gb18030 解码，避免生僻字乱码。
+
+响应以流的方式读取，超过 max_response_mb（传输大小）或 max_decompressed_mb（解压后大小）
+时立即断开并放弃该页面（不重试），防止异常页面或压缩炸弹耗尽内存。
+"""
+
+import codecs
+import re
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.compat import chardet
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 读取响应体的块大小
+CHUNK_SIZE = 64 * 1024
+
+# 在页面开头多少字节内查找 <meta charset>
+META_SCAN_BYTES = 4096
+
+# chardet 推测编码时检测的字节数
+DETECT_SAMPLE_BYTES = 32 * 1024
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# 按超集解码的编码
+ENCODING_ALIASES = {
+    'gb2312': 'gb18030',
+    'gbk': 'gb18030',
+    'ascii': 'utf-8',
+    'iso8859-1': 'cp1252',
+}
+
+CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+# 域名 -> 上次用 chardet 推测的编码
+_host_encodings = {}
+_host_lock = threading.Lock()
+
+
+class ResponseTooLarge(requests.exceptions.RequestException):
+    """响应超过大小限制（不重试）"""
+
+
+class BodyLimits:
+    """响应大小限制"""
+
+    __slots__ = ('max_bytes', 'max_decompressed')
+
+    def __init__(self, max_bytes=10 * 1024 * 1024, max_decompressed=50 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: 传输大小上限（字节），0 表示不限制
+            max_decompressed: 解压后大小上限（字节），0 表示不限制
+        """
+        self.max_bytes = max_bytes
+        self.max_decompressed = max_decompressed
+
+    @classmethod
+    def from_settings(cls, spider_settings):
+        """
+        根据 settings.yaml 的 spider 配置创建
+
+        Args:
+            spider_settings: spider 配置字典
+        """
+        return cls(
+            int(spider_settings.get('max_response_mb', 10) * 1024 * 1024),
+            int(spider_settings.get('max_decompressed_mb', 50) * 1024 * 1024),
+        )
+
+    def check_declared(self, headers, url):
+        """
+        按响应头 Content-Length 检查，超过上限时不再读取响应体
+
+        Args:
+            headers: 响应头
+            url: 页面URL
+
+        Raises:
+            ResponseTooLarge: 声明的大小超过上限
+        """
+        try:
+            declared = int(headers.get('Content-Length') or 0)
+        except ValueError:
+            return
+        if self.max_bytes and declared > self.max_bytes:
+            raise ResponseTooLarge(f"响应大小 {declared / 1024 / 1024:.1f} MB 超过上限 "
+                                   f"{self.max_bytes / 1024 / 1024:.0f} MB: {url}")
+
+    def check(self, decoded, received, url):
+        """
+        检查已读取的大小
+
+        Args:
+            decoded: 已读取的解压后字节数
+            received: 已传输的字节数，未知时为 None
+            url: 页面URL
+
+        Raises:
+            ResponseTooLarge: 超过上限
+        """
+        if self.max_bytes and received is not None and received > self.max_bytes:
+            raise ResponseTooLarge(f"响应超过 {self.max_bytes / 1024 / 1024:.0f} MB: {url}")
+        if self.max_decompressed and decoded > self.max_decompressed:
+            raise ResponseTooLarge(f"响应解压后超过 {self.max_decompressed / 1024 / 1024:.0f} MB: {url}")
+
+
+def read_body(response, limits):
+    """
+    读取以 stream=True 发出的 requests 响应体，读取后 response.content 可以正常使用
+
+    Args:
+        response: requests.Response
+        limits: BodyLimits
+
+    Returns:
+        requests.Response: 传入的响应
+
+    Raises:
+        ResponseTooLarge: 响应超过大小限制
+    """
+    url = response.url
+    # 未压缩时读取的字节数就是传输大小（分块传输时 raw.tell() 不计数）
+    compressed = 'Content-Encoding' in response.headers
+    chunks = []
+    decoded = 0
+    try:
+        limits.check_declared(response.headers, url)
+        for chunk in response.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            decoded += len(chunk)
+            limits.check(decoded, response.raw.tell() if compressed else decoded, url)
+    except BaseException:
+        response.close()
+        raise
+    response._content = b''.join(chunks)
+    return response
+
+
+def normalize_encoding(name):
+    """
+    规范化编码名称
+
+    Args:
+        name: 编码名称
+
+    Returns:
+        str: Python 可用的编码名称，未知编码返回 None
+    """
+    if not name:
+        return None
+    try:
+        name = codecs.lookup(name.strip().strip('"\'')).name
+    except LookupError:
+        return None
+    return ENCODING_ALIASES.get(name, name)
+
+
+def declared_encoding(content, headers=None):
+    """
+    页面声明的编码（BOM、响应头、meta 标签）
+
+    Args:
+        content: 页面原始字节
+        headers: 响应头
+
+    Returns:
+        str: 编码名称，没有可用的声明时返回 None
+    """
+    for bom, encoding in BOMS:
+        if content.startswith(bom):
+            return encoding
+    if headers:
+        match = CHARSET_PATTERN.search(headers.get('Content-Type') or '')
+        encoding = normalize_encoding(match.group(1)) if match else None
+        if encoding:
+            return encoding
+    match = META_CHARSET_PATTERN.search(content[:META_SCAN_BYTES])
+    if match:
+        return normalize_encoding(match.group(1).decode('ascii', 'ignore'))
+    return None
+
+
+def _decodes(content, encoding):
+    """内容能否按 encoding 无错解码"""
+    try:
+        codecs.decode(content, encoding)
+    except (UnicodeDecodeError, LookupError):
+        return False
+    return True
+
+
+def detect_encoding(content):
+    """
+    用 chardet 推测编码，只检测页面开头 DETECT_SAMPLE_BYTES 字节
+
+    Args:
+        content: 页面原始字节
+
+    Returns:
+        str: 编码名称，无法推测时为 utf-8
+    """
+    if chardet is None:
+        return 'utf-8'
+    sample = content[:DETECT_SAMPLE_BYTES]
+    if len(content) > DETECT_SAMPLE_BYTES:
+        # 在最后一个 '<' 之前截断：截断在多字节字符中间时 chardet 会排除正确的编码，
+        # '<'（0x3C）不会是 GBK、Big5、Shift_JIS 双字节字符的第二个字节
+        cut = sample.rfind(b'<')
+        if cut > 0:
+            sample = sample[:cut]
+    return normalize_encoding(chardet.detect(sample)['encoding']) or 'utf-8'
+
+
+def resolve_encoding(content, headers=None, url=None):
+    """
+    确定页面编码，顺序见模块说明
+
+    Args:
+        content: 页面原始字节
+        headers: 响应头
+        url: 页面URL，用于按域名缓存推测的编码
+
+    Returns:
+        str: 编码名称
+    """
+    encoding = declared_encoding(content, headers)
+    if encoding:
+        return encoding
+    # 先于域名缓存检查 UTF-8：UTF-8 中文页面多半也能按 gb18030 无错解码（但是乱码）
+    if _decodes(content, 'utf-8'):
+        return 'utf-8'
+
+    host = (urlsplit(url).hostname or '') if url else ''
+    cached = _host_encodings.get(host) if host else None
+    if cached and _decodes(content, cached):
+        return cached
+
+    encoding = detect_encoding(content)
+    if host:
+        logger.debug(f"{host} 未声明编码，推测为 {encoding}")
+        with _host_lock:
+            _host_encodings[host] = encoding
+    return encoding
+
+
+def response_encoding(response):
+    """
+    确定响应（requests.Response 或 FetchResult）的编码
+
+    Args:
+        response: 响应对象
+
+    Returns:
+        str: 编码名称
+    """
+    return resolve_encoding(response.content, response.headers, str(response.url))
+
+
+def decode_body(content, encoding):
+    """
+    按编码解码，无法解码的字节替换为占位符
+
+    Args:
+        content: 原始字节
+        encoding: 编码名称
+
+    Returns:
+        str: 文本
+    """
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
@@ -4,141 +4,509 @@
 
 import time
 import random
+import signal
+import threading
 from datetime import datetime
 from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.triggers.cron import CronTrigger
 from core.spider import JobSpider
+from core.browser import BrowserManager
+from core.circuit import CircuitBreaker, RetryPolicy
+from core.fetch_cache import FetchCache
+from core.fetcher import FETCHER_SETTINGS, build_fetcher
+from core.parse_pool import ParsePool
+from core.response_body import BodyLimits
+from core.cluster import LeaseManager, NOTIFY_RESOURCE
+from core.priority import PriorityPlanner
 from core.database import JobDatabase
+from core.dedup import NearDuplicateIndex, job_features, simhash
 from core.notifier import EmailNotifier
-from config import load_company_configs, load_email_config, load_settings
+from core.outbox import Outbox
+from core.channels import build_channels, job_payload
+from core.subscription import SubscriptionIndex, load_subscribers
+from config import ConfigError, get_config_service
 from utils.logger import get_logger, log_separator
 
 logger = get_logger(__name__)
 
+# 守护进程模式下执行持久化任务的实例（任务存储中只保存函数引用，不保存实例）
+_daemon_monitor = None
+
+
+def scheduled_check(only=None):
+    """
+    持久化定时任务的入口函数
+    
+    Args:
+        only: 只检查这些公司名，为None时检查全部公司
+    """
+    if _daemon_monitor is not None:
+        _daemon_monitor.check_and_notify(only)
+
 
 class JobMonitorScheduler:
     """岗位监控调度器"""
     
     def __init__(self):
         """初始化调度器"""
-        self.settings = load_settings()
-        self.company_configs = load_company_configs()
-        self.email_config = load_email_config()
+        self.config_service = get_config_service()
+        self._apply_snapshot(self.config_service.snapshot())
         
-        self.spider = JobSpider(use_proxy=self.settings.get('spider', {}).get('use_proxy', False))
-        self.db = JobDatabase()
+        spider_settings = self.settings.get('spider', {})
+        retry_policy = RetryPolicy.from_settings(spider_settings)
+        self.spider = JobSpider(
+            use_proxy=spider_settings.get('use_proxy', False),
+            retry_policy=retry_policy,
+            fetcher=build_fetcher(spider_settings, retry_policy),
+            parse_pool=ParsePool.from_settings(spider_settings),
+            browser=BrowserManager.from_settings(self.settings.get('browser', {})),
+            body_limits=BodyLimits.from_settings(spider_settings),
+        )
+        self.db = JobDatabase(self.settings.get('database', {}).get('db_path', 'data/jobs.db'))
+        # 连续失败的公司熔断一段时间，不再每次检查都白白等待重试
+        self.breaker = CircuitBreaker.from_settings(self.db, spider_settings)
         self.notifier = EmailNotifier(self.email_config)
+        # 通知写入发件箱后由各渠道的后台线程发送，爬取不等待邮件服务器
+        self.outbox = Outbox(self.db, build_channels(self.settings.get('notify'), self.notifier))
+        self.subscriptions = SubscriptionIndex(load_subscribers(self.email_config))
+        self.planner = PriorityPlanner(self.db)
+        
+        # 多节点模式：通过共享的协调数据库分配公司
+        cluster_settings = self.settings.get('cluster', {})
+        self.cluster = None
+        if cluster_settings.get('enabled', False):
+            self.cluster = LeaseManager.from_settings(cluster_settings)
+            self.cluster.start_heartbeat()
         
         self.scheduler = BlockingScheduler(timezone='Asia/Shanghai')
+        
+        # 收到停止信号后置位：正在爬取的公司完成后不再开始新的公司
+        self._stop_event = threading.Event()
+        # 同一时间只执行一次检查
+        self._run_lock = threading.Lock()
+    
+    def _apply_snapshot(self, snapshot):
+        """使用配置快照更新调度器的配置"""
+        self.config_version = snapshot.version
+        self.settings = snapshot.settings
+        self.company_configs = list(snapshot.companies)
+        self.company_plans = [snapshot.plans[c['name']] for c in snapshot.companies]
+        self.email_config = snapshot.email
     
-    def monitor_single_company(self, company_config):
+    def reload_config(self):
+        """
+        检查配置文件是否变化，有变化则切换到新的配置快照
+        
+        Returns:
+            bool: 是否切换了配置
+        """
+        snapshot = self.config_service.snapshot()
+        if snapshot.version == self.config_version:
+            return False
+        
+        email_changed = snapshot.email != self.email_config
+        if email_changed:
+            self.notifier = EmailNotifier(snapshot.email)
+            self.subscriptions = SubscriptionIndex(load_subscribers(snapshot.email))
+        if email_changed or snapshot.settings.get('notify') != self.settings.get('notify'):
+            try:
+                self.outbox.set_channels(build_channels(snapshot.settings.get('notify'), self.notifier))
+            except ConfigError as e:
+                logger.error(f"通知渠道配置有误，继续使用原有渠道: {e}")
+        
+        old_spider_settings = self.settings.get('spider', {})
+        self._apply_snapshot(snapshot)
+        spider_settings = self.settings.get('spider', {})
+        parse_keys = ('parse_workers', 'parse_min_kb')
+        if any(spider_settings.get(k) != old_spider_settings.get(k) for k in parse_keys):
+            if self.spider.parse_pool is not None:
+                self.spider.parse_pool.close()
+            self.spider.parse_pool = ParsePool.from_settings(spider_settings)
+        self.spider.use_proxy = spider_settings.get('use_proxy', False)
+        self.spider.retry_policy = RetryPolicy.from_settings(spider_settings)
+        if any(spider_settings.get(k) != old_spider_settings.get(k) for k in FETCHER_SETTINGS):
+            if self.spider.fetcher is not None:
+                self.spider.fetcher.close()
+            self.spider.fetcher = build_fetcher(spider_settings, self.spider.retry_policy)
+        self.spider.body_limits = BodyLimits.from_settings(spider_settings)
+        self.breaker.configure(spider_settings)
+        self.spider.browser.configure(self.settings.get('browser', {}))
+        logger.info(f"已切换到新配置 (版本 {snapshot.version})，监控公司 {len(self.company_configs)} 个")
+        return True
+    
+    def monitor_single_company(self, plan, response=None):
         """
         监控单个公司
         
         Args:
-            company_config: 公司配置
+            plan: 编译后的公司爬取计划
+            response: 已并发抓取的页面响应（或异常），为None时由爬虫请求
         
         Returns:
             list: 新发现的岗位列表
         """
-        company_name = company_config['name']
+        company_name = plan.name
+        started = time.monotonic()
         
         try:
             # 爬取岗位
-            jobs = self.spider.scrape_company_jobs(company_config)
+            try:
+                jobs = self.spider.scrape_company_jobs(
+                    plan, raise_errors=True, response=response, known=self._known_jobs(plan)
+                )
+            except Exception as e:
+                self.breaker.record_failure(company_name, e, plan.url)
+                raise
+            self.breaker.record_success(company_name)
+            if self._filter_by_company_keywords():
+                jobs = plan.filter_jobs(jobs)
             
             new_jobs_found = []
+            duplicates = 0
+            near_duplicates = self._near_duplicate_index(company_name)
             for job in jobs:
-                is_new, job_hash = self.db.is_new_job(
-                    company_name,
-                    job['title'],
-                    job['url']
-                )
+                is_new, job_hash = self.db.is_new_job(company_name, job.title, job.url, plan.aliases)
                 
                 if is_new:
-                    if self.db.save_new_job(
+                    features = job_features(job.title)
+                    fingerprint = simhash(features)
+                    if near_duplicates is not None:
+                        duplicate = near_duplicates.find(features, job.location, fingerprint)
+                        if duplicate is not None:
+                            duplicates += 1
+                            logger.debug(f"{company_name} - {job.title} 与已有岗位 #{duplicate[0]} 近似"
+                                         f"（相似度 {duplicate[1]:.2f}），跳过")
+                            continue
+                    
+                    job_id = self.db.save_new_job(
                         company_name,
-                        job['title'],
-                        job['url'],
+                        job.title,
+                        job.url,
                         job_hash,
-                        job.get('location', ''),
-                        job.get('detail', '')
-                    ):
-                        new_jobs_found.append({
-                            'company': company_name,
-                            'company_url': company_config.get('url', ''),
-                            'title': job['title'],
-                            'url': job['url'],
-                            'location': job.get('location', ''),
-                            'detail': job.get('detail', ''),
-                            'found_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                        logger.info(f"新岗位: {company_name} - {job['title']}")
+                        job.location,
+                        job.detail,
+                        title_simhash=fingerprint
+                    )
+                    if job_id:
+                        if near_duplicates is not None:
+                            near_duplicates.add(features, job.location, fingerprint)
+                        # 爬取得到的岗位记录直接作为新岗位返回，不再复制
+                        job.id = job_id
+                        new_jobs_found.append(job)
+                        logger.info(f"新岗位: {company_name} - {job.title}")
+            
+            if duplicates:
+                logger.info(f"{company_name}: 跳过 {duplicates} 个近似重复的岗位")
             
             # 记录检查日志
             self.db.log_check(
                 company_name,
                 len(jobs),
                 len(new_jobs_found),
-                'success'
+                'success',
+                duration=time.monotonic() - started
             )
             
             return new_jobs_found
             
         except Exception as e:
             logger.error(f"❌ {company_name} 监控失败: {e}")
-            self.db.log_check(company_name, 0, 0, 'error', str(e))
+            self.db.log_check(company_name, 0, 0, 'error', str(e), duration=time.monotonic() - started)
             return []
     
-    def monitor_all_companies(self):
-        """监控所有配置的公司"""
-        log_separator(logger, "开始监控任务")
-        logger.info(f"待监控公司数量: {len(self.company_configs)}")
+    def _filter_by_company_keywords(self):
+        """
+        是否按公司的 keywords 过滤爬取结果
         
+        配置了 subscribers 时不过滤，全部岗位交给订阅者按各自的关键词分发，
+        否则一个人不需要的岗位会被所有人丢掉；只有一个收件人时与之前一样按公司关键词过滤
+        """
+        return self.settings.get('spider', {}).get('filter_by_keywords', True) \
+            and not self.email_config.get('subscribers')
+    
+    def _known_jobs(self, plan):
+        """返回判断一组岗位是否都已保存过的函数，爬虫据此提前停止翻页、滚动"""
+        if self._filter_by_company_keywords() and plan.matcher:
+            # 被关键词过滤掉的岗位不会保存，只检查匹配的岗位
+            return lambda jobs: self.db.all_jobs_known(plan.name, plan.filter_jobs(jobs), plan.aliases)
+        return lambda jobs: self.db.all_jobs_known(plan.name, jobs, plan.aliases)
+    
+    def _near_duplicate_index(self, company_name):
+        """
+        加载公司已有岗位的指纹索引，未启用近似去重时返回 None
+        
+        每次检查重新从数据库加载，多节点模式下也能看到其他节点保存的岗位
+        """
+        dedup_settings = self.settings.get('dedup', {})
+        if not dedup_settings.get('enabled', True):
+            return None
+        index = NearDuplicateIndex(
+            dedup_settings.get('max_distance', 3),
+            dedup_settings.get('min_similarity', 0.9)
+        )
+        for job_id, title, location, fingerprint in self.db.get_company_fingerprints(company_name):
+            index.add(job_features(title), location, fingerprint, job_id)
+        return index
+    
+    def _request_gap(self):
+        """相邻两个公司之间的平均等待时间（秒）"""
+        spider_settings = self.settings.get('spider', {})
+        return (spider_settings.get('request_delay_min', 2) + spider_settings.get('request_delay_max', 5)) / 2
+    
+    def _monitor_plans(self, plans, deadline=None):
+        """
+        依次监控一组公司
+        
+        Args:
+            plans: 公司爬取计划列表
+            deadline: 本次检查的截止时刻（time.monotonic()），超过后剩余公司顺延，
+                      配置了 deadline 的公司不受影响
+        
+        Returns:
+            list: 新发现的岗位列表
+        """
         all_new_jobs = []
+        spider_settings = self.settings.get('spider', {})
+        fetcher = self.spider.fetcher
+        tabs = self.spider.browser.tabs
+        prefetched = {}
         
-        for company_config in self.company_configs:
-            if not company_config.get('enabled', True):
-                logger.debug(f"跳过已禁用的公司: {company_config['name']}")
+        for index, plan in enumerate(plans):
+            if self._stop_event.is_set():
+                logger.info(f"收到停止信号，{plan.name} 等剩余公司留到下次启动后继续")
+                break
+            
+            if not plan.get('enabled', True):
+                logger.debug(f"跳过已禁用的公司: {plan.name}")
+                continue
+            
+            if deadline is not None and time.monotonic() > deadline and not plan.get('deadline'):
+                logger.info(f"时间预算已用完，{plan.name} 顺延到下次检查")
+                continue
+            
+            if not self.breaker.allow(plan.name, plan.url):
+                self._mark_company_done(plan.name)
                 continue
             
-            new_jobs = self.monitor_single_company(company_config)
+            response = prefetched.pop(plan.name, None)
+            if response is None and fetcher is not None and plan.static_fetch:
+                # 当前公司及其后的一批静态页面公司一起并发抓取，之后依次解析
+                batch = [plan] + [
+                    p for p in plans[index + 1:]
+                    if p.get('enabled', True) and p.static_fetch and not self.breaker.is_open(p.name, p.url)
+                ][:fetcher.concurrency - 1]
+                prefetched.update(self.spider.prefetch(batch))
+                response = prefetched.pop(plan.name, None)
+            elif response is None and tabs > 1 and not plan.static_fetch:
+                # 当前公司及其后的一批动态页面公司在多个标签页中并行渲染
+                batch = [plan] + [
+                    p for p in plans[index + 1:]
+                    if p.get('enabled', True) and not p.static_fetch and not self.breaker.is_open(p.name, p.url)
+                ][:tabs - 1]
+                if len(batch) > 1:
+                    prefetched.update(self.spider.render_batch(batch, self._known_jobs))
+                    response = prefetched.pop(plan.name, None)
+            
+            new_jobs = self.monitor_single_company(plan, response)
             all_new_jobs.extend(new_jobs)
+            self._mark_company_done(plan.name)
+            
+            if response is not None:
+                # 页面已并发抓取（同一网站的连接数有上限）或并行渲染，解析之间不再等待
+                continue
             
-            # 随机延迟，避免请求过快
-            spider_settings = self.settings.get('spider', {})
+            # 随机延迟，避免请求过快（收到停止信号时立即结束等待）
             delay = random.uniform(
                 spider_settings.get('request_delay_min', 2),
                 spider_settings.get('request_delay_max', 5)
             )
             logger.debug(f"等待 {delay:.1f} 秒...")
-            time.sleep(delay)
+            self._stop_event.wait(delay)
+        
+        return all_new_jobs
+    
+    def _ordered_plans(self, time_budget):
+        """按优先级排列本次要检查的公司"""
+        schedule_config = self.settings.get('schedule', {})
+        if not schedule_config.get('priority_enabled', True):
+            return list(self.company_plans)
+        
+        ordered, _ = self.planner.order(
+            self.company_plans,
+            time_budget=time_budget,
+            gap_seconds=self._request_gap()
+        )
+        return ordered
+    
+    def _mark_company_done(self, company_name):
+        """从本次运行的待检查列表中移除已完成的公司"""
+        progress = self.db.get_state('run_progress')
+        if progress and company_name in progress['pending']:
+            progress['pending'].remove(company_name)
+            self.db.set_state('run_progress', progress)
+    
+    def monitor_all_companies(self, only=None):
+        """
+        监控所有配置的公司（多节点模式下只监控本节点认领的公司）
+        
+        Args:
+            only: 只监控这些公司名，用于继续上次被中断的检查
+        """
+        log_separator(logger, "开始监控任务")
+        
+        max_run_minutes = self.settings.get('schedule', {}).get('max_run_minutes', 0)
+        time_budget = max_run_minutes * 60 if max_run_minutes else None
+        deadline = time.monotonic() + time_budget if time_budget else None
+        plans = self._ordered_plans(time_budget)
+        if only is not None:
+            plans = [plan for plan in plans if plan.name in only]
+        
+        # 记录本次的待检查列表，进程中途退出后重启可以继续
+        self.db.set_state('run_progress', {
+            'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'pending': [plan.name for plan in plans]
+        })
+        
+        # 本次检查内相同的页面、接口请求只抓取（渲染）一次
+        cache = self.spider.fetch_cache = FetchCache()
+        try:
+            if self.cluster is None:
+                logger.info(f"待监控公司数量: {len(plans)}")
+                all_new_jobs = self._monitor_plans(plans, deadline)
+            else:
+                plans_by_name = {plan.name: plan for plan in plans}
+                claimed = self.cluster.claim_companies(list(plans_by_name))
+                logger.info(f"待监控公司数量: {len(claimed)} (集群共 {len(plans_by_name)} 个)")
+                all_new_jobs = self._monitor_plans([plans_by_name[name] for name in claimed], deadline)
+                
+                # 接手失联节点遗留的公司
+                orphans = self.cluster.claim_orphans(list(plans_by_name), exclude=claimed)
+                all_new_jobs.extend(self._monitor_plans([plans_by_name[name] for name in orphans], deadline))
+        finally:
+            self.spider.fetch_cache = None
+        if cache.hits:
+            logger.info(f"抓取缓存: 请求 {cache.misses} 个页面，{cache.hits} 次复用已抓取的页面")
+        
+        if not self._stop_event.is_set():
+            self.db.set_state('run_progress', None)
         
         log_separator(logger, "监控任务完成")
         logger.info(f"本次共发现 {len(all_new_jobs)} 个新岗位")
         
         return all_new_jobs
     
-    def check_and_notify(self):
-        """检查新岗位并发送通知"""
-        log_separator(logger, "开始检查和通知")
+    def _enqueue_digest(self, subscriber, jobs, part=None):
+        """把一封岗位通知按渠道分别写入发件箱，各渠道独立发送和重试"""
+        subject, html_content, text_content = self.notifier.build_notification(jobs, part)
+        job_ids = [job.id for job in jobs]
+        payload = None
+        for channel in self.outbox.channels:
+            if channel.structured and payload is None:
+                payload = job_payload(jobs)
+            self.db.enqueue_notification(
+                subject,
+                html_content if channel.html else '',
+                job_ids,
+                recipient=subscriber.email,
+                body_text=text_content,
+                channel=channel.name,
+                payload=payload if channel.structured else None
+            )
+    
+    def notify_new_jobs(self):
+        """
+        把未通知的岗位按订阅者分发并写入发件箱，由后台线程发送
         
-        # 执行监控
-        self.monitor_all_companies()
+        岗位分页读取，每个订阅者的岗位按数量和大小拆分为多封邮件，
+        每封邮件按渠道分别写入发件箱，岗位的全部通知都发送成功后才标记为已通知；
+        上次放弃发送的通知只重新发送该订阅者、该渠道的那一条
+        """
+        if not self.subscriptions:
+            logger.warning("没有配置收件人，跳过通知")
+            return
         
-        # 获取未通知的新岗位
-        unnotified_jobs = self.db.get_unnotified_jobs()
+        requeued = self.db.requeue_failed_outbox()
+        if requeued:
+            logger.info(f"重新发送 {requeued} 条上次发送失败的通知")
+            self.outbox.wake()
         
-        if unnotified_jobs:
-            logger.info(f"有 {len(unnotified_jobs)} 个新岗位待通知")
+        # 订阅者名称 -> 正在累积的邮件 {'jobs', 'size', 'part'}
+        digests = {}
+        unmatched = []
+        total = 0
+        mails = 0
+        
+        for job in self.db.iter_unnotified_jobs():
+            total += 1
+            subscribers = self.subscriptions.route(job)
+            if not subscribers:
+                unmatched.append(job.id)
+                continue
             
-            # 发送邮件通知
-            if self.notifier.send_notification(unnotified_jobs):
-                # 标记为已通知
-                job_ids = [job['id'] for job in unnotified_jobs]
-                self.db.mark_jobs_as_notified(job_ids)
-        else:
+            job_bytes = self.notifier.estimate_job_bytes(job)
+            for subscriber in subscribers:
+                digest = digests.setdefault(subscriber.name, {'jobs': [], 'size': 0, 'part': 1})
+                if self.notifier.digest_full(len(digest['jobs']), digest['size'], job_bytes):
+                    # 后面还有岗位，当前邮件标注序号
+                    self._enqueue_digest(subscriber, digest['jobs'], digest['part'])
+                    mails += 1
+                    digest.update(jobs=[], size=0, part=digest['part'] + 1)
+                digest['jobs'].append(job)
+                digest['size'] += job_bytes
+        
+        if total == 0:
             logger.info("没有新岗位需要通知")
+            return
+        
+        for subscriber in self.subscriptions.subscribers:
+            digest = digests.get(subscriber.name)
+            if digest and digest['jobs']:
+                self._enqueue_digest(subscriber, digest['jobs'], digest['part'] if digest['part'] > 1 else None)
+                mails += 1
+        
+        if unmatched:
+            # 没有订阅者关注的岗位不再重复分发
+            self.db.mark_jobs_as_notified(unmatched)
+            logger.info(f"{len(unmatched)} 个新岗位没有匹配的订阅者")
+        
+        logger.info(f"有 {total} 个新岗位待通知，发给 {len(digests)} 个订阅者，共 {mails} 封邮件")
+        if mails:
+            self.outbox.wake()
+    
+    def check_and_notify(self, only=None):
+        """
+        检查新岗位并发送通知
+        
+        Args:
+            only: 只检查这些公司名，为None时检查全部公司
+        """
+        with self._run_lock:
+            if self._stop_event.is_set():
+                logger.info("系统正在停止，跳过本次检查")
+                return
+            self._check_and_notify(only)
+    
+    def _check_and_notify(self, only=None):
+        """检查新岗位并发送通知（调用方持有运行锁）"""
+        log_separator(logger, "开始检查和通知")
+        
+        # 配置文件修改后无需重启，下次执行时自动生效
+        self.reload_config()
+        
+        # 执行监控
+        self.monitor_all_companies(only)
+        
+        if self.cluster is None:
+            self.notify_new_jobs()
+        else:
+            # 通知租约保证同一时间只有一个节点读取并标记未通知岗位，每个岗位只通知一次
+            with self.cluster.lease(NOTIFY_RESOURCE, wait_seconds=60) as acquired:
+                if acquired:
+                    self.notify_new_jobs()
+                else:
+                    logger.warning("其他节点正在发送通知，本节点跳过，未通知的岗位将在下次发送")
         
         # 清理过期数据
         keep_days = self.settings.get('database', {}).get('keep_days', 30)
@@ -150,6 +518,11 @@ class JobMonitorScheduler:
         """立即执行一次检查"""
         logger.info("执行单次检查...")
         self.check_and_notify()
+        
+        # 单次检查在退出前发送完发件箱中的通知
+        if not self.outbox.flush():
+            logger.warning("部分通知未能发送，将在下次运行时重试")
+        self.spider.close()
     
     def start(self):
         """启动调度器"""
@@ -187,12 +560,134 @@ class JobMonitorScheduler:
         logger.info("按 Ctrl+C 停止系统")
         logger.info("-" * 60)
         
+        self.outbox.start()
+        
         try:
             self.scheduler.start()
         except KeyboardInterrupt:
             logger.info("收到中断信号，正在停止系统...")
+            self._stop_event.set()
             self.scheduler.shutdown()
+            self._release_resources()
             logger.info("系统已停止")
+    
+    def _check_time_jobs(self):
+        """
+        根据配置生成定时任务列表
+        
+        Returns:
+            dict: 任务ID -> (小时, 分钟)
+        """
+        check_times = self.settings.get('schedule', {}).get('check_times', [
+            {'hour': 13, 'minute': 0},
+            {'hour': 19, 'minute': 0}
+        ])
+        jobs = {}
+        for check_time in check_times:
+            hour = check_time.get('hour', 13)
+            minute = check_time.get('minute', 0)
+            jobs[f'check_job_{hour}_{minute}'] = (hour, minute)
+        return jobs
+    
+    def _sync_persistent_jobs(self, scheduler):
+        """
+        让任务存储中的定时任务与配置一致
+        
+        已存在且时间未变的任务原样保留（包括下次执行时间），
+        配置中删除的任务从存储中移除，新增的任务添加到存储
+        
+        Args:
+            scheduler: 已启动（暂停状态）的调度器
+        """
+        wanted = self._check_time_jobs()
+        existing = {job.id: job for job in scheduler.get_jobs()}
+        
+        for job_id, job in existing.items():
+            if job_id.startswith('check_job_') and job_id not in wanted:
+                scheduler.remove_job(job_id)
+                logger.info(f"🗑️  已移除配置中不存在的定时任务: {job.name}")
+        
+        for job_id, (hour, minute) in wanted.items():
+            if job_id in existing:
+                logger.info(f"📅 恢复定时任务: 每天 {hour:02d}:{minute:02d}，下次执行 {existing[job_id].next_run_time}")
+                continue
+            
+            scheduler.add_job(
+                'core.scheduler:scheduled_check',
+                trigger=CronTrigger(hour=hour, minute=minute),
+                id=job_id,
+                name=f'岗位检查任务 {hour:02d}:{minute:02d}',
+                replace_existing=True
+            )
+            logger.info(f"📅 已添加定时任务: 每天 {hour:02d}:{minute:02d} 执行检查")
+    
+    def request_stop(self, signum=None, frame=None):
+        """请求停止守护进程（可直接用作信号处理函数）"""
+        if not self._stop_event.is_set():
+            logger.info(f"收到停止信号{f' ({signum})' if signum else ''}，等待正在进行的爬取完成...")
+        self._stop_event.set()
+    
+    def _release_resources(self):
+        """释放浏览器、网络连接、发件箱线程和集群租约"""
+        self.outbox.stop()
+        self.spider.close()
+        if self.cluster:
+            self.cluster.stop()
+    
+    def start_daemon(self):
+        """
+        以守护进程模式运行
+        
+        - 定时任务保存在SQLite数据库中，重启后保留下次执行时间，错过的任务在宽限期内补跑
+        - 收到 SIGTERM/SIGINT 后不再开始新的公司，等当前公司完成并发送通知后退出
+        - 上次被中断的检查在启动后立即继续
+        - 浏览器和HTTP会话在多次检查之间复用
+        """
+        global _daemon_monitor
+        _daemon_monitor = self
+        
+        schedule_config = self.settings.get('schedule', {})
+        misfire_grace = schedule_config.get('misfire_grace_minutes', 60) * 60
+        
+        scheduler = BackgroundScheduler(
+            jobstores={'default': SQLAlchemyJobStore(url=f'sqlite:///{self.db.db_path.as_posix()}')},
+            job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': misfire_grace},
+            timezone='Asia/Shanghai'
+        )
+        
+        logger.info("=" * 60)
+        logger.info("🚀 以守护进程模式启动岗位监控系统")
+        logger.info("=" * 60)
+        
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        
+        # 先以暂停状态启动，同步完任务后再开始执行，避免旧任务在同步前触发
+        scheduler.start(paused=True)
+        self._sync_persistent_jobs(scheduler)
+        
+        progress = self.db.get_state('run_progress')
+        if progress and progress.get('pending'):
+            logger.info(f"继续上次中断的检查 ({progress['started_at']})，剩余 {len(progress['pending'])} 个公司")
+            scheduler.add_job(
+                'core.scheduler:scheduled_check',
+                kwargs={'only': progress['pending']},
+                id='resume_interrupted_run',
+                name='继续中断的检查',
+                replace_existing=True
+            )
+        
+        self.outbox.start()
+        scheduler.resume()
+        logger.info("系统正在运行，发送 SIGTERM 或按 Ctrl+C 停止")
+        
+        while not self._stop_event.is_set():
+            self._stop_event.wait(1)
+        
+        # 等待正在执行的检查结束
+        scheduler.shutdown(wait=True)
+        self._release_resources()
+        logger.info("系统已停止")
 
 
 def run_scheduler():
@@ -201,6 +696,12 @@ def run_scheduler():
     scheduler.start()
 
 
+def run_daemon():
+    """以守护进程模式运行的入口函数"""
+    scheduler = JobMonitorScheduler()
+    scheduler.start_daemon()
+
+
 def run_once():
     """执行一次检查的入口函数"""
     scheduler = JobMonitorScheduler()
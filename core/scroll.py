@@ -0,0 +1,106 @@
+"""
+滚动加载模块 - 抓取无限滚动、"加载更多"的动态列表
+
+有的招聘页面只渲染第一屏岗位，滚动到底部或点击"加载更多"后才追加后续岗位。
+公司配置 scroll 后，Selenium 打开页面后逐步滚动（或点击按钮），每一步只取新出现的岗位元素：
+浏览器中给已取过的元素打上标记，只把未标记元素的HTML传回来解析，不重复解析整个页面。
+
+以下情况停止滚动：
+- 等待 wait_seconds 后没有新的岗位元素出现（或"加载更多"按钮消失、被禁用）
+- 达到 max_steps 步或 max_items 个岗位元素
+- stop_when_known 为 true（默认）且新出现的岗位都已保存过
+
+配置示例（companies.yaml，需要 requires_selenium: true）：
+    scroll:
+      load_more: ".load-more"     # 可选，"加载更多"按钮的CSS选择器，不填时滚动到底部
+      max_steps: 20
+      wait_seconds: 3
+
+岗位元素在浏览器中用 job_selector 查找，滚动模式下 job_selector 需要是浏览器支持的CSS选择器
+（不能使用 :-soup-contains 等扩展语法）。
+"""
+
+from config import ConfigError
+from core.pagination import validate_section
+
+# scroll 配置字段: 字段名 -> (允许的类型, 是否必填)
+SCROLL_SCHEMA = {
+    'load_more': (str, False),
+    'max_steps': (int, False),
+    'max_items': (int, False),
+    'wait_seconds': (int, False),
+    'stop_when_known': (bool, False),
+}
+
+# 已取过的岗位元素的标记属性
+SEEN_ATTRIBUTE = 'data-jm-seen'
+
+# 取出未标记的岗位元素的HTML并打上标记
+COLLECT_SCRIPT = f"""
+const fresh = [];
+for (const el of document.querySelectorAll(arguments[0])) {{
+    if (!el.hasAttribute('{SEEN_ATTRIBUTE}')) {{
+        fresh.push(el.outerHTML);
+        el.setAttribute('{SEEN_ATTRIBUTE}', '');
+    }}
+}}
+return fresh;
+"""
+
+# 未标记的岗位元素数量
+PENDING_SCRIPT = f"""
+let count = 0;
+for (const el of document.querySelectorAll(arguments[0])) {{
+    if (!el.hasAttribute('{SEEN_ATTRIBUTE}')) count++;
+}}
+return count;
+"""
+
+# 滚动到最后一个岗位元素（列表在内部滚动容器中时也有效）和页面底部
+SCROLL_SCRIPT = """
+const items = document.querySelectorAll(arguments[0]);
+if (items.length) items[items.length - 1].scrollIntoView({block: 'end'});
+window.scrollTo(0, document.documentElement.scrollHeight);
+"""
+
+# 点击"加载更多"按钮，按钮不存在、不可见或被禁用时返回 false
+CLICK_SCRIPT = """
+const button = document.querySelector(arguments[0]);
+if (!button || button.disabled || button.offsetParent === null
+        || /disabled/.test(button.getAttribute('class') || '')) return false;
+button.scrollIntoView({block: 'center'});
+button.click();
+return true;
+"""
+
+
+class ScrollSpec:
+    """编译后的滚动加载配置"""
+
+    __slots__ = ('load_more', 'max_steps', 'max_items', 'wait_seconds', 'stop_when_known')
+
+    def __init__(self, company_name, config, requires_selenium=False):
+        """
+        校验并编译滚动加载配置
+
+        Args:
+            company_name: 公司名称
+            config: scroll 配置字典
+            requires_selenium: 公司是否使用Selenium爬取
+
+        Raises:
+            ConfigError: 配置不合法时抛出
+        """
+        validate_section(company_name, 'scroll', config, SCROLL_SCHEMA)
+        if not requires_selenium:
+            raise ConfigError(f"{company_name}: scroll 只能用于 requires_selenium 的公司")
+        self.load_more = config.get('load_more')
+        self.max_steps = config.get('max_steps', 20)
+        self.max_items = config.get('max_items')
+        self.wait_seconds = config.get('wait_seconds', 3)
+        self.stop_when_known = config.get('stop_when_known', True)
+
+        for field in ('max_steps', 'max_items', 'wait_seconds'):
+            value = getattr(self, field)
+            if value is not None and value < 1:
+                raise ConfigError(f"{company_name}: scroll.{field} 应大于0")
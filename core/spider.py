@@ -3,12 +3,22 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 import time
 import random
 import re
-from urllib.parse import urljoin, urlparse
-from utils.anti_crawl import get_random_headers, get_random_delay, get_random_proxy
+from concurrent.futures import Future
+from core.browser import BrowserManager
+from core.circuit import RetryPolicy, is_retryable
+from core.fetch_cache import FetchCache, render_key, request_key
+from core.fetcher import FetchRequest
+from core.models import JobRecord
+from core.parse_pool import parse_embedded, parse_page
+from core.plan import CompanyPlan, compile_company
+from core.response_body import BodyLimits, ResponseTooLarge, read_body, response_encoding
+from core.scroll import CLICK_SCRIPT, COLLECT_SCRIPT, PENDING_SCRIPT, SCROLL_SCRIPT
+from utils.anti_crawl import get_random_headers
+from utils.proxy_pool import PROXY_BLOCKED_STATUS, get_proxy_pool
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,66 +27,159 @@ logger = get_logger(__name__)
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 动态页面加载完成后等待脚本渲染的时间（秒），百度等页面加载较慢，等待更长时间
+RENDER_WAIT = 8
+
+
+class _Tab:
+    """并行渲染中的一个标签页"""
+    
+    __slots__ = ('plan', 'handle', 'render', 'opened_at', 'ready_at')
+    
+    def __init__(self, plan, handle, render=None):
+        self.plan = plan
+        self.handle = handle
+        # 抓取缓存中该页面渲染结果的 Future，渲染完成后写入页面源码供其他公司复用
+        self.render = render
+        self.opened_at = time.monotonic()
+        self.ready_at = None
+
 
 class JobSpider:
     """岗位爬虫类"""
     
-    def __init__(self, use_proxy=False):
+    def __init__(self, use_proxy=False, retry_policy=None, fetcher=None, parse_pool=None, browser=None,
+                 body_limits=None):
         """
         初始化爬虫
         
         Args:
             use_proxy: 是否使用代理
+            retry_policy: 请求重试策略，默认最多请求3次
+            fetcher: 异步抓取器（AsyncFetcher），为None时逐个用 requests 请求
+            parse_pool: 解析进程池（ParsePool），为None时在当前进程解析
+            browser: 浏览器管理器（BrowserManager），为None时使用默认配置
+            body_limits: 响应大小限制（BodyLimits），为None时使用默认限制
         """
         self.use_proxy = use_proxy
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.fetcher = fetcher
+        self.parse_pool = parse_pool
         self.session = requests.Session()
         self.session.headers.update(get_random_headers())
+        # 浏览器在多次爬取之间复用，不再每个公司启动一次
+        self.browser = browser or BrowserManager()
+        self.body_limits = body_limits or BodyLimits()
+        # 本次检查的抓取缓存（FetchCache），由调度器在每次检查开始时设置，为None时不缓存
+        self.fetch_cache = None
     
-    def _get_with_retry(self, url, max_retries=3, timeout=30):
+    def _get_with_retry(self, url, timeout=30):
         """
-        带重试的HTTP GET请求
+        带重试的HTTP GET请求，见 _request_with_retry
         
         Args:
             url: 请求URL
-            max_retries: 最大重试次数
             timeout: 超时时间
         
         Returns:
             requests.Response: 响应对象
         """
-        last_error = None
+        return self._request_with_retry(FetchRequest(url), timeout)
+    
+    def _request_with_retry(self, request, timeout=30):
+        """
+        带重试的HTTP请求，设置了 fetch_cache 时本次检查内相同的请求只发送一次
+        
+        Args:
+            request: FetchRequest
+            timeout: 超时时间
+        
+        Returns:
+            requests.Response: 响应对象
+        """
+        if self.fetch_cache is None:
+            return self._send_with_retry(request, timeout)
+        return self.fetch_cache.get(request_key(request), lambda: self._send_with_retry(request, timeout))
+    
+    def _send_with_retry(self, request, timeout=30):
+        """
+        发送HTTP请求，失败时重试
+        
+        按 retry_policy 重试超时、连接错误、429、5xx 等临时错误；
+        404 等永久错误立即抛出（使用代理时403/429可能只是代理被封，换代理重试）；
+        响应体以流的方式读取，超过 body_limits 时抛出 ResponseTooLarge（不重试）
+        
+        Args:
+            request: FetchRequest
+            timeout: 超时时间
+        
+        Returns:
+            requests.Response: 响应对象
+        
+        Raises:
+            requests.exceptions.RequestException: 请求最终失败时抛出最后一次的错误
+        """
+        url = request.url
+        policy = self.retry_policy
+        proxy_pool = get_proxy_pool() if self.use_proxy else None
+        attempt = 0
         
-        for attempt in range(max_retries):
+        while True:
+            attempt += 1
+            proxy = None
             try:
                 # 更新User-Agent
                 self.session.headers.update(get_random_headers())
                 
-                # 设置代理
+                # 从代理池选择代理
                 proxies = None
                 if self.use_proxy:
-                    proxy = get_random_proxy()
+                    proxy = proxy_pool.acquire(url)
                     if proxy:
                         proxies = {'http': f'http://{proxy}', 'https': f'http://{proxy}'}
                 
-                response = self.session.get(
-                    url,
-                    timeout=timeout,
-                    proxies=proxies,
-                    verify=False  # 忽略SSL验证
-                )
+                started = time.monotonic()
+                try:
+                    response = self.session.request(
+                        request.method,
+                        url,
+                        params=request.params,
+                        data=request.data,
+                        json=request.json,
+                        headers=request.headers,
+                        timeout=timeout,
+                        proxies=proxies,
+                        verify=False,  # 忽略SSL验证
+                        stream=True
+                    )
+                    read_body(response, self.body_limits)
+                except ResponseTooLarge:
+                    raise
+                except requests.exceptions.RequestException:
+                    if proxy:
+                        proxy_pool.report(proxy, False, url=url)
+                    raise
+                if proxy:
+                    # 被目标网站拒绝（403/429）也算作代理不可用
+                    proxy_pool.report(proxy, response.status_code not in PROXY_BLOCKED_STATUS,
+                                      time.monotonic() - started, url)
                 response.raise_for_status()
                 return response
                 
             except requests.exceptions.RequestException as e:
-                last_error = e
-                logger.warning(f"请求失败 (尝试 {attempt + 1}/{max_retries}): {e}")
+                retryable = is_retryable(e)
+                if proxy and isinstance(e, requests.exceptions.HTTPError) and \
+                        e.response is not None and e.response.status_code in PROXY_BLOCKED_STATUS:
+                    retryable = True
                 
-                if attempt < max_retries - 1:
-                    delay = get_random_delay(2, 5) * (attempt + 1)
-                    logger.debug(f"等待 {delay:.1f} 秒后重试...")
-                    time.sleep(delay)
-        
-        raise last_error
+                if not policy.should_retry(e, attempt, retryable):
+                    if not retryable:
+                        logger.warning(f"请求失败且不可重试: {e}")
+                    raise
+                
+                delay = policy.delay(attempt, e)
+                logger.warning(f"请求失败 (尝试 {attempt}/{policy.max_attempts}): {e}，{delay:.1f} 秒后重试")
+                time.sleep(delay)
     
     def scrape_static_page(self, url, job_selector, title_selector, url_selector, keywords=None):
         """
@@ -92,329 +195,602 @@ class JobSpider:
         Returns:
             list: 岗位列表
         """
+        plan = self._adhoc_plan(url, job_selector, title_selector, url_selector, keywords)
+        return plan.filter_jobs(self._scrape_static_plan(plan))
+    
+    @staticmethod
+    def _adhoc_plan(url, job_selector, title_selector, url_selector, keywords):
+        """根据零散的选择器参数编译临时爬取计划"""
+        return compile_company({
+            'name': url,
+            'url': url,
+            'job_selector': job_selector,
+            'title_selector': title_selector,
+            'url_selector': url_selector or 'a',
+            'keywords': list(keywords or []),
+        })
+    
+    def _scrape_static_plan(self, plan, raise_errors=False, response=None, known=None):
+        """
+        按编译后的计划爬取静态页面，配置了分页时继续爬取后续页面
+        
+        Args:
+            plan: CompanyPlan
+            raise_errors: 爬取失败时是否抛出异常，否则返回空列表
+            response: 已预先抓取的第一页响应（或抓取失败的异常、进程池的解析结果），为None时现在请求
+            known: 判断一组岗位是否都已保存过的函数，用于提前停止翻页
+        
+        Returns:
+            list: 岗位列表
+        """
+        url = plan.page_url(0)
         try:
-            response = self._get_with_retry(url)
-            response.encoding = response.apparent_encoding or 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.select(job_selector)
-            
-            logger.debug(f"找到 {len(job_elements)} 个岗位元素")
-            
-            jobs = []
-            for element in job_elements:
-                try:
-                    # 获取标题
-                    title_element = element.select_one(title_selector)
-                    if not title_element:
-                        # 尝试从元素本身获取文本
-                        title = element.get_text(strip=True)
-                    else:
-                        title = title_element.get_text(strip=True)
-                    
-                    if not title:
-                        continue
-                    
-                    # 获取链接
-                    url_element = element.select_one(url_selector)
-                    if url_element and url_element.get('href'):
-                        job_url = url_element['href']
-                    elif element.name == 'a' and element.get('href'):
-                        job_url = element['href']
-                    else:
-                        # 尝试从父元素或子元素找链接
-                        link = element.find('a', href=True)
-                        if link:
-                            job_url = link['href']
-                        else:
-                            job_url = url  # 使用页面URL作为后备
-                    
-                    # 处理相对URL
-                    if job_url.startswith('/'):
-                        job_url = urljoin(url, job_url)
-                    elif not job_url.startswith('http'):
-                        job_url = urljoin(url, job_url)
-                    
-                    # 关键词过滤
-                    if keywords:
-                        if not self._match_keywords(title, keywords):
-                            continue
-                    
-                    jobs.append({
-                        'title': title.strip(),
-                        'url': job_url.strip()
-                    })
-                    
-                except Exception as e:
-                    logger.debug(f"解析岗位元素失败: {e}")
-                    continue
+            if response is None:
+                response = self._get_with_retry(url)
+            elif isinstance(response, BaseException):
+                raise response
             
-            return jobs
+            if isinstance(response, Future):
+                rows, count = response.result()
+            else:
+                rows, count = parse_page(plan, response.content, url, encoding=response_encoding(response))
             
         except Exception as e:
             logger.error(f"爬取页面失败: {url}, 错误: {e}")
+            if raise_errors:
+                raise
             return []
+        
+        if plan.pages is None:
+            return plan.records(rows)
+        
+        if plan.pages.concurrent and self.fetcher is not None and not plan.pages.is_last_page(count):
+            # 剩余页面一次并发请求，都已取得，不再按 known 提前停止
+            urls = [plan.page_url(index) for index in range(1, plan.pages.max_pages)]
+            results = self._fetch_many(urls)
+            
+            def load_page(index):
+                result = results[index - 1]
+                if isinstance(result, BaseException):
+                    raise result
+                return parse_page(plan, result.content, urls[index - 1], encoding=response_encoding(result))
+            
+            return plan.records(self._follow_pages(plan, rows, count, None, load_page))
+        
+        def load_page(index):
+            time.sleep(random.uniform(0.5, 1.5))
+            page_url = plan.page_url(index)
+            response = self._get_with_retry(page_url)
+            return parse_page(plan, response.content, page_url, encoding=response_encoding(response))
+        
+        return plan.records(self._follow_pages(plan, rows, count, known, load_page))
     
-    def scrape_dynamic_page(self, url, job_selector, title_selector, url_selector, keywords=None):
+    def _fetch_many(self, requests_):
         """
-        爬取动态页面（使用Selenium）
-        注意：这需要安装Selenium和ChromeDriver
+        用异步抓取器并发抓取一组请求，相同的请求只抓取一次
+        
+        设置了 fetch_cache 时复用本次检查中已抓取的结果，新抓取的结果写入缓存
+        
+        Args:
+            requests_: URL字符串或 FetchRequest 的列表
         
-        如果没有安装Selenium，将尝试使用静态方法爬取
+        Returns:
+            list: 与请求顺序一致的结果，成功为响应，失败为异常对象
         """
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
+        cache = self.fetch_cache if self.fetch_cache is not None else FetchCache()
+        claims = [cache.claim(request_key(request)) for request in requests_]
+        owned = [(future, request) for (future, owner), request in zip(claims, requests_) if owner]
+        if owned:
+            for (future, _), result in zip(owned, self.fetcher.fetch_all([request for _, request in owned])):
+                cache.resolve(future, result)
+        return [cache.outcome(future) for future, _ in claims]
+    
+    def _follow_pages(self, plan, rows, count, known, load_page):
+        """
+        从第二页开始依次爬取分页，遇到最后一页、重复页面或已保存过的岗位时停止
+        
+        后续页面失败时只记录警告，保留已取得的岗位
+        
+        Args:
+            plan: 配置了分页的 CompanyPlan
+            rows: 第一页的 (标题, 链接, 地点, 详情) 元组列表
+            count: 第一页的岗位元素数量
+            known: 判断一组岗位是否都已保存过的函数，为None时不检查
+            load_page: 爬取第 index 页（从0开始）的函数，返回 (元组列表, 岗位元素数量)
+        
+        Returns:
+            list: 全部页面的 (标题, 链接, 地点, 详情) 元组列表
+        """
+        pages = plan.pages
+        collected = list(rows)
+        for index in range(1, pages.max_pages):
+            if pages.is_last_page(count):
+                break
+            if pages.stop_when_known and known is not None and rows and known(plan.records(rows)):
+                logger.info(f"{plan.name}: 第 {index} 页的岗位都已保存过，停止翻页")
+                break
             
             try:
-                from webdriver_manager.chrome import ChromeDriverManager
-                use_webdriver_manager = True
-            except ImportError:
-                use_webdriver_manager = False
+                page_rows, count = load_page(index)
+            except Exception as e:
+                logger.warning(f"{plan.name}: 第 {index + 1} 页爬取失败，只使用前 {index} 页的岗位: {e}")
+                break
+            if page_rows and page_rows == rows:
+                # 页码超出范围时有的网站返回最后一页
+                logger.debug(f"{plan.name}: 第 {index + 1} 页与上一页相同，停止翻页")
+                break
             
-            # 配置Chrome选项
-            options = Options()
-            options.add_argument('--headless')  # 无头模式
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument(f'user-agent={get_random_headers()["User-Agent"]}')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            driver = None
-            try:
-                if use_webdriver_manager:
-                    service = Service(ChromeDriverManager().install())
-                    driver = webdriver.Chrome(service=service, options=options)
-                else:
-                    driver = webdriver.Chrome(options=options)
-                
-                logger.info(f"使用Selenium访问: {url}")
-                driver.get(url)
-                
-                # 等待页面加载
-                time.sleep(random.uniform(3, 5))
-                
-                # 获取页面源码
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                job_elements = soup.select(job_selector)
-                
-                logger.debug(f"找到 {len(job_elements)} 个岗位元素")
-                
-                jobs = []
-                for element in job_elements:
-                    try:
-                        title_element = element.select_one(title_selector)
-                        title = title_element.get_text(strip=True) if title_element else element.get_text(strip=True)
-                        
-                        if not title:
-                            continue
-                        
-                        url_element = element.select_one(url_selector)
-                        if url_element and url_element.get('href'):
-                            job_url = url_element['href']
-                        elif element.name == 'a' and element.get('href'):
-                            job_url = element['href']
-                        else:
-                            link = element.find('a', href=True)
-                            job_url = link['href'] if link else url
-                        
-                        if job_url.startswith('/'):
-                            job_url = urljoin(url, job_url)
-                        elif not job_url.startswith('http'):
-                            job_url = urljoin(url, job_url)
-                        
-                        if keywords and not self._match_keywords(title, keywords):
-                            continue
-                        
-                        jobs.append({
-                            'title': title.strip(),
-                            'url': job_url.strip()
-                        })
-                        
-                    except Exception as e:
-                        logger.debug(f"解析动态页面岗位元素失败: {e}")
-                        continue
-                
-                return jobs
-                
-            finally:
-                if driver:
-                    driver.quit()
-                    
-        except ImportError:
-            logger.warning("Selenium未安装，尝试使用静态方法爬取...")
-            return self.scrape_static_page(url, job_selector, title_selector, url_selector, keywords)
-        except Exception as e:
-            logger.error(f"Selenium爬取失败: {e}，尝试使用静态方法...")
-            return self.scrape_static_page(url, job_selector, title_selector, url_selector, keywords)
+            rows = page_rows
+            collected.extend(rows)
+            logger.debug(f"{plan.name}: 第 {index + 1} 页 {count} 个岗位元素")
+        return collected
     
-    def _match_keywords(self, title, keywords):
+    def prefetch(self, plans):
         """
-        检查标题是否包含关键词
+        使用异步抓取器并发请求一组公司的静态页面（接口类型的公司请求第一页）
+        
+        配置了解析进程池时，较大的页面立即提交到进程池，与其他页面的解析并行
         
         Args:
-            title: 岗位标题
-            keywords: 关键词列表
+            plans: CompanyPlan 列表，只能用Selenium爬取的公司会被跳过
         
         Returns:
-            bool: 是否匹配
+            dict: 公司名称 -> 响应、异常或解析结果（Future），未配置异步抓取器时为空字典
         """
-        if not keywords:
-            return True
+        if self.fetcher is None:
+            return {}
+        static_plans = [plan for plan in plans if plan.static_fetch]
+        if not static_plans:
+            return {}
+        
+        started = time.monotonic()
+        results = self._fetch_many([
+            plan.api.request() if plan.type == 'api' else plan.page_url(0) for plan in static_plans
+        ])
+        failed = sum(isinstance(result, BaseException) for result in results)
+        logger.info(f"并发抓取 {len(static_plans)} 个页面，耗时 {time.monotonic() - started:.1f} 秒"
+                    + (f"，失败 {failed} 个" if failed else ""))
         
-        title_lower = title.lower()
-        return any(kw.lower() in title_lower for kw in keywords)
+        pages = {}
+        for plan, result in zip(static_plans, results):
+            if self.parse_pool is not None and plan.type == 'html' and not isinstance(result, BaseException) \
+                    and self.parse_pool.offload(result.content):
+                result = self.parse_pool.submit(plan, result.content, plan.page_url(0),
+                                                encoding=response_encoding(result))
+            pages[plan.name] = result
+        return pages
     
-    def scrape_company_jobs(self, company_config):
+    def scrape_company_jobs(self, company, raise_errors=False, response=None, known=None):
         """
         爬取指定公司的岗位
         
         Args:
-            company_config: 公司配置字典
+            company: 编译后的 CompanyPlan，也可以是公司配置字典
+            raise_errors: 爬取失败时是否抛出异常（调度器据此记录失败、触发熔断），
+                          否则返回空列表
+            response: 静态页面（或接口第一页）已预先抓取的响应（或异常），见 prefetch；
+                      动态页面为已并行渲染的岗位列表（或异常），见 render_batch
+            known: 判断一组岗位是否都已保存过的函数，分页时某一页的岗位都已保存过则停止翻页
         
         Returns:
             list: 岗位列表
         """
-        company_name = company_config['name']
-        url = company_config['url']
-        keywords = company_config.get('keywords', [])
+        plan = company if isinstance(company, CompanyPlan) else compile_company(company)
+        company_name = plan.name
         
         logger.info(f"开始爬取 {company_name} 的岗位...")
         
         try:
-            if company_config.get('requires_selenium', False):
-                jobs = self._scrape_with_selenium(url, company_config)
+            if plan.type == 'api':
+                jobs = self._scrape_api_plan(plan, raise_errors, response, known)
+            elif plan.embedded is not None:
+                jobs = self._scrape_embedded_plan(plan, raise_errors, response, known)
+            elif plan.requires_selenium:
+                if isinstance(response, BaseException):
+                    raise response
+                # 已在标签页中并行渲染过的直接使用结果，见 render_batch
+                jobs = response if response is not None else self._scrape_with_selenium(plan, raise_errors, known)
             else:
-                jobs = self.scrape_static_page(
-                    url,
-                    company_config['job_selector'],
-                    company_config['title_selector'],
-                    company_config.get('url_selector', 'a'),
-                    keywords
-                )
+                jobs = self._scrape_static_plan(plan, raise_errors, response, known)
             
             logger.info(f"{company_name} 爬取完成，找到 {len(jobs)} 个岗位")
             return jobs
             
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"{company_name} 爬取失败: {e}")
             return []
     
-    def _scrape_with_selenium(self, url, config):
-        """使用Selenium爬取动态页面"""
+    def _scrape_api_plan(self, plan, raise_errors=False, response=None, known=None):
+        """
+        请求JSON接口获取岗位（type 为 api），按分页配置依次请求后续页面
+        
+        Args:
+            plan: CompanyPlan
+            raise_errors: 爬取失败时是否抛出异常，否则返回空列表
+            response: 已预先抓取的第一页响应（或异常），为None时现在请求
+            known: 判断一组岗位是否都已保存过的函数，用于提前停止翻页
+        
+        Returns:
+            list: 岗位列表
+        """
+        api = plan.api
+        rows = []
         try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            import os
-            
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument(f'user-agent={get_random_headers()["User-Agent"]}')
-            options.add_argument('--disable-blink-features=AutomationControlled')
+            page_index = 0
+            while True:
+                if page_index == 0 and response is not None:
+                    if isinstance(response, BaseException):
+                        raise response
+                    page = response
+                else:
+                    page = self._request_with_retry(api.request(page_index))
+                
+                data = page.json()
+                page_rows, item_count = plan.extract_api_page(data)
+                rows.extend(page_rows)
+                logger.debug(f"{plan.name}: 第 {page_index + 1} 页 {item_count} 个岗位")
+                if api.is_last_page(data, page_index, item_count):
+                    break
+                if api.stop_when_known and known is not None and page_rows and known(plan.records(page_rows)):
+                    logger.info(f"{plan.name}: 第 {page_index + 1} 页的岗位都已保存过，停止翻页")
+                    break
+                page_index += 1
             
-            # 查找Chrome可执行文件路径
-            chrome_paths = [
-                r"C:\Users\a1830\AppData\Local\GptChrome\GptBrowser.exe",
-                r"C:\Users\a1830\AppData\Local\GptChrome\Application\chrome.exe",
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            ]
+            return plan.records(rows)
             
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    options.binary_location = path
-                    logger.info(f"使用Chrome: {path}")
-                    break
+        except Exception as e:
+            if rows:
+                # 后续页面失败时保留已取得的岗位
+                logger.warning(f"{plan.name}: 第 {page_index + 1} 页请求失败，只使用前 {page_index} 页的岗位: {e}")
+                return plan.records(rows)
+            logger.error(f"接口请求失败: {api.url}, 错误: {e}")
+            if raise_errors:
+                raise
+            return []
+    
+    def _scrape_embedded_plan(self, plan, raise_errors=False, response=None, known=None):
+        """
+        从静态页面内嵌的JSON数据中提取岗位（配置了 embedded_state）
+        
+        页面请求失败或找不到内嵌数据时，需要Selenium的公司改用Selenium爬取，
+        其他公司改用CSS选择器解析。内嵌数据只取第一页，分页配置只在回退时使用
+        
+        Args:
+            plan: CompanyPlan
+            raise_errors: 爬取失败时是否抛出异常，否则返回空列表
+            response: 已预先抓取的响应（或异常、进程池的解析结果），为None时现在请求
+            known: 判断一组岗位是否都已保存过的函数，回退时用于提前停止翻页
+        
+        Returns:
+            list: 岗位列表
+        """
+        url = plan.page_url(0)
+        try:
+            if response is None:
+                response = self._get_with_retry(url)
+            elif isinstance(response, BaseException):
+                raise response
             
-            driver = None
-            try:
-                # 使用 webdriver_manager 自动下载匹配版本的 ChromeDriver
-                try:
-                    from webdriver_manager.chrome import ChromeDriverManager
-                    from webdriver_manager.core.driver_cache import DriverCacheManager
-                    # 清除缓存，强制下载新版本
-                    service = Service(ChromeDriverManager(driver_version="128.0.6613.137").install())
-                    driver = webdriver.Chrome(service=service, options=options)
-                except Exception as e:
-                    logger.warning(f"webdriver_manager失败: {e}, 尝试直接启动...")
-                    driver = webdriver.Chrome(options=options)
-                
+            if isinstance(response, Future):
+                rows = response.result()
+                response = None
+            else:
+                rows = parse_embedded(plan, response.content, url, response_encoding(response))
+            if rows is not None:
+                logger.debug(f"{plan.name}: 从内嵌数据中提取到 {len(rows)} 个岗位")
+                return plan.records(rows)
+            logger.info(f"{plan.name}: 页面中没有找到内嵌数据")
+        except Exception as e:
+            if not plan.requires_selenium:
+                logger.error(f"爬取页面失败: {url}, 错误: {e}")
+                if raise_errors:
+                    raise
+                return []
+            logger.warning(f"{plan.name}: 获取内嵌数据失败: {e}")
+            response = None
+        
+        if plan.requires_selenium:
+            logger.info(f"{plan.name}: 改用Selenium爬取")
+            return self._scrape_with_selenium(plan, raise_errors, known)
+        # 已下载的页面直接用CSS选择器解析，不再重复请求
+        return self._scrape_static_plan(plan, raise_errors, response, known)
+    
+    def _scrape_with_selenium(self, plan, raise_errors=False, known=None):
+        """使用Selenium爬取动态页面，raise_errors 为True时失败抛出异常，known 同 _scrape_static_plan"""
+        url = plan.page_url(0)
+        try:
+            if self.fetch_cache is not None and self._shares_render(plan):
+                # 只需要页面源码的公司复用本次检查中同一页面的渲染结果
+                page_source = self.fetch_cache.get(render_key(url), lambda: self._render(url))
+                return self._extract_rendered(None, plan, known, page_source)
+            with self.browser.page() as driver:
                 logger.info(f"Selenium访问: {url}")
                 driver.get(url)
-                time.sleep(8)  # 百度等页面加载较慢，等待更长时间
-                
-                # 保存页面用于调试
-                page_source = driver.page_source
-                debug_file = "debug_page.html"
-                with open(debug_file, 'w', encoding='utf-8') as f:
-                    f.write(page_source)
-                logger.info(f"页面已保存到 {debug_file} 用于调试")
-                
-                soup = BeautifulSoup(page_source, 'html.parser')
-                job_elements = soup.select(config['job_selector'])
-                
-                logger.info(f"找到 {len(job_elements)} 个岗位元素")
-                
-                jobs = []
-                for element in job_elements:
-                    try:
-                        # 获取标题
-                        title_el = element.select_one(config['title_selector'])
-                        title = title_el.get_text(strip=True) if title_el else ""
-                        if not title:
-                            continue
-                        
-                        # 获取地点
-                        location = ""
-                        if config.get('location_selector'):
-                            loc_el = element.select_one(config['location_selector'])
-                            location = loc_el.get_text(strip=True) if loc_el else ""
-                        
-                        # 获取详情（部门等）
-                        detail = ""
-                        if config.get('detail_selector'):
-                            detail_el = element.select_one(config['detail_selector'])
-                            detail = detail_el.get_text(strip=True) if detail_el else ""
-                        
-                        # 关键词过滤（空列表不过滤）
-                        keywords = config.get('keywords', [])
-                        if keywords and not self._match_keywords(title, keywords):
-                            continue
-                        
-                        jobs.append({
-                            'title': title,
-                            'url': url,  # 直接用列表页URL
-                            'location': location,
-                            'detail': detail
-                        })
-                        
-                    except Exception as e:
-                        logger.debug(f"解析岗位失败: {e}")
-                        continue
-                
-                return jobs
-                
-            finally:
-                if driver:
-                    driver.quit()
+                time.sleep(RENDER_WAIT)
+                return self._extract_rendered(driver, plan, known)
                     
         except ImportError:
             logger.error("Selenium未安装，请运行: pip install selenium webdriver-manager")
+            if raise_errors:
+                raise
             return []
         except Exception as e:
             logger.error(f"Selenium爬取失败: {e}")
+            if raise_errors:
+                raise
             return []
+    
+    def _render(self, url):
+        """在浏览器中打开页面并等待渲染，返回页面源码"""
+        with self.browser.page() as driver:
+            logger.info(f"Selenium访问: {url}")
+            driver.get(url)
+            time.sleep(RENDER_WAIT)
+            return driver.page_source
+    
+    @staticmethod
+    def _shares_render(plan):
+        """公司是否只需要渲染后的页面源码（不需要在浏览器中继续滚动、翻页），可以与其他公司共用渲染结果"""
+        return plan.scroll is None and plan.pages is None
+    
+    def _extract_rendered(self, driver, plan, known=None, page_source=None, deadline=None):
+        """
+        从浏览器当前标签页中已渲染完成的列表页提取岗位（包括滚动加载和翻页）
+        
+        Args:
+            driver: 已打开公司列表页的浏览器，传入 page_source 且不需要滚动、翻页时可以为None
+            plan: CompanyPlan
+            known: 同 _scrape_static_plan
+            page_source: 已渲染的页面源码，为None时从浏览器读取
+            deadline: 滚动加载的截止时间（time.monotonic()），为None时不限制
+        
+        Returns:
+            list: 岗位列表
+        """
+        url = plan.page_url(0)
+        if page_source is None:
+            page_source = driver.page_source
+        logger.debug(f"{plan.name}: 渲染后页面 {len(page_source)} 个字符")
+        
+        rows = None
+        if plan.scroll is not None:
+            rows = self._scroll_capture(driver, plan, url, known, deadline)
+        if rows is None:
+            soup = BeautifulSoup(page_source, 'html.parser')
+            # 动态页面直接使用列表页URL作为岗位链接
+            rows, count = plan.extract_page(soup, url, follow_links=False)
+        if plan.pages is not None:
+            rows = self._follow_pages(plan, rows, count, known,
+                                      lambda index: self._selenium_page(driver, plan, index))
+        jobs = plan.records(rows)
+        logger.info(f"{plan.name}: 解析得到 {len(jobs)} 个岗位")
+        return jobs
+    
+    def render_batch(self, plans, known_for=None):
+        """
+        在同一个浏览器的多个标签页中并行加载、渲染一组动态页面公司
+        
+        每个公司占用一个标签页，所有标签页同时加载；某个标签页加载完成并等待渲染后
+        提取岗位并关闭。超过 tab_timeout 仍未加载完成的标签页记为超时失败。
+        需要在浏览器中滚动、翻页的公司会占用浏览器较长时间，等其他标签页都提取完成后再处理，
+        滚动加载最多持续 tab_timeout
+        设置了 fetch_cache 时，页面相同的公司只打开一个标签页，共用渲染结果
+        
+        Args:
+            plans: CompanyPlan 列表，可以先用普通HTTP请求的公司会被跳过
+            known_for: 根据公司返回 known 函数（见 _scrape_static_plan），为None时不提前停止
+        
+        Returns:
+            dict: 公司名称 -> 岗位列表或异常，传给 scrape_company_jobs 的 response
+        """
+        plans = [plan for plan in plans if not plan.static_fetch]
+        if not plans:
+            return {}
+        
+        started = time.monotonic()
+        results = {}
+        # 与其他公司共用渲染结果的公司 -> 渲染结果的 Future
+        shared = {}
+        tabs = []
+        try:
+            with self.browser.page() as driver:
+                home = driver.current_window_handle
+                for plan in plans:
+                    render = None
+                    if self.fetch_cache is not None and self._shares_render(plan):
+                        render, owner = self.fetch_cache.claim(render_key(plan.page_url(0)))
+                        if not owner:
+                            shared[plan] = render
+                            continue
+                    logger.info(f"Selenium在新标签页访问: {plan.page_url(0)}")
+                    # 先登记再打开标签页，打开失败时也能设置渲染结果
+                    tabs.append(_Tab(plan, None, render))
+                    tabs[-1].handle = self.browser.open_tab(driver, plan.page_url(0))
+                
+                pending = list(tabs)
+                while pending:
+                    # 还有只需要页面源码的标签页没有提取时，先不处理需要滚动、翻页的标签页
+                    defer = any(self._shares_render(tab.plan) for tab in pending)
+                    for tab in list(pending):
+                        try:
+                            jobs = self._poll_tab(driver, tab, known_for, defer)
+                        except Exception as e:
+                            logger.error(f"{tab.plan.name}: 标签页渲染失败: {e}")
+                            jobs = e
+                            if tab.render is not None and not tab.render.done():
+                                FetchCache.resolve(tab.render, e)
+                        if jobs is None:
+                            continue
+                        results[tab.plan.name] = jobs
+                        pending.remove(tab)
+                        self.browser.close_tab(driver, tab.handle, home)
+                    if pending:
+                        time.sleep(0.3)
+        except Exception as e:
+            if isinstance(e, ImportError):
+                logger.error("Selenium未安装，请运行: pip install selenium webdriver-manager")
+            else:
+                logger.error(f"Selenium并行渲染失败: {e}")
+            for tab in tabs:
+                results.setdefault(tab.plan.name, e)
+                # 没有完成的渲染也要设置结果，否则共用该页面的公司会一直等待
+                if tab.render is not None and not tab.render.done():
+                    FetchCache.resolve(tab.render, e)
+        
+        for plan, render in shared.items():
+            page_source = FetchCache.outcome(render)
+            if isinstance(page_source, BaseException):
+                results[plan.name] = page_source
+                continue
+            known = known_for(plan) if known_for is not None else None
+            try:
+                results[plan.name] = self._extract_rendered(None, plan, known, page_source)
+            except Exception as e:
+                results[plan.name] = e
+        
+        logger.info(f"{len(tabs)} 个标签页并行渲染 {len(plans)} 个公司，耗时 {time.monotonic() - started:.1f} 秒")
+        return results
+    
+    def _poll_tab(self, driver, tab, known_for, defer=False):
+        """
+        检查标签页的加载状态，渲染完成时提取岗位
+        
+        Args:
+            driver: 浏览器
+            tab: _Tab
+            known_for: 同 render_batch
+            defer: 是否暂缓处理需要滚动、翻页的标签页
+        
+        Returns:
+            list: 岗位列表，仍在加载、等待渲染或暂缓处理时返回 None
+        
+        Raises:
+            TimeoutError: 超过 tab_timeout 仍未加载完成
+        """
+        driver.switch_to.window(tab.handle)
+        now = time.monotonic()
+        if tab.ready_at is None:
+            if driver.execute_script('return document.readyState') == 'complete':
+                tab.ready_at = now
+            elif now - tab.opened_at > self.browser.tab_timeout:
+                raise TimeoutError(f"页面 {self.browser.tab_timeout} 秒内没有加载完成")
+            return None
+        if now - tab.ready_at < RENDER_WAIT:
+            return None
+        if defer and not self._shares_render(tab.plan):
+            return None
+        known = known_for(tab.plan) if known_for is not None else None
+        page_source = None
+        if tab.render is not None:
+            page_source = driver.page_source
+            FetchCache.resolve(tab.render, page_source)
+        return self._extract_rendered(driver, tab.plan, known, page_source,
+                                      time.monotonic() + self.browser.tab_timeout)
+    
+    def _scroll_capture(self, driver, plan, page_url, known=None, deadline=None):
+        """
+        逐步滚动（或点击"加载更多"）并只解析每一步新出现的岗位元素，见 core.scroll
+        
+        Args:
+            driver: 已打开列表页的浏览器
+            plan: 配置了 scroll 的 CompanyPlan
+            page_url: 列表页URL，作为岗位链接
+            known: 判断一组岗位是否都已保存过的函数，为None时不检查
+            deadline: 截止时间（time.monotonic()），到达后停止滚动，为None时不限制
+        
+        Returns:
+            list: (标题, 链接, 地点, 详情) 元组列表；浏览器无法执行 job_selector 时返回 None
+        """
+        scroll = plan.scroll
+        selector = plan.config['job_selector']
+        try:
+            fresh = driver.execute_script(COLLECT_SCRIPT, selector)
+        except Exception as e:
+            logger.warning(f"{plan.name}: 浏览器中无法使用 job_selector，改为解析整个页面: {e}")
+            return None
+        
+        rows = []
+        items = 0
+        for step in range(scroll.max_steps + 1):
+            if step and deadline is not None and time.monotonic() >= deadline:
+                logger.warning(f"{plan.name}: 滚动加载超过 {self.browser.tab_timeout} 秒，停止滚动")
+                break
+            if step:
+                if scroll.load_more:
+                    if not driver.execute_script(CLICK_SCRIPT, scroll.load_more):
+                        logger.debug(f"{plan.name}: 没有可点击的加载更多按钮，停止滚动")
+                        break
+                else:
+                    driver.execute_script(SCROLL_SCRIPT, selector)
+                if not self._wait_for_items(driver, selector, scroll.wait_seconds):
+                    logger.debug(f"{plan.name}: 第 {step} 次滚动后没有新的岗位，停止滚动")
+                    break
+                fresh = driver.execute_script(COLLECT_SCRIPT, selector)
+            
+            # 只解析新出现的元素
+            fragment = BeautifulSoup(''.join(fresh), 'html.parser')
+            elements = [child for child in fragment.children if isinstance(child, Tag)]
+            step_rows = plan.extract_elements(elements, page_url, follow_links=False)
+            rows.extend(step_rows)
+            items += len(elements)
+            logger.debug(f"{plan.name}: 第 {step} 次滚动新增 {len(elements)} 个岗位元素")
+            
+            if scroll.max_items and items >= scroll.max_items:
+                logger.debug(f"{plan.name}: 已取得 {items} 个岗位元素，停止滚动")
+                break
+            if scroll.stop_when_known and known is not None and step_rows and known(plan.records(step_rows)):
+                logger.info(f"{plan.name}: 新加载的岗位都已保存过，停止滚动")
+                break
+        return rows
+    
+    @staticmethod
+    def _wait_for_items(driver, selector, timeout):
+        """等待页面出现未取过的岗位元素，超时返回False"""
+        deadline = time.monotonic() + timeout
+        while True:
+            if driver.execute_script(PENDING_SCRIPT, selector):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.3)
+    
+    @staticmethod
+    def _selenium_page(driver, plan, index):
+        """
+        在浏览器中翻到第 index 页（从0开始）并解析
+        
+        Returns:
+            tuple: ((标题, 链接, 地点, 详情) 元组列表, 岗位元素数量)；没有"下一页"按钮时元素数量为0
+        """
+        pages = plan.pages
+        page_url = pages.page_url(index)
+        if page_url:
+            driver.get(page_url)
+        else:
+            from selenium.webdriver.common.by import By
+            buttons = driver.find_elements(By.CSS_SELECTOR, pages.next_selector)
+            button = buttons[0] if buttons else None
+            if button is None or not button.is_enabled() or button.get_attribute('disabled') is not None \
+                    or 'disabled' in (button.get_attribute('class') or ''):
+                logger.debug(f"{plan.name}: 没有可点击的下一页按钮，停止翻页")
+                return [], 0
+            driver.execute_script("arguments[0].click();", button)
+            page_url = driver.current_url
+        time.sleep(3)
+        
+        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        return plan.extract_page(soup, page_url, follow_links=False)
+    
+    def close(self):
+        """释放爬虫持有的浏览器、连接、抓取器和解析进程池"""
+        self.browser.close()
+        self.session.close()
+        if self.fetcher is not None:
+            self.fetcher.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
 
 
 class SimplifiedSpider:
@@ -465,6 +841,7 @@ class SimplifiedSpider:
             return []
         
         # 解析页面
+        response.encoding = response_encoding(response)
         soup = BeautifulSoup(response.text, 'html.parser')
         jobs = []
         
@@ -473,11 +850,7 @@ class SimplifiedSpider:
             try:
                 title = item.select_one('.jname, .t1 a')
                 if title:
-                    job = {
-                        'title': title.get_text(strip=True),
-                        'url': title.get('href', '')
-                    }
-                    jobs.append(job)
+                    jobs.append(JobRecord('前程无忧', title.get_text(strip=True), title.get('href', '')))
             except:
                 continue
         
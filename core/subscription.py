@@ -0,0 +1,213 @@
+"""
+订阅模块 - 按订阅者的关键词、公司、地点分发新岗位
+
+一次爬取的结果按订阅者分别生成邮件。订阅条件编译为倒排索引：
+关键词/地点 -> 订阅者，公司名 -> 订阅者。全部订阅者的关键词编译为一个自动机，
+分发一个岗位只需扫描一遍标题，耗时与标题长度和命中的订阅者相关，而与订阅者数量无关。
+"""
+
+import heapq
+
+from config import ConfigError
+from core.matcher import KeywordAutomaton, normalize_terms, normalize_text
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Subscriber:
+    """订阅者"""
+
+    __slots__ = ('name', 'email', 'keywords', 'exclude', 'companies', 'locations')
+
+    def __init__(self, name, email, keywords=None, companies=None, locations=None, exclude=None):
+        """
+        初始化订阅者
+
+        Args:
+            name: 订阅者名称
+            email: 收件邮箱
+            keywords: 标题关键词，为空表示不限
+            companies: 公司名，为空表示不限
+            locations: 地点关键词，为空表示不限
+            exclude: 排除词，标题包含任一排除词时不接收
+        """
+        self.name = name
+        self.email = email
+        self.keywords = normalize_terms(keywords)
+        self.exclude = normalize_terms(exclude)
+        self.companies = frozenset(c.strip() for c in (companies or []) if c and c.strip())
+        self.locations = normalize_terms(locations)
+
+    def __repr__(self):
+        return f"Subscriber({self.name!r}, {self.email!r})"
+
+
+def load_subscribers(email_config):
+    """
+    从邮件配置中读取订阅者
+
+    没有配置 subscribers 时，receiver_email 作为唯一的订阅者，接收全部岗位
+
+    Args:
+        email_config: 邮件配置字典
+
+    Returns:
+        list: 订阅者列表
+
+    Raises:
+        ConfigError: 订阅者配置不合法时抛出
+    """
+    entries = email_config.get('subscribers')
+    if not entries:
+        receiver = email_config.get('receiver_email')
+        return [Subscriber('default', receiver)] if receiver else []
+
+    if not isinstance(entries, list):
+        raise ConfigError("subscribers 应为列表")
+
+    subscribers = []
+    names = set()
+    for index, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise ConfigError(f"subscribers 第 {index} 项应为字典")
+        name = entry.get('name') or entry.get('email') or f'#{index}'
+        if not entry.get('email'):
+            raise ConfigError(f"订阅者 {name}: 缺少 email")
+        if name in names:
+            raise ConfigError(f"订阅者名称重复: {name}")
+        for field in ('keywords', 'exclude', 'companies', 'locations'):
+            value = entry.get(field)
+            if value is not None and not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+                raise ConfigError(f"订阅者 {name}: {field} 应为字符串列表")
+        names.add(name)
+        subscribers.append(Subscriber(
+            name,
+            entry['email'],
+            entry.get('keywords'),
+            entry.get('companies'),
+            entry.get('locations'),
+            entry.get('exclude'),
+        ))
+    return subscribers
+
+
+class _TermIndex:
+    """
+    关键词倒排索引：关键词 -> 订阅者编号集合
+
+    全部订阅者的关键词编译为一个 Aho-Corasick 自动机，查询时扫描一遍文本。
+    只登记设置了该条件的订阅者，没有设置的订阅者由 SubscriptionIndex 统一处理
+    """
+
+    __slots__ = ('_terms', '_postings', '_automaton')
+
+    def __init__(self):
+        self._terms = {}
+        self._postings = []
+        self._automaton = None
+
+    def add(self, subscriber_id, terms):
+        """登记订阅者的词"""
+        for term in terms:
+            if term not in self._terms:
+                self._terms[term] = len(self._postings)
+                self._postings.append(set())
+            self._postings[self._terms[term]].add(subscriber_id)
+        self._automaton = None
+
+    def lookup(self, text):
+        """
+        查找文本命中的订阅者
+
+        Args:
+            text: 已规范化的文本
+
+        Returns:
+            set: 命中的订阅者编号集合，大小与命中的词条相关，与订阅者总数无关
+        """
+        if not text or not self._terms:
+            return _NO_MATCH
+        if self._automaton is None:
+            self._automaton = KeywordAutomaton(self._terms)
+        matched = set()
+        for index in self._automaton.find_all(text):
+            matched |= self._postings[index]
+        return matched
+
+
+# 没有命中时共享的空集合（只读）
+_NO_MATCH = frozenset()
+
+
+class SubscriptionIndex:
+    """
+    订阅者倒排索引
+
+    设置了公司、关键词或地点条件的订阅者只能通过倒排索引命中，分发时只检查命中的订阅者；
+    三个条件都没有设置的订阅者预先排好序，直接并入结果，不再每个岗位复制一遍
+    """
+
+    def __init__(self, subscribers):
+        """
+        编译订阅条件
+
+        Args:
+            subscribers: 订阅者列表
+        """
+        self.subscribers = list(subscribers)
+        self._keywords = _TermIndex()
+        self._exclude = _TermIndex()
+        self._locations = _TermIndex()
+        self._companies = {}
+        # 订阅者编号 -> (是否限制公司, 是否限制关键词, 是否限制地点)
+        self._restricted = []
+        # 不限公司、关键词和地点的订阅者编号（升序）
+        unrestricted = []
+
+        for subscriber_id, subscriber in enumerate(self.subscribers):
+            self._keywords.add(subscriber_id, subscriber.keywords)
+            self._exclude.add(subscriber_id, subscriber.exclude)
+            self._locations.add(subscriber_id, subscriber.locations)
+            for company in subscriber.companies:
+                self._companies.setdefault(company, set()).add(subscriber_id)
+            restricted = (bool(subscriber.companies), bool(subscriber.keywords), bool(subscriber.locations))
+            self._restricted.append(restricted)
+            if not any(restricted):
+                unrestricted.append(subscriber_id)
+        self._unrestricted = tuple(unrestricted)
+
+    def __len__(self):
+        return len(self.subscribers)
+
+    def route(self, job):
+        """
+        查找应该收到该岗位的订阅者
+
+        耗时与岗位标题、地点的长度和命中的订阅者数量相关，与订阅者总数无关
+
+        Args:
+            job: 岗位信息，包含 company/title/location
+
+        Returns:
+            list: 订阅者列表，按配置顺序
+        """
+        title = normalize_text(job.get('title'))
+        company_hits = self._companies.get(job.get('company'), _NO_MATCH)
+        keyword_hits = self._keywords.lookup(title)
+        location_hits = self._locations.lookup(normalize_text(job.get('location')))
+
+        # 限制了条件的订阅者一定出现在某个条件的命中集合中，逐个检查其余条件
+        matched = []
+        for subscriber_id in company_hits | keyword_hits | location_hits:
+            by_company, by_keyword, by_location = self._restricted[subscriber_id]
+            if (not by_company or subscriber_id in company_hits) \
+                    and (not by_keyword or subscriber_id in keyword_hits) \
+                    and (not by_location or subscriber_id in location_hits):
+                matched.append(subscriber_id)
+        if not matched and not self._unrestricted:
+            return []
+
+        excluded = self._exclude.lookup(title)
+        matched.sort()
+        return [self.subscribers[i] for i in heapq.merge(matched, self._unrestricted) if i not in excluded]
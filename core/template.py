@@ -0,0 +1,146 @@
+"""
+邮件模板模块 - 预编译模板并渲染岗位通知
+
+模板在加载时切分为 文本片段/占位符 列表，渲染时只做一次拼接；
+岗位内容统一经过HTML转义，同时生成纯文本版本供不支持HTML的客户端显示。
+"""
+
+import re
+from html import escape
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 模板占位符：{name}，CSS中的 { ... } 块含有空白，不会被误认为占位符
+PLACEHOLDER_PATTERN = re.compile(r'\{(\w+)\}')
+
+
+class EmailTemplate:
+    """预编译的邮件模板"""
+
+    __slots__ = ('_segments', 'fields')
+
+    def __init__(self, source):
+        """
+        编译模板
+
+        Args:
+            source: 模板文本，占位符格式为 {name}
+        """
+        segments = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            segments.append((False, source[position:match.start()]))
+            segments.append((True, match.group(1)))
+            position = match.end()
+        segments.append((False, source[position:]))
+
+        self._segments = tuple(segments)
+        self.fields = frozenset(value for is_field, value in segments if is_field)
+
+    def render(self, values):
+        """
+        渲染模板
+
+        Args:
+            values: 占位符名 -> 已转义的文本，缺少的占位符原样保留
+
+        Returns:
+            str: 渲染结果
+        """
+        parts = []
+        for is_field, value in self._segments:
+            if not is_field:
+                parts.append(value)
+            elif value in values:
+                parts.append(values[value])
+            else:
+                parts.append('{' + value + '}')
+        return ''.join(parts)
+
+
+def group_jobs_by_company(jobs):
+    """
+    按公司分组，保持岗位的原有顺序
+
+    Returns:
+        dict: 公司名 -> 岗位列表
+    """
+    jobs_by_company = {}
+    for job in jobs:
+        jobs_by_company.setdefault(job['company'], []).append(job)
+    return jobs_by_company
+
+
+def _job_meta(job):
+    """岗位的地点/详情/发现时间，用 | 分隔"""
+    return " | ".join(str(part) for part in (job.get('location'), job.get('detail'), job.get('found_time')) if part)
+
+
+def render_job_sections(jobs):
+    """
+    生成按公司分组的岗位HTML片段
+
+    Args:
+        jobs: 岗位列表
+
+    Returns:
+        str: HTML片段
+    """
+    parts = []
+    append = parts.append
+    for company, company_jobs in group_jobs_by_company(jobs).items():
+        # 获取公司URL（从第一个job里取）
+        company_url = company_jobs[0].get('company_url', '')
+        company_name = escape(company)
+
+        append('\n            <div class="company-section">\n                <div class="company-header">')
+        # 公司名称做成可点击链接
+        if company_url:
+            append(f'<a href="{escape(company_url)}" target="_blank" '
+                   f'style="color: #1a73e8; text-decoration: none;">🏢 {company_name}</a>')
+        else:
+            append(f'🏢 {company_name}')
+        append(f' ({len(company_jobs)} 个新岗位)</div>\n                <div class="job-list">\n')
+
+        for job in company_jobs:
+            title = escape(job['title'])
+            if job.get('url'):
+                title = f'<a class="job-title" href="{escape(job["url"])}" target="_blank">{title}</a>'
+            else:
+                title = f'<div class="job-title">{title}</div>'
+            append(f'''
+                <div class="job-item">
+                    {title}
+                    <div class="job-meta">{escape(_job_meta(job))}</div>
+                </div>
+                ''')
+
+        append('\n                </div>\n            </div>\n            ')
+    return ''.join(parts)
+
+
+def render_text(jobs, timestamp):
+    """
+    生成纯文本版本的岗位通知
+
+    Args:
+        jobs: 岗位列表
+        timestamp: 生成时间
+
+    Returns:
+        str: 纯文本内容
+    """
+    lines = [f"新岗位提醒：发现 {len(jobs)} 个新发布的职位", ""]
+    for company, company_jobs in group_jobs_by_company(jobs).items():
+        lines.append(f"【{company}】({len(company_jobs)} 个新岗位)")
+        for job in company_jobs:
+            lines.append(f"  - {job['title']}")
+            meta = _job_meta(job)
+            if meta:
+                lines.append(f"    {meta}")
+            if job.get('url'):
+                lines.append(f"    {job['url']}")
+        lines.append("")
+    lines.append(f"系统自动监控 | 生成时间: {timestamp}")
+    return "\n".join(lines)
@@ -11,8 +11,10 @@
 使用方法：
     python main.py              # 启动定时监控
     python main.py --once       # 立即执行一次检查
+    python main.py --daemon     # 以守护进程模式运行（任务持久化，支持平滑停止）
     python main.py --test       # 发送测试邮件
     python main.py --stats      # 显示统计信息
+    python main.py --check-config  # 校验公司配置
 
 作者：JobMonitorSystem
 版本：1.0.0
@@ -56,7 +58,10 @@ def show_config_info():
         
         print("\n📧 邮件配置:")
         print(f"   发件邮箱: {email_config.get('sender_email', '未配置')}")
-        print(f"   收件邮箱: {email_config.get('receiver_email', '未配置')}")
+        if email_config.get('subscribers'):
+            print(f"   订阅者: {len(email_config['subscribers'])} 个")
+        else:
+            print(f"   收件邮箱: {email_config.get('receiver_email', '未配置')}")
         print(f"   SMTP服务器: {email_config.get('smtp_server', '未配置')}")
         
         print(f"\n🏢 监控公司 ({len(company_configs)} 个):")
@@ -94,6 +99,53 @@ def show_statistics():
             print(f"      {company}: {count}")
 
 
+def check_config():
+    """
+    校验公司配置（包括已禁用的公司）
+    
+    Returns:
+        bool: 配置是否全部有效
+    """
+    from config import load_yaml_config, validate_company_list, ConfigError
+    from core.plan import check_company_configs
+    
+    print("\n🔎 校验公司配置...")
+    companies = (load_yaml_config('companies.yaml') or {}).get('companies', [])
+    try:
+        validate_company_list(companies)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        return False
+    
+    plans, errors = check_company_configs(companies)
+    for plan in plans:
+        status = "✅" if plan.get('enabled', True) else "⏸️ "
+        mode = "接口" if plan.type == 'api' else "Selenium" if plan.requires_selenium else "静态"
+        print(f"   {status} {plan.name} ({mode})")
+    for error in errors:
+        print(f"   ❌ {error}")
+    
+    if errors:
+        print(f"\n❌ {len(errors)} 个公司配置有误")
+        return False
+    print(f"\n✅ 全部 {len(plans)} 个公司配置有效")
+    
+    print("\n🔎 校验订阅者配置...")
+    from core.subscription import load_subscribers
+    email_config = (load_yaml_config('email_config.yaml') or {}).get('email', {})
+    try:
+        subscribers = load_subscribers(email_config)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        return False
+    for subscriber in subscribers:
+        print(f"   ✅ {subscriber.name} <{subscriber.email}>")
+    filtered = [plan.name for plan in plans if plan.matcher]
+    if email_config.get('subscribers') and filtered:
+        print(f"   ⚠️  已配置 subscribers，以下公司的 keywords 不再生效（按订阅者的条件分发）: {', '.join(filtered)}")
+    return True
+
+
 def run_test_email():
     """发送测试邮件"""
     from core.notifier import EmailNotifier
@@ -126,6 +178,14 @@ def run_scheduler():
     scheduler.start()
 
 
+def run_daemon():
+    """以守护进程模式启动调度器"""
+    from core.scheduler import JobMonitorScheduler
+    
+    scheduler = JobMonitorScheduler()
+    scheduler.start_daemon()
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(
@@ -135,19 +195,25 @@ def main():
 示例:
   python main.py              启动定时监控
   python main.py --once       立即执行一次检查
+  python main.py --daemon     以守护进程模式运行
   python main.py --test       发送测试邮件
   python main.py --stats      显示统计信息
+  python main.py --check-config  校验公司配置
         '''
     )
     
     parser.add_argument('--once', '-o', action='store_true',
                        help='立即执行一次检查，不启动定时任务')
+    parser.add_argument('--daemon', '-d', action='store_true',
+                       help='以守护进程模式运行：定时任务保存在数据库中，收到SIGTERM后平滑退出')
     parser.add_argument('--test', '-t', action='store_true',
                        help='发送测试邮件，验证邮箱配置')
     parser.add_argument('--stats', '-s', action='store_true',
                        help='显示数据库统计信息')
     parser.add_argument('--config', '-c', action='store_true',
                        help='显示当前配置信息')
+    parser.add_argument('--check-config', action='store_true',
+                       help='校验公司配置，有错误时以非零状态退出')
     
     args = parser.parse_args()
     
@@ -155,7 +221,10 @@ def main():
     print_banner()
     
     try:
-        if args.config:
+        if args.check_config:
+            if not check_config():
+                sys.exit(1)
+        elif args.config:
             show_config_info()
         elif args.stats:
             show_statistics()
@@ -163,6 +232,10 @@ def main():
             run_test_email()
         elif args.once:
             run_once()
+        elif args.daemon:
+            show_config_info()
+            print("\n" + "=" * 60)
+            run_daemon()
         else:
             # 显示配置信息
             show_config_info()
@@ -0,0 +1,70 @@
+"""
+测试用的本地HTTP服务 - 按预设的响应依次应答，并记录收到的请求
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubServer:
+    """
+    在后台线程中运行的本地HTTP服务
+
+    responder(request) 返回 (状态码, 响应体)，响应体为 dict/list 时按JSON返回；
+    request 为包含 method/path/query/headers/body/json 的字典
+    """
+
+    def __init__(self, responder):
+        self.responder = responder
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                parts = urlsplit(self.path)
+                request = {
+                    'method': self.command,
+                    'path': parts.path,
+                    'query': {key: values[-1] for key, values in parse_qs(parts.query).items()},
+                    'headers': dict(self.headers),
+                    'body': body,
+                    'json': json.loads(body) if body else None,
+                }
+                with stub._lock:
+                    stub.requests.append(request)
+                status, content = stub.responder(request)
+                if not isinstance(content, bytes):
+                    content = json.dumps(content, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        """服务地址，如 http://127.0.0.1:8000"""
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
@@ -0,0 +1,130 @@
+"""
+接口类型公司（type: api）测试 - 从本地HTTP服务分页获取JSON岗位数据
+
+运行：
+    python -m pytest -q tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.circuit import RetryPolicy
+from core.fetcher import AsyncFetcher, aiohttp
+from core.plan import compile_company
+from core.spider import JobSpider
+from tests.http_stub import StubServer
+
+# 接口中的全部岗位，每页 PAGE_SIZE 个
+POSITIONS = [
+    {'id': 100 + i, 'name': f'后端开发实习生{i}', 'cities': [{'name': '北京'}, {'name': '上海'}],
+     'department': {'name': '技术部'}}
+    for i in range(5)
+]
+PAGE_SIZE = 2
+
+
+def paged_positions(request):
+    """按请求体（POST）或查询参数（GET）中的页码返回一页岗位"""
+    paging = request['json'] if request['method'] == 'POST' else request['query']
+    page = int(paging['pageNum'])
+    size = int(paging.get('pageSize', PAGE_SIZE))
+    items = POSITIONS[(page - 1) * size:page * size]
+    return 200, {'code': 0, 'data': {'total': len(POSITIONS), 'list': items}}
+
+
+def api_company(base_url, method='POST', **pagination):
+    """接口类型的公司配置"""
+    api = {
+        'url': base_url + '/api/positions',
+        'method': method,
+        'items': 'data.list',
+        'fields': {
+            'title': 'name',
+            'url': '/campus/position/{id}',
+            'location': 'cities[*].name',
+            'detail': 'department.name',
+        },
+        'pagination': {'param': 'pageNum', 'start': 1, 'size_param': 'pageSize', 'size': PAGE_SIZE,
+                       'max_pages': 10, **pagination},
+    }
+    if method == 'POST':
+        api['json'] = {'recruitType': 2}
+    else:
+        api['params'] = {'recruitType': '2'}
+    return compile_company({'name': '示例公司', 'type': 'api', 'url': base_url + '/campus', 'api': api})
+
+
+class ApiSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.spider = JobSpider(retry_policy=RetryPolicy(max_attempts=1))
+
+    def tearDown(self):
+        self.spider.close()
+
+    def assert_all_positions(self, jobs, base_url):
+        self.assertEqual([job.title for job in jobs], [position['name'] for position in POSITIONS])
+        self.assertEqual(jobs[0].url, f'{base_url}/campus/position/100')
+        self.assertEqual(jobs[0].location, '北京、上海')
+        self.assertEqual(jobs[0].detail, '技术部')
+        self.assertEqual({job.company for job in jobs}, {'示例公司'})
+
+    def test_post_pages_until_total(self):
+        with StubServer(paged_positions) as server:
+            plan = api_company(server.url, total='data.total')
+            jobs = self.spider.scrape_company_jobs(plan, raise_errors=True)
+
+        self.assert_all_positions(jobs, server.url)
+        # 5 个岗位每页 2 个，取完第 3 页后按 total 停止
+        self.assertEqual([request['json'] for request in server.requests], [
+            {'recruitType': 2, 'pageNum': page, 'pageSize': PAGE_SIZE} for page in (1, 2, 3)
+        ])
+
+    def test_get_pages_until_short_page(self):
+        with StubServer(paged_positions) as server:
+            plan = api_company(server.url, method='GET')
+            jobs = self.spider.scrape_company_jobs(plan, raise_errors=True)
+
+        self.assert_all_positions(jobs, server.url)
+        self.assertEqual([request['query'] for request in server.requests], [
+            {'recruitType': '2', 'pageNum': str(page), 'pageSize': str(PAGE_SIZE)} for page in (1, 2, 3)
+        ])
+
+    def test_stops_when_page_known(self):
+        with StubServer(paged_positions) as server:
+            plan = api_company(server.url)
+            jobs = self.spider.scrape_company_jobs(plan, raise_errors=True, known=lambda jobs: True)
+
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual([job.title for job in jobs], [position['name'] for position in POSITIONS[:PAGE_SIZE]])
+
+    def test_keeps_earlier_pages_when_later_page_fails(self):
+        def flaky(request):
+            if request['json']['pageNum'] == 2:
+                return 500, {'code': 1}
+            return paged_positions(request)
+
+        with StubServer(flaky) as server:
+            plan = api_company(server.url)
+            jobs = self.spider.scrape_company_jobs(plan, raise_errors=True)
+
+        self.assertEqual([job.title for job in jobs], [position['name'] for position in POSITIONS[:PAGE_SIZE]])
+
+    @unittest.skipIf(aiohttp is None, "需要安装 aiohttp")
+    def test_prefetched_first_page(self):
+        self.spider.fetcher = AsyncFetcher(retry_policy=RetryPolicy(max_attempts=1))
+        with StubServer(paged_positions) as server:
+            plan = api_company(server.url, total='data.total')
+            response = self.spider.prefetch([plan])[plan.name]
+            self.assertEqual(len(server.requests), 1)
+            jobs = self.spider.scrape_company_jobs(plan, raise_errors=True, response=response)
+
+        self.assert_all_positions(jobs, server.url)
+        self.assertEqual([request['json']['pageNum'] for request in server.requests], [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+配置热加载测试 - 加载失败后修复文件时，同一次检查中的其他修改不会丢失
+
+运行：
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import ConfigService
+
+COMPANIES = '''
+companies:
+  - name: "示例科技"
+    url: "https://example.com/jobs"
+'''
+
+
+class ConfigServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.mtime = 1_000_000_000
+        self.write('settings.yaml', 'monitor:\n  interval: 10\n')
+        self.write('email_config.yaml', 'email: {}\n')
+        self.write('companies.yaml', COMPANIES)
+        self.service = ConfigService(self.dir, check_interval=0)
+        self.service.snapshot()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, filename, text):
+        """写入文件并设置递增的修改时间，避免同一时间戳内的修改检测不到"""
+        path = self.dir / filename
+        path.write_text(text, encoding='utf-8')
+        self.mtime += 10
+        os.utime(path, ns=(self.mtime * 10 ** 9, self.mtime * 10 ** 9))
+
+    def test_valid_edit_survives_failed_reload(self):
+        # 同一次检查中：settings.yaml 是正确的修改，companies.yaml 格式错误
+        self.write('settings.yaml', 'monitor:\n  interval: 20\n')
+        self.write('companies.yaml', 'companies: [\n')
+        self.assertFalse(self.service.refresh())
+        self.assertEqual(self.service.snapshot().settings['monitor']['interval'], 10)
+        # 文件没有再变化时不重复加载
+        self.assertFalse(self.service.refresh())
+
+        self.write('companies.yaml', COMPANIES)
+        self.assertTrue(self.service.refresh())
+        self.assertEqual(self.service.snapshot().settings['monitor']['interval'], 20)
+
+    def test_broken_file_not_hidden_by_later_edit(self):
+        self.write('companies.yaml', 'companies: [\n')
+        self.assertFalse(self.service.refresh())
+
+        # 修改其他文件时仍会重新解析格式错误的文件，不会用旧的解析结果生成快照
+        self.write('settings.yaml', 'monitor:\n  interval: 30\n')
+        with self.assertLogs('config', level='ERROR'):
+            self.assertFalse(self.service.refresh())
+        self.assertEqual(self.service.snapshot().settings['monitor']['interval'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
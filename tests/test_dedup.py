@@ -0,0 +1,52 @@
+"""
+URL规范化与标题规范化测试
+
+运行：
+    python -m pytest -q tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.dedup import canonicalize_url, normalize_title
+
+
+class CanonicalizeUrlTest(unittest.TestCase):
+
+    def test_drops_tracking_params_only(self):
+        self.assertEqual(
+            canonicalize_url('HTTPS://Jobs.Example.com:443/position/1/?utm_source=wx&spm=a.b&from=campus&id=7#top'),
+            'https://jobs.example.com/position/1?from=campus&id=7',
+        )
+
+    def test_keeps_blank_params(self):
+        self.assertEqual(canonicalize_url('https://example.com/jobs?campus'), 'https://example.com/jobs?campus=')
+        self.assertNotEqual(canonicalize_url('https://example.com/jobs?campus'),
+                            canonicalize_url('https://example.com/jobs?social'))
+        self.assertEqual(canonicalize_url('https://example.com/jobs?type=1&id='),
+                         'https://example.com/jobs?id=&type=1')
+
+    def test_keeps_spa_route(self):
+        self.assertEqual(canonicalize_url('https://example.com/#/job/1?b=2&a=1&utm_medium=x'),
+                         'https://example.com/#/job/1?a=1&b=2')
+
+
+class NormalizeTitleTest(unittest.TestCase):
+
+    def test_removes_batch_markers(self):
+        expected = normalize_title('后端开发实习生')
+        for title in ('后端开发实习生(2025届)', '【26届】后端开发实习生', '2025校招 后端开发实习生',
+                      '后端开发实习生 [2025]'):
+            self.assertEqual(normalize_title(title), expected, title)
+        # "2025实习" 只去掉年份
+        self.assertEqual(normalize_title('2025实习-后端开发'), normalize_title('实习 后端开发'))
+
+    def test_keeps_plain_numbers(self):
+        self.assertIn('2048', normalize_title('2048游戏研发工程师'))
+
+
+if __name__ == '__main__':
+    unittest.main()
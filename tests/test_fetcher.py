@@ -0,0 +1,70 @@
+"""
+异步抓取器测试 - 关闭时等待正在执行的请求结束
+
+运行：
+    python -m pytest -q tests
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.circuit import RetryPolicy
+from core.fetcher import AsyncFetcher, aiohttp
+from tests.http_stub import StubServer
+
+
+@unittest.skipIf(aiohttp is None, "需要安装 aiohttp")
+class AsyncFetcherCloseTest(unittest.TestCase):
+
+    def test_close_waits_for_running_batch(self):
+        started = threading.Event()
+
+        def slow(request):
+            started.set()
+            time.sleep(0.5)
+            return 200, {'ok': True}
+
+        fetcher = AsyncFetcher(retry_policy=RetryPolicy(max_attempts=1))
+        results = []
+        with StubServer(slow) as server:
+            worker = threading.Thread(target=lambda: results.extend(fetcher.fetch_all([server.url + '/a'])))
+            worker.start()
+            self.assertTrue(started.wait(5))
+            began = time.monotonic()
+            # 另一个线程中的请求结束后 close() 才返回
+            self.assertTrue(fetcher.close(timeout=5))
+            self.assertGreater(time.monotonic() - began, 0.3)
+            worker.join()
+
+            result, = results
+            self.assertEqual(result.status_code, 200)
+            with self.assertRaises(RuntimeError):
+                fetcher.fetch_all([server.url + '/b'])
+        self.assertEqual(len(server.requests), 1)
+
+    def test_close_timeout(self):
+        release = threading.Event()
+
+        def blocked(request):
+            release.wait(5)
+            return 200, {}
+
+        fetcher = AsyncFetcher(retry_policy=RetryPolicy(max_attempts=1))
+        with StubServer(blocked) as server:
+            worker = threading.Thread(target=fetcher.fetch_all, args=([server.url],))
+            worker.start()
+            while not server.requests:
+                time.sleep(0.01)
+            self.assertFalse(fetcher.close(timeout=0.1))
+            release.set()
+            worker.join()
+        self.assertTrue(fetcher.close(timeout=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
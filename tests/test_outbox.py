@@ -0,0 +1,73 @@
+"""
+发件箱测试 - 渠道会话无法建立时的重试与放弃
+
+运行：
+    python -m pytest -q tests
+"""
+
+import sys
+import tempfile
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.channels import NotificationChannel
+from core.database import JobDatabase
+from core.outbox import OutboxSender
+
+
+class BrokenSessionChannel(NotificationChannel):
+    """每次建立会话都失败的渠道"""
+
+    type = 'broken'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sessions = 0
+
+    @contextmanager
+    def session(self):
+        self.sessions += 1
+        raise ConnectionError("无法连接")
+        yield self
+
+    def send(self, row):
+        raise AssertionError("会话建立失败时不应发送")
+
+
+class OutboxSessionFailureTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = JobDatabase(str(Path(self._tmp.name) / 'jobs.db'))
+        self.db.save_new_job('示例科技', '后端开发实习生', 'https://example.com/job/1', 'hash-1')
+        job_ids = [job.id for job in self.db.get_unnotified_jobs()]
+        self.outbox_ids = [
+            self.db.enqueue_notification(f'通知{i}', '', job_ids, channel='broken') for i in range(2)
+        ]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _outbox_rows(self):
+        conn = self.db.get_connection()
+        try:
+            return [tuple(row) for row in conn.execute('SELECT status, attempts FROM outbox ORDER BY id')]
+        finally:
+            conn.close()
+
+    def test_session_failure_counts_as_attempt(self):
+        channel = BrokenSessionChannel(max_retry=3, retry_delay=0)
+        sender = OutboxSender(self.db, channel)
+
+        self.assertEqual(sender.process_due(), 0)
+        # 重试间隔为0，同一次处理中一直重试到放弃，不会停留在发送中等待领取超时
+        self.assertEqual(channel.sessions, 3)
+        self.assertEqual(self._outbox_rows(), [('failed', 3), ('failed', 3)])
+        self.assertEqual(self.db.count_pending_outbox(['broken']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Webhook 渠道测试 - 通过发件箱把通知发送到本地HTTP服务
+
+运行：
+    python -m pytest -q tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.channels import WebhookChannel, job_payload
+from core.database import JobDatabase
+from core.outbox import OutboxSender
+from tests.http_stub import StubServer
+
+
+class WebhookChannelTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = JobDatabase(str(Path(self._tmp.name) / 'jobs.db'))
+        self.db.save_new_job('示例科技', '后端开发实习生', 'https://example.com/job/1', 'hash-1', location='北京')
+        self.jobs = self.db.get_unnotified_jobs()
+        self.outbox_id = self.db.enqueue_notification(
+            '示例科技 新岗位', '', [job.id for job in self.jobs], recipient='a@example.com',
+            body_text='后端开发实习生', channel='webhook', payload=job_payload(self.jobs),
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _send(self, server, max_retry=3):
+        channel = WebhookChannel(server.url + '/hook', headers={'X-Token': 'secret'},
+                                 timeout=5, max_retry=max_retry, retry_delay=0)
+        return OutboxSender(self.db, channel).process_due()
+
+    def _outbox_status(self):
+        conn = self.db.get_connection()
+        try:
+            return conn.execute('SELECT status FROM outbox WHERE id = ?', (self.outbox_id,)).fetchone()[0]
+        finally:
+            conn.close()
+
+    def _job_state(self):
+        conn = self.db.get_connection()
+        try:
+            row = conn.execute('SELECT notified, status FROM jobs WHERE id = ?', (self.jobs[0].id,)).fetchone()
+            return tuple(row)
+        finally:
+            conn.close()
+
+    def test_posts_json_payload(self):
+        with StubServer(lambda request: (200, {'ok': True})) as server:
+            sent = self._send(server)
+
+        self.assertEqual(sent, 1)
+        request, = server.requests
+        self.assertEqual(request['method'], 'POST')
+        self.assertEqual(request['path'], '/hook')
+        self.assertEqual(request['headers'].get('X-Token'), 'secret')
+        message = request['json']
+        self.assertEqual(message['subject'], '示例科技 新岗位')
+        self.assertEqual(message['recipient'], 'a@example.com')
+        self.assertEqual(message['text'], '后端开发实习生')
+        job, = message['jobs']
+        self.assertEqual(job['company'], '示例科技')
+        self.assertEqual(job['title'], '后端开发实习生')
+        self.assertEqual(job['url'], 'https://example.com/job/1')
+        self.assertEqual(job['location'], '北京')
+        self.assertEqual(self._outbox_status(), 'sent')
+        self.assertEqual(self._job_state(), (1, 'processed'))
+
+    def test_retries_after_server_error(self):
+        statuses = iter([503, 500, 200])
+        with StubServer(lambda request: (next(statuses), {})) as server:
+            sent = self._send(server)
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(len(server.requests), 3)
+        # 每次重试发送的内容相同
+        self.assertTrue(all(request['json'] == server.requests[0]['json'] for request in server.requests))
+        self.assertEqual(self._outbox_status(), 'sent')
+        self.assertEqual(self._job_state(), (1, 'processed'))
+
+    def test_gives_up_after_max_retry(self):
+        with StubServer(lambda request: (502, {})) as server:
+            sent = self._send(server, max_retry=2)
+
+        self.assertEqual(sent, 0)
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(self._outbox_status(), 'failed')
+        # 放弃发送的岗位保持已排队，下次检查时只重新发送这一条通知
+        self.assertEqual(self._job_state(), (0, 'queued'))
+        self.assertEqual(self.db.requeue_failed_outbox(), 1)
+        self.assertEqual(self._outbox_status(), 'pending')
+
+
+if __name__ == '__main__':
+    unittest.main()
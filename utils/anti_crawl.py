@@ -3,7 +3,7 @@
 """
 
 import random
-from pathlib import Path
+from utils.proxy_pool import get_proxy_pool
 
 # 常用的User-Agent列表
 USER_AGENTS = [
@@ -32,25 +32,17 @@ def get_random_user_agent():
     return random.choice(USER_AGENTS)
 
 
-def get_random_proxy():
-    """获取随机代理IP"""
-    # 从配置文件读取代理列表
-    proxy_file = Path(__file__).parent.parent / "config" / "proxy_list.txt"
+def get_random_proxy(url=None):
+    """
+    从代理池中选择代理IP（按健康度加权，不再均匀随机）
     
-    if not proxy_file.exists():
-        return None
+    Args:
+        url: 请求的URL，开启粘性分配时同一域名使用同一个代理
     
-    proxies = []
-    with open(proxy_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                proxies.append(line)
-    
-    if not proxies:
-        return None
-    
-    return random.choice(proxies)
+    Returns:
+        str: 代理地址，没有可用代理时返回 None
+    """
+    return get_proxy_pool().acquire(url)
 
 
 def get_random_headers():
@@ -0,0 +1,238 @@
+"""
+代理池模块 - 按健康度选择代理
+
+代理列表只在配置变化时重新加载，每个代理记录：
+- 延迟和成功率的指数加权平均（EWMA），越近的请求权重越大，旧的表现逐渐淡化
+- 连续失败次数，达到阈值后隔离一段时间，隔离期满后重新参与选择（试探），
+  再次失败时隔离时间翻倍
+
+选择代理时按 成功率/延迟 加权随机，快而稳定的代理被选中的概率更高；
+开启粘性分配时，同一域名在代理可用期间固定使用同一个代理，保持会话一致。
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 没有测量数据的代理按该延迟（秒）估计，使新代理有机会被选中
+DEFAULT_LATENCY = 1.0
+# 隔离时间上限（秒）
+MAX_QUARANTINE_SECONDS = 3600
+# 使用代理时，这些状态码说明代理被目标网站封禁
+PROXY_BLOCKED_STATUS = frozenset({403, 407, 429})
+
+
+class ProxyStats:
+    """单个代理的统计信息"""
+
+    __slots__ = ('address', 'latency', 'success_rate', 'requests', 'consecutive_failures',
+                 'strikes', 'quarantined_until')
+
+    def __init__(self, address):
+        self.address = address
+        self.latency = None
+        # 初始成功率为1，新代理先被当作可用
+        self.success_rate = 1.0
+        self.requests = 0
+        self.consecutive_failures = 0
+        # 被隔离的次数，决定下次隔离时长
+        self.strikes = 0
+        self.quarantined_until = 0.0
+
+    def available(self, now):
+        """是否未被隔离"""
+        return self.quarantined_until <= now
+
+    def score(self):
+        """选择权重：成功率 / 延迟"""
+        latency = self.latency if self.latency is not None else DEFAULT_LATENCY
+        return max(self.success_rate, 0.01) / max(latency, 0.05)
+
+
+class ProxyPool:
+    """代理池"""
+
+    def __init__(self, proxies=(), alpha=0.3, quarantine_failures=3, quarantine_seconds=300, sticky=True):
+        """
+        初始化代理池
+
+        Args:
+            proxies: 代理地址列表，格式为 IP:端口
+            alpha: EWMA 平滑系数，越大越看重最近的请求
+            quarantine_failures: 连续失败多少次后隔离
+            quarantine_seconds: 首次隔离时长（秒），之后每次翻倍
+            sticky: 是否为同一域名固定分配代理
+        """
+        self.alpha = alpha
+        self.quarantine_failures = quarantine_failures
+        self.quarantine_seconds = quarantine_seconds
+        self.sticky = sticky
+        self._stats = {}
+        self._pins = {}
+        self._lock = threading.Lock()
+        self.update(proxies)
+
+    @classmethod
+    def from_settings(cls, proxies, spider_settings):
+        """
+        根据 settings.yaml 的 spider 配置创建代理池
+
+        Args:
+            proxies: 代理地址列表
+            spider_settings: spider 配置字典
+        """
+        pool = cls(proxies)
+        pool.configure(spider_settings)
+        return pool
+
+    def configure(self, spider_settings):
+        """应用 spider 配置中的代理池参数"""
+        with self._lock:
+            self.quarantine_failures = spider_settings.get('proxy_quarantine_failures', self.quarantine_failures)
+            self.quarantine_seconds = spider_settings.get('proxy_quarantine_seconds', self.quarantine_seconds)
+            self.sticky = spider_settings.get('proxy_sticky', self.sticky)
+
+    def update(self, proxies):
+        """
+        同步代理列表，保留仍在列表中的代理的统计信息
+
+        Args:
+            proxies: 代理地址列表
+        """
+        with self._lock:
+            addresses = list(dict.fromkeys(p.strip() for p in proxies if p and p.strip()))
+            self._stats = {address: self._stats.get(address) or ProxyStats(address) for address in addresses}
+            self._pins = {host: address for host, address in self._pins.items() if address in self._stats}
+
+    def __len__(self):
+        return len(self._stats)
+
+    @staticmethod
+    def _host(url_or_host):
+        """从URL中取出域名"""
+        if not url_or_host:
+            return None
+        if '://' in url_or_host:
+            return urlsplit(url_or_host).hostname
+        return url_or_host
+
+    def acquire(self, url=None):
+        """
+        选择一个代理
+
+        Args:
+            url: 请求的URL或域名，用于粘性分配
+
+        Returns:
+            str: 代理地址，没有可用代理时返回 None（直接连接）
+        """
+        host = self._host(url)
+        now = time.time()
+        with self._lock:
+            if not self._stats:
+                return None
+
+            if self.sticky and host:
+                pinned = self._stats.get(self._pins.get(host))
+                if pinned is not None and pinned.available(now):
+                    return pinned.address
+
+            candidates = [stats for stats in self._stats.values() if stats.available(now)]
+            if not candidates:
+                logger.warning(f"全部 {len(self._stats)} 个代理都已被隔离，本次直接连接")
+                return None
+
+            chosen = random.choices(candidates, weights=[stats.score() for stats in candidates])[0]
+            if self.sticky and host:
+                self._pins[host] = chosen.address
+            return chosen.address
+
+    def report(self, address, success, latency=None, url=None):
+        """
+        记录一次请求的结果
+
+        Args:
+            address: 代理地址
+            success: 请求是否成功（代理是否可用）
+            latency: 请求耗时（秒）
+            url: 请求的URL或域名
+        """
+        if address is None:
+            return
+        host = self._host(url)
+        with self._lock:
+            stats = self._stats.get(address)
+            if stats is None:
+                return
+
+            stats.requests += 1
+            stats.success_rate += self.alpha * ((1.0 if success else 0.0) - stats.success_rate)
+            if success:
+                if latency is not None:
+                    stats.latency = latency if stats.latency is None else \
+                        stats.latency + self.alpha * (latency - stats.latency)
+                stats.consecutive_failures = 0
+                stats.strikes = 0
+                return
+
+            stats.consecutive_failures += 1
+            if host and self._pins.get(host) == address:
+                del self._pins[host]
+            if stats.consecutive_failures >= self.quarantine_failures:
+                duration = min(self.quarantine_seconds * (2 ** stats.strikes), MAX_QUARANTINE_SECONDS)
+                stats.strikes += 1
+                stats.consecutive_failures = 0
+                stats.quarantined_until = time.time() + duration
+                self._pins = {h: a for h, a in self._pins.items() if a != address}
+                logger.warning(f"代理 {address} 连续失败，隔离 {duration:.0f} 秒")
+
+    def stats(self):
+        """
+        获取各代理的统计信息
+
+        Returns:
+            list: 统计信息字典列表
+        """
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    'address': stats.address,
+                    'latency': stats.latency,
+                    'success_rate': stats.success_rate,
+                    'requests': stats.requests,
+                    'quarantined': not stats.available(now),
+                }
+                for stats in self._stats.values()
+            ]
+
+
+_pool = None
+_pool_version = None
+_pool_lock = threading.Lock()
+
+
+def get_proxy_pool():
+    """
+    获取全局代理池，配置变化时同步代理列表和参数
+
+    Returns:
+        ProxyPool: 代理池
+    """
+    global _pool, _pool_version
+    from config import get_config_service
+
+    snapshot = get_config_service().snapshot()
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProxyPool.from_settings(snapshot.proxies, snapshot.settings.get('spider', {}))
+            _pool_version = snapshot.version
+        elif _pool_version != snapshot.version:
+            _pool.update(snapshot.proxies)
+            _pool.configure(snapshot.settings.get('spider', {}))
+            _pool_version = snapshot.version
+        return _pool